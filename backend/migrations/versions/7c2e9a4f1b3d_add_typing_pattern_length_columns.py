@@ -0,0 +1,37 @@
+"""Add keystroke_count and text_length generated columns to typing_patterns
+
+Revision ID: 7c2e9a4f1b3d
+Revises: 401d420d168c
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2e9a4f1b3d"
+down_revision: Union[str, None] = "401d420d168c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 테이블은 Base.metadata.create_all로 생성되므로 이미 컬럼이 있으면 건너뜀
+    # STORED 생성 컬럼이라 기존 행은 ALTER 시점에 자동으로 채워짐 (별도 백필 불필요)
+    op.execute(
+        "ALTER TABLE typing_patterns "
+        "ADD COLUMN IF NOT EXISTS keystroke_count INTEGER "
+        "GENERATED ALWAYS AS (jsonb_array_length(keystrokes)) STORED"
+    )
+    op.execute(
+        "ALTER TABLE typing_patterns "
+        "ADD COLUMN IF NOT EXISTS text_length INTEGER "
+        "GENERATED ALWAYS AS (char_length(text_content)) STORED"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("typing_patterns", "text_length")
+    op.drop_column("typing_patterns", "keystroke_count")
@@ -0,0 +1,36 @@
+"""Add (session_id, created_at DESC) index to typing_patterns
+
+Revision ID: b5d83e0c6a21
+Revises: 7c2e9a4f1b3d
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d83e0c6a21"
+down_revision: Union[str, None] = "7c2e9a4f1b3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 테이블은 Base.metadata.create_all로 생성되므로 이미 인덱스가 있으면 건너뜀
+    op.create_index(
+        "ix_typing_patterns_session_created",
+        "typing_patterns",
+        ["session_id", sa.text("created_at DESC")],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_typing_patterns_session_created",
+        table_name="typing_patterns",
+        if_exists=True
+    )
@@ -8,13 +8,13 @@ VibeMusic WebSocket API
 - 음악 생성 상태 업데이트
 """
 
-import json
 import logging
 from datetime import datetime
 from typing import Dict, Set, Optional, Any
 import asyncio
 from uuid import uuid4
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, status
 from fastapi.websockets import WebSocketState
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -119,7 +119,9 @@ class ConnectionManager:
                 'session_id': session_id
             }
 
-            await websocket.send_text(json.dumps(message_with_timestamp, ensure_ascii=False))
+            await websocket.send_text(
+                orjson.dumps(message_with_timestamp, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+            )
 
             # 활동 시간 및 메시지 카운트 업데이트
             if session_id in self.connection_metadata:
@@ -260,13 +262,13 @@ async def websocket_typing_endpoint(
             # 클라이언트로부터 메시지 수신
             try:
                 data = await websocket.receive_text()
-                message = json.loads(data)
+                message = orjson.loads(data)
 
             except WebSocketDisconnect:
                 logger.info("클라이언트 연결 종료: session_id=%s", session_id)
                 break
 
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logger.warning("잘못된 JSON 메시지: session_id=%s, error=%s", session_id, str(e))
                 await manager.send_personal_message(session_id, {
                     'type': 'error',
@@ -320,6 +322,10 @@ async def websocket_typing_endpoint(
         logger.error("WebSocket 연결 처리 중 예상치 못한 오류: session_id=%s, error=%s", session_id, str(e))
 
     finally:
+        # 세션 처리 상태 정리 (백그라운드 분석/플러시 타이머가 연결보다 오래 남지 않도록)
+        if realtime_processor:
+            await realtime_processor.cleanup_session_data(session_id)
+
         # 연결 정리
         await manager.disconnect(session_id, "세션 종료")
 
@@ -343,8 +349,8 @@ async def handle_typing_data(session_id: str, message: Dict[str, Any],
             })
             return
 
-        # 실시간 데이터 처리
-        result = await processor.process_typing_event(session_id, typing_data)
+        # 실시간 데이터 처리 (감정 분석 트리거 시 분석은 백그라운드에서 실행되고 결과는 별도 전송)
+        result = await processor.process_typing_event(session_id, typing_data, manager)
 
         if result['success']:
             # 처리 성공 응답
@@ -356,17 +362,6 @@ async def handle_typing_data(session_id: str, message: Dict[str, Any],
                     'emotion_score': result.get('emotion_score')
                 }
             })
-
-            # 감정 분석 트리거 조건 확인
-            if result.get('trigger_emotion_analysis', False):
-                emotion_result = await processor.trigger_emotion_analysis(session_id)
-
-                if emotion_result['success']:
-                    await manager.send_personal_message(session_id, {
-                        'type': 'emotion_analysis_result',
-                        'data': emotion_result['data']
-                    })
-
         else:
             await manager.send_personal_message(session_id, {
                 'type': 'error',
@@ -8,11 +8,11 @@ VibeMusic 서비스를 위한 Redis 연결, 세션 관리, 캐시 서비스
 - 감정 분석 결과 캐시
 """
 
-import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from datetime import datetime, timedelta
 
+import orjson
 import redis.asyncio as redis
 from redis.asyncio import Redis
 from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
@@ -21,6 +21,15 @@ from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# 캐시 직렬화 옵션 (json.dumps처럼 문자열이 아닌 키 허용, NumPy 값도 직렬화)
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _dumps(data: Any) -> bytes:
+    """캐시 값 직렬화 (orjson, 알 수 없는 타입은 문자열로 변환)"""
+    return orjson.dumps(data, default=str, option=ORJSON_OPTIONS)
+
+
 # ============================================================================
 # Redis Client Configuration
 # ============================================================================
@@ -187,7 +196,7 @@ class CacheService:
         """세션 데이터 저장"""
         try:
             key = f"{self.SESSION_PREFIX}{session_id}"
-            serialized_data = json.dumps(data, default=str, ensure_ascii=False)
+            serialized_data = _dumps(data)
 
             result = await self.redis.setex(key, ttl, serialized_data)
             return bool(result)
@@ -203,7 +212,7 @@ class CacheService:
             data = await self.redis.get(key)
 
             if data:
-                return json.loads(data)
+                return orjson.loads(data)
             return None
 
         except Exception as e:
@@ -243,7 +252,7 @@ class CacheService:
 
             # 타임스탬프 추가
             typing_data['timestamp'] = datetime.utcnow().isoformat()
-            serialized_data = json.dumps(typing_data, default=str, ensure_ascii=False)
+            serialized_data = _dumps(typing_data)
 
             # 리스트의 오른쪽에 추가 (FIFO)
             await self.redis.rpush(key, serialized_data)
@@ -260,6 +269,28 @@ class CacheService:
             logger.error("타이핑 데이터 푸시 실패 [%s]: %s", session_id, str(e))
             return False
 
+    async def push_typing_batch(self, session_id: str,
+                                events: Sequence[Dict[str, Any]]) -> bool:
+        """타이핑 데이터 여러 개를 버퍼에 추가 (RPUSH 한 번, 파이프라인 한 번 왕복)"""
+        if not events:
+            return True
+
+        try:
+            key = f"{self.TYPING_PREFIX}{session_id}"
+            timestamp = datetime.utcnow().isoformat()
+
+            pipe = self.redis.pipeline()
+            pipe.rpush(key, *[_dumps({**event, 'timestamp': timestamp}) for event in events])
+            pipe.expire(key, self.TYPING_TTL)
+            pipe.ltrim(key, -1000, -1)
+            await pipe.execute()
+
+            return True
+
+        except Exception as e:
+            logger.error("타이핑 데이터 일괄 푸시 실패 [%s]: %s", session_id, str(e))
+            return False
+
     async def get_typing_buffer(self, session_id: str, limit: int = 100) -> List[Dict[str, Any]]:
         """타이핑 데이터 버퍼 조회"""
         try:
@@ -268,20 +299,42 @@ class CacheService:
             # 최근 limit개 데이터 조회
             raw_data = await self.redis.lrange(key, -limit, -1)
 
-            typing_data = []
-            for item in raw_data:
-                try:
-                    data = json.loads(item)
-                    typing_data.append(data)
-                except json.JSONDecodeError:
-                    continue
-
-            return typing_data
+            return self._parse_typing_items(raw_data)
 
         except Exception as e:
             logger.error("타이핑 버퍼 조회 실패 [%s]: %s", session_id, str(e))
             return []
 
+    async def get_typing_buffer_with_emotion(
+        self, session_id: str, limit: int = 100
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """타이핑 데이터 버퍼와 캐시된 감정 분석 결과를 파이프라인 한 번 왕복으로 조회"""
+        try:
+            pipe = self.redis.pipeline()
+            pipe.lrange(f"{self.TYPING_PREFIX}{session_id}", -limit, -1)
+            pipe.get(f"{self.EMOTION_PREFIX}{session_id}")
+            raw_data, emotion_raw = await pipe.execute()
+
+            emotion_data = orjson.loads(emotion_raw).get('emotion_data') if emotion_raw else None
+            return self._parse_typing_items(raw_data), emotion_data
+
+        except Exception as e:
+            logger.error("타이핑 버퍼/감정 캐시 조회 실패 [%s]: %s", session_id, str(e))
+            return [], None
+
+    @staticmethod
+    def _parse_typing_items(raw_data: List[Any]) -> List[Dict[str, Any]]:
+        """타이핑 버퍼 항목 역직렬화 (깨진 항목은 건너뜀)"""
+        typing_data = []
+        for item in raw_data:
+            try:
+                data = orjson.loads(item)
+                typing_data.append(data)
+            except orjson.JSONDecodeError:
+                continue
+
+        return typing_data
+
     async def clear_typing_buffer(self, session_id: str) -> bool:
         """타이핑 데이터 버퍼 삭제"""
         try:
@@ -310,7 +363,7 @@ class CacheService:
                 'ttl': ttl
             }
 
-            serialized_data = json.dumps(cache_data, default=str, ensure_ascii=False)
+            serialized_data = _dumps(cache_data)
             result = await self.redis.setex(key, ttl, serialized_data)
             return bool(result)
 
@@ -325,7 +378,7 @@ class CacheService:
             data = await self.redis.get(key)
 
             if data:
-                cache_data = json.loads(data)
+                cache_data = orjson.loads(data)
                 return cache_data.get('emotion_data')
             return None
 
@@ -342,7 +395,7 @@ class CacheService:
         """음악 생성 임시 데이터 저장"""
         try:
             key = f"{self.TEMP_PREFIX}music:{music_id}"
-            serialized_data = json.dumps(data, default=str, ensure_ascii=False)
+            serialized_data = _dumps(data)
 
             result = await self.redis.setex(key, ttl, serialized_data)
             return bool(result)
@@ -358,7 +411,7 @@ class CacheService:
             data = await self.redis.get(key)
 
             if data:
-                return json.loads(data)
+                return orjson.loads(data)
             return None
 
         except Exception as e:
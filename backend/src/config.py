@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     # 서버 설정
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    WEB_CONCURRENCY: int = 1  # uvicorn 워커 프로세스 수 (uvicorn --workers 기본값과 같은 환경 변수)
     
     # 데이터베이스 설정
     DATABASE_URL: str = Field(
@@ -63,6 +64,12 @@ class Settings(BaseSettings):
     # WebSocket 설정
     WS_HEARTBEAT_INTERVAL: int = 30
     WS_MAX_CONNECTIONS: int = 1000
+
+    # 패턴 분석 설정 (워커당 배치 분석 프로세스 수, 0이면 CPU 코어 수를 WEB_CONCURRENCY로 나눈 값)
+    ANALYSIS_PROCESS_WORKERS: int = 0
+
+    # 음악 생성 설정 (워커당 동시에 진행하는 AI 음악 생성 요청 수 상한)
+    MAX_CONCURRENT_MUSIC_GENERATIONS: int = 8
     
     # 로깅 설정
     LOG_LEVEL: str = "INFO"
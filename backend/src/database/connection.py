@@ -8,8 +8,9 @@ VibeMusic 서비스를 위한 데이터베이스 연결, 세션 관리, 트랜
 - 헬스 체크 및 에러 처리
 """
 import logging
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Optional
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine, text
@@ -20,6 +21,11 @@ from src.config import settings
 logger = logging.getLogger(__name__)
 
 
+def _json_serializer(obj: Any) -> str:
+    """JSONB 컬럼 직렬화 (orjson - 키스트로크 배열 등 큰 JSON 값의 인코딩 비용 절감)"""
+    return orjson.dumps(obj).decode()
+
+
 # 비동기 엔진 생성
 async_engine = create_async_engine(
     settings.DATABASE_URL,
@@ -27,7 +33,9 @@ async_engine = create_async_engine(
     future=True,
     pool_pre_ping=True,
     pool_size=10,
-    max_overflow=20
+    max_overflow=20,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
 # 동기 엔진 (마이그레이션용)
@@ -37,7 +45,9 @@ sync_engine = create_engine(
     future=True,
     pool_pre_ping=True,
     pool_size=10,
-    max_overflow=20
+    max_overflow=20,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
 # 비동기 세션 팩토리
@@ -11,6 +11,7 @@ from src.api.router import api_router
 from src.api.websocket import router as websocket_router
 from src.database.connection import init_db, close_db
 from src.cache.redis_client import init_cache, close_cache
+from src.services.pattern_analysis_service import PatternAnalysisService
 
 
 @asynccontextmanager
@@ -40,6 +41,7 @@ async def lifespan(app: FastAPI):
     await close_cache()
     print("🛑 데이터베이스 연결을 종료합니다...")
     await close_db()
+    PatternAnalysisService.shutdown_cpu_pool()
     print("🎵 VibeMusic 서비스를 종료합니다...")
 
 
@@ -3,7 +3,7 @@ TypingPattern 모델 - 키보드 입력 패턴 저장
 """
 from typing import Optional, List, Dict, Any
 
-from sqlalchemy import ForeignKey, Text, CheckConstraint
+from sqlalchemy import Computed, ForeignKey, Index, Integer, Text, CheckConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -36,6 +36,19 @@ class TypingPattern(Base):
         comment="입력된 텍스트 내용"
     )
 
+    # 집계용 파생 컬럼 (DB가 저장 시 계산, 요약 조회에서 JSONB를 읽지 않기 위함)
+    keystroke_count: Mapped[int] = mapped_column(
+        Integer,
+        Computed("jsonb_array_length(keystrokes)", persisted=True),
+        comment="키 입력 개수"
+    )
+
+    text_length: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        Computed("char_length(text_content)", persisted=True),
+        comment="입력된 텍스트 길이"
+    )
+
     # 관계 설정
     session = relationship(
         "UserSession",
@@ -57,6 +70,12 @@ class TypingPattern(Base):
             "jsonb_array_length(keystrokes) >= 10",
             name="check_minimum_keystrokes"
         ),
+        # 세션별 최신순 목록 조회 (ORDER BY created_at DESC LIMIT/OFFSET)를 정렬 없이 인덱스로 처리
+        Index(
+            "ix_typing_patterns_session_created",
+            "session_id",
+            text("created_at DESC")
+        ),
     )
 
     def validate_keystrokes(self) -> bool:
@@ -8,19 +8,23 @@ T092: 타이핑 패턴 실시간 처리 성능 튜닝
 - 비동기 파이프라인으로 처리 병목 해결
 """
 import asyncio
+import logging
+import math
 import time
-from typing import Dict, List, Any, Optional, Callable, Deque
-from collections import deque
+from typing import Dict, List, Any, Optional, Callable, Deque, Sequence, Set, Tuple, cast
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from asyncio import Queue, Event
+from asyncio import Event
 from weakref import WeakSet
 import json
-import threading
-from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 from src.models.typing_pattern import TypingPattern
 from src.services.pattern_analysis_service import PatternAnalysisService
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class TypingEvent:
@@ -49,7 +53,7 @@ class ProcessingMetrics:
     max_latency_ms: float = 0.0
     buffer_size: int = 0
     processing_rate: float = 0.0  # events per second
-    last_reset_time: float = field(default_factory=time.time)
+    last_reset_time: float = field(default_factory=time.monotonic)
 
     def reset(self) -> None:
         """메트릭 초기화"""
@@ -58,49 +62,482 @@ class ProcessingMetrics:
         self.avg_latency_ms = 0.0
         self.max_latency_ms = 0.0
         self.processing_rate = 0.0
-        self.last_reset_time = time.time()
+        self.last_reset_time = time.monotonic()
+
+
+PAUSE_THRESHOLD_MS = 500.0
+INITIAL_BUFFER_CAPACITY = 16  # 세션 버퍼 초기 용량 (필요 시 두 배씩 증가)
+MAX_TIMESTAMP_OFFSET_MS = 2 ** 32 - 1  # uint32 오프셋 상한 (약 49일)
+EPOCH_REBASE_THRESHOLD_MS = 2 ** 31  # 가장 오래된 오프셋이 이 값을 넘으면 기준 시각 재설정
+LATENCY_EMA_ALPHA = 0.1  # 레이턴시 이동 평균 평활화 상수
+
+# 이벤트 타입 코드 (EventBuffer의 uint8 배열에 저장)
+EVENT_KEYDOWN = 0
+EVENT_KEYUP = 1
+_EVENT_TYPE_NAMES = ('keydown', 'keyup')
+_EVENT_TYPE_CODES = {name: code for code, name in enumerate(_EVENT_TYPE_NAMES)}
+
+
+@dataclass
+class IntervalStats:
+    """keydown 간격 통계 (윈도우 단위 집계)"""
+    event_count: int = 0
+    keydown_count: int = 0
+    interval_sum: float = 0.0
+    interval_sq_sum: float = 0.0
+    pause_count: int = 0
+    first_keydown_ts: float = 0.0
+    last_keydown_ts: float = 0.0
+
+    @property
+    def interval_count(self) -> int:
+        return max(self.keydown_count - 1, 0)
+
+    @property
+    def mean_interval(self) -> float:
+        count = self.interval_count
+        return self.interval_sum / count if count else 0.0
+
+    @property
+    def variance(self) -> float:
+        count = self.interval_count
+        if not count:
+            return 0.0
+        mean = self.interval_sum / count
+        return max(self.interval_sq_sum / count - mean * mean, 0.0)
+
+    @classmethod
+    def from_events(cls, events: List[TypingEvent]) -> 'IntervalStats':
+        """이벤트 목록에서 직접 계산 (NumPy 벡터화)"""
+        event_count = len(events)
+        timestamps = np.fromiter(
+            (event.timestamp for event in events), dtype=np.float64, count=event_count
+        )
+        keydown_mask = np.fromiter(
+            (event.event_type == 'keydown' for event in events), dtype=bool, count=event_count
+        )
+        keydown_ts = timestamps[keydown_mask]
+
+        if keydown_ts.size == 0:
+            return cls(event_count=event_count)
+
+        intervals = np.diff(keydown_ts)
+        return cls(
+            event_count=event_count,
+            keydown_count=int(keydown_ts.size),
+            interval_sum=float(intervals.sum()),
+            interval_sq_sum=float(np.dot(intervals, intervals)),
+            pause_count=int((intervals > PAUSE_THRESHOLD_MS).sum()),
+            first_keydown_ts=float(keydown_ts[0]),
+            last_keydown_ts=float(keydown_ts[-1])
+        )
 
 
 @dataclass
 class EventBuffer:
-    """고성능 이벤트 버퍼"""
-    events: Deque[TypingEvent] = field(default_factory=deque)
+    """
+    고성능 이벤트 버퍼 (SoA: 필드별 병렬 배열)
+
+    이벤트를 TypingEvent 객체로 보관하지 않고 키 목록과 타임스탬프/이벤트 타입/지속시간
+    NumPy 배열에 나눠 저장한다. 분석 경로는 연속 메모리 배열만 읽고, TypingEvent는
+    events / get_recent_events 호출 시에만 다시 만들어진다.
+
+    배열은 선형 링 버퍼로 사용되며(head~tail 구간이 유효), tail이 끝에 닿으면
+    필요할 때만 용량을 두 배로 늘리고(최대 max_size의 2배) 유효 구간을 앞으로 옮긴다
+    (분할 상환 O(1)). 윈도우 경계는 타임스탬프 배열에서 이진 탐색으로 찾고,
+    윈도우별 시작 커서를 캐시해 다음 조회에서는 앞으로만 전진시킨다.
+
+    keydown 간격의 누적합(개수, 합, 제곱합, 일시정지 수)을 이벤트마다 NumPy 배열에
+    함께 저장하므로 임의의 최근 윈도우 통계를 두 누적값의 차이로 O(1)에 구할 수 있다.
+
+    타임스탬프는 ms 단위 정수로 반올림해 버퍼별 기준 시각(epoch_ms)으로부터의 uint32
+    오프셋으로, 지속시간은 int32 ms로 저장한다 (float64 대비 절반 크기).
+    직전 이벤트보다 이른 타임스탬프는 직전 시각으로 보정해 항상 비감소 순서를 유지한다.
+    """
     max_size: int = 1000
     last_processed: float = 0.0
+    session_id: str = ''
+    epoch_ms: int = field(default=0, init=False)  # 첫 이벤트 시각, 필요 시 재설정
+    _keys: List[Optional[str]] = field(init=False, repr=False)
+    _timestamps: np.ndarray = field(init=False, repr=False)  # epoch_ms 기준 uint32 오프셋
+    _event_types: np.ndarray = field(init=False, repr=False)  # EVENT_KEYDOWN / EVENT_KEYUP
+    _durations: np.ndarray = field(init=False, repr=False)
+    # 같은 인덱스의 누적값 행 (keydown 수, 간격 합, 간격 제곱합, 일시정지 수)
+    _prefix: np.ndarray = field(init=False, repr=False)
+    _head: int = field(default=0, init=False, repr=False)
+    _tail: int = field(default=0, init=False, repr=False)
+    _window_cursors: Dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    _keydown_total: int = field(default=0, init=False, repr=False)
+    _interval_sum: float = field(default=0.0, init=False, repr=False)
+    _interval_sq_sum: float = field(default=0.0, init=False, repr=False)
+    _pause_count: int = field(default=0, init=False, repr=False)
+    _last_keydown_ts: Optional[float] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        capacity = min(INITIAL_BUFFER_CAPACITY, self.max_size * 2)
+        self._keys = [None] * capacity
+        self._timestamps = np.zeros(capacity, dtype=np.uint32)
+        self._event_types = np.zeros(capacity, dtype=np.uint8)
+        self._durations = np.zeros(capacity, dtype=np.int32)
+        self._prefix = np.zeros((capacity, 4), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    @property
+    def events(self) -> List[TypingEvent]:
+        """버퍼에 남아 있는 이벤트 (오래된 순, 요청 시 재구성)"""
+        return self._materialize(self._head)
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        """가장 최근 이벤트의 타임스탬프 (비어 있으면 None)"""
+        if self._tail == self._head:
+            return None
+        return float(self.epoch_ms + int(self._timestamps[self._tail - 1]))
 
-    def add_event(self, event: TypingEvent) -> None:
-        """이벤트 추가 (FIFO, 크기 제한)"""
-        if len(self.events) >= self.max_size:
-            self.events.popleft()  # O(1) 연산
-        self.events.append(event)
-
-    def get_recent_events(self, window_ms: int = 5000) -> List[TypingEvent]:
-        """최근 윈도우 내 이벤트 반환"""
-        now = time.time() * 1000
-        cutoff = now - window_ms
-
-        # deque는 오른쪽부터 순회하는 것이 효율적
-        recent_events = []
-        for event in reversed(self.events):
-            if event.timestamp >= cutoff:
-                recent_events.append(event)
-            else:
-                break  # 정렬된 상태이므로 중단 가능
+    def add_event(self, event: TypingEvent) -> int:
+        """
+        이벤트 추가 (FIFO, 크기 제한)
+
+        Returns:
+            버퍼 크기 변화량 (가득 차서 가장 오래된 이벤트를 밀어낸 경우 0)
+        """
+        if not self.session_id:
+            self.session_id = event.session_id
+        return self.append(event.key, event.timestamp, event.event_type, event.duration)
 
-        return list(reversed(recent_events))
+    def append(
+        self,
+        key: str,
+        timestamp: float,
+        event_type: str,
+        duration: float = 0.0
+    ) -> int:
+        """
+        필드 값으로 이벤트 추가 (TypingEvent 객체를 만들지 않는 경로)
 
-    def clear_old_events(self, max_age_ms: int = 30000) -> int:
-        """오래된 이벤트 정리"""
-        now = time.time() * 1000
-        cutoff = now - max_age_ms
-        removed = 0
+        Returns:
+            버퍼 크기 변화량 (가득 차서 가장 오래된 이벤트를 밀어낸 경우 0)
 
-        while self.events and self.events[0].timestamp < cutoff:
-            self.events.popleft()
-            removed += 1
+        Raises:
+            ValueError: 지원하지 않는 이벤트 타입, 또는 버퍼 구간이 uint32 범위를 넘는 타임스탬프
+        """
+        type_code = _EVENT_TYPE_CODES.get(event_type)
+        if type_code is None:
+            raise ValueError(f"unsupported event type: {event_type!r}")
+
+        # ms 정수로 양자화 후 기준 시각 오프셋 계산 (범위를 벗어나면 기준 시각 재설정)
+        timestamp_ms = int(round(timestamp))
+        duration_ms = int(round(duration))
+        if self._tail == self._head:
+            self.epoch_ms = timestamp_ms
+        else:
+            # 늦게 도착한(순서가 뒤바뀐) 이벤트는 마지막 시각으로 당겨 배열 정렬을 유지
+            # (윈도우 이진 탐색과 간격 계산이 정렬된 타임스탬프를 전제로 함)
+            newest_ms = self.epoch_ms + int(self._timestamps[self._tail - 1])
+            timestamp_ms = max(timestamp_ms, newest_ms)
+        offset = timestamp_ms - self.epoch_ms
+        if offset > MAX_TIMESTAMP_OFFSET_MS:
+            epoch_ms = self.epoch_ms + int(self._timestamps[self._head])
+            if timestamp_ms - epoch_ms > MAX_TIMESTAMP_OFFSET_MS:
+                raise ValueError(f"timestamp out of buffer range: {timestamp!r}")
+            self._rebase(epoch_ms)
+            offset = timestamp_ms - epoch_ms
+
+        # 누적값을 먼저 지역 변수로 계산 - 계산 중 예외가 나도 버퍼 상태는 그대로 유지
+        keydown_total = self._keydown_total
+        interval_sum = self._interval_sum
+        interval_sq_sum = self._interval_sq_sum
+        pause_count = self._pause_count
+        last_keydown_ts = self._last_keydown_ts
+
+        if type_code == EVENT_KEYDOWN:
+            if last_keydown_ts is not None:
+                interval = timestamp_ms - last_keydown_ts
+                interval_sum += interval
+                interval_sq_sum += interval * interval
+                if interval > PAUSE_THRESHOLD_MS:
+                    pause_count += 1
+            keydown_total += 1
+            last_keydown_ts = float(timestamp_ms)
+
+        added = 1
+        if self._tail - self._head >= self.max_size:
+            self._drop_front(1)  # O(1) 연산
+            added = 0
+        if self._tail == len(self._keys):
+            self._make_room()
+
+        self._keydown_total = keydown_total
+        self._interval_sum = interval_sum
+        self._interval_sq_sum = interval_sq_sum
+        self._pause_count = pause_count
+        self._last_keydown_ts = last_keydown_ts
+
+        tail = self._tail
+        self._keys[tail] = key
+        self._timestamps[tail] = offset
+        self._event_types[tail] = type_code
+        self._durations[tail] = duration_ms
+        self._prefix[tail] = (keydown_total, interval_sum, interval_sq_sum, pause_count)
+        self._tail = tail + 1
+        return added
+
+    def get_interval_stats(self, event_count: int) -> IntervalStats:
+        """최근 event_count개 이벤트의 keydown 간격 통계 (누적값 차이로 계산)"""
+        event_count = min(event_count, len(self))
+        stats = IntervalStats(event_count=event_count)
+        if event_count == 0 or self._last_keydown_ts is None:
+            return stats
+
+        # 윈도우 내 첫 keydown 탐색 (keydown/keyup이 번갈아 오므로 보통 1~2칸)
+        tail = self._tail
+        first = tail - event_count
+        event_types = self._event_types
+        while first < tail and event_types[first] != EVENT_KEYDOWN:
+            first += 1
+        if first == tail:
+            return stats
+
+        # 첫 keydown의 간격은 윈도우 밖 keydown과의 간격이므로 제외
+        base_keydowns, base_sum, base_sq_sum, base_pauses = self._prefix[first]
+        stats.keydown_count = self._keydown_total - int(base_keydowns) + 1
+        stats.interval_sum = self._interval_sum - float(base_sum)
+        stats.interval_sq_sum = self._interval_sq_sum - float(base_sq_sum)
+        stats.pause_count = self._pause_count - int(base_pauses)
+        stats.first_keydown_ts = float(self.epoch_ms + int(self._timestamps[first]))
+        stats.last_keydown_ts = self._last_keydown_ts
+        return stats
+
+    def get_recent_count(
+        self,
+        window_ms: int = 5000,
+        now_ms: Optional[float] = None
+    ) -> int:
+        """최근 윈도우 내 이벤트 수 (now_ms: 호출자가 캐시한 현재 시각)"""
+        if now_ms is None:
+            now_ms = time.time() * 1000
+        return self._tail - self._window_start(window_ms, now_ms - window_ms)
+
+    def get_recent_events_arrays(
+        self,
+        window_ms: int = 5000,
+        now_ms: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        최근 윈도우의 (타임스탬프 오프셋, 이벤트 타입) 배열 뷰
+
+        타임스탬프는 epoch_ms 기준 uint32 ms 오프셋이며, 간격은
+        np.diff(timestamps.astype(np.int32))로 구할 수 있다.
+        반환값은 내부 저장소의 뷰이므로 다음 add_event 전까지만 유효하다.
+        """
+        if now_ms is None:
+            now_ms = time.time() * 1000
+        start = self._window_start(window_ms, now_ms - window_ms)
+        tail = self._tail
+        return self._timestamps[start:tail], self._event_types[start:tail]
 
+    def get_recent_events(
+        self,
+        window_ms: int = 5000,
+        now_ms: Optional[float] = None
+    ) -> List[TypingEvent]:
+        """최근 윈도우 내 이벤트 반환 (now_ms: 호출자가 캐시한 현재 시각)"""
+        if now_ms is None:
+            now_ms = time.time() * 1000
+        return self._materialize(self._window_start(window_ms, now_ms - window_ms))
+
+    def keystroke_data(self, event_count: int) -> List[Dict[str, Any]]:
+        """최근 event_count개 이벤트의 직렬화 데이터 (TypingEvent.to_dict와 같은 형식)"""
+        tail = self._tail
+        start = tail - min(event_count, len(self))
+        type_names = _EVENT_TYPE_NAMES
+        return [
+            {
+                'key': key,
+                'timestamp': timestamp,
+                'type': type_names[type_code],
+                'duration': duration
+            }
+            for key, timestamp, type_code, duration in zip(
+                self._keys[start:tail],
+                self._absolute_timestamps(start, tail),
+                self._event_types[start:tail].tolist(),
+                self._durations[start:tail].astype(np.float64).tolist()
+            )
+        ]
+
+    def clear_old_events(
+        self,
+        max_age_ms: int = 30000,
+        now_ms: Optional[float] = None
+    ) -> int:
+        """오래된 이벤트 정리 (now_ms: 호출자가 캐시한 현재 시각)"""
+        if now_ms is None:
+            now_ms = time.time() * 1000
+        head, tail = self._head, self._tail
+        removed = int(np.searchsorted(
+            self._timestamps[head:tail], self._offset_cutoff(now_ms - max_age_ms), side='left'
+        ))
+        if removed:
+            self._drop_front(removed)
+
+        # 남은 가장 오래된 이벤트가 기준 시각에서 너무 멀어지면 기준 시각을 앞으로 당김
+        head = self._head
+        if head < tail and int(self._timestamps[head]) > EPOCH_REBASE_THRESHOLD_MS:
+            self._rebase(self.epoch_ms + int(self._timestamps[head]))
         return removed
 
+    def _offset_cutoff(self, cutoff: float) -> np.uint32:
+        """절대 시각 cutoff 이상인 첫 오프셋 값 (uint32 범위로 제한)"""
+        offset = math.ceil(cutoff - self.epoch_ms)
+        return np.uint32(min(max(offset, 0), MAX_TIMESTAMP_OFFSET_MS))
+
+    def _absolute_timestamps(self, start: int, end: int) -> List[float]:
+        """[start, end) 구간 오프셋을 절대 타임스탬프(ms) 목록으로 변환"""
+        timestamps: List[float] = (
+            self._timestamps[start:end].astype(np.float64) + self.epoch_ms
+        ).tolist()
+        return timestamps
+
+    def _rebase(self, epoch_ms: int) -> None:
+        """기준 시각을 epoch_ms로 옮기고 유효 구간 오프셋을 다시 계산"""
+        head, tail = self._head, self._tail
+        shift = self.epoch_ms - epoch_ms
+        offsets: np.ndarray = self._timestamps[head:tail].astype(np.int64) + shift
+        self._timestamps[head:tail] = offsets
+        self.epoch_ms = epoch_ms
+
+    def _materialize(self, start: int) -> List[TypingEvent]:
+        """[start, tail) 구간을 TypingEvent 목록으로 재구성 (유효 구간에는 None이 없음)"""
+        tail = self._tail
+        session_id = self.session_id
+        type_names = _EVENT_TYPE_NAMES
+        return [
+            TypingEvent(
+                key=cast(str, key),
+                timestamp=timestamp,
+                event_type=type_names[type_code],
+                session_id=session_id,
+                duration=duration
+            )
+            for key, timestamp, type_code, duration in zip(
+                self._keys[start:tail],
+                self._absolute_timestamps(start, tail),
+                self._event_types[start:tail].tolist(),
+                self._durations[start:tail].astype(np.float64).tolist()
+            )
+        ]
+
+    def _window_start(self, window_ms: int, cutoff: float) -> int:
+        """cutoff 이후 첫 이벤트 인덱스 (윈도우별 커서를 앞으로만 전진)"""
+        head, tail = self._head, self._tail
+        timestamps = self._timestamps
+        start = self._window_cursors.get(window_ms, head)
+
+        # 커서가 버퍼 밖이거나 기준 시각이 뒤로 간 경우 전체 구간에서 다시 탐색
+        offset_cutoff = self._offset_cutoff(cutoff)
+        if start < head or start > tail or (
+            start > head and timestamps[start - 1] >= offset_cutoff
+        ):
+            start = head
+
+        # 정렬된 상태이므로 cutoff 이전 구간만 건너뛰면 됨
+        start += int(np.searchsorted(timestamps[start:tail], offset_cutoff, side='left'))
+        self._window_cursors[window_ms] = start
+        return start
+
+    def _drop_front(self, count: int) -> None:
+        """앞쪽 count개 이벤트 제거 (키 문자열 참조 해제 포함)"""
+        head = self._head
+        new_head = head + count
+        self._keys[head:new_head] = [None] * count
+        self._head = new_head
+
+    def _make_room(self) -> None:
+        """
+        tail이 끝에 닿았을 때 공간 확보
+
+        유효 구간이 용량의 절반 이하이면 같은 용량에서 앞으로 당기고,
+        아니면 용량을 두 배로 늘린다 (최대 max_size의 2배).
+        """
+        capacity = len(self._keys)
+        size = self._tail - self._head
+        if size * 2 > capacity:
+            capacity = min(capacity * 2, self.max_size * 2)
+        self._relocate(capacity)
+
+    def _relocate(self, capacity: int) -> None:
+        """유효 구간 [head, tail)을 주어진 용량의 저장소 앞쪽으로 이동"""
+        head, tail = self._head, self._tail
+        size = tail - head
+
+        keys: List[Optional[str]] = [None] * capacity
+        keys[:size] = self._keys[head:tail]
+        self._keys = keys
+
+        if capacity == len(self._timestamps):
+            self._timestamps[:size] = self._timestamps[head:tail]
+            self._event_types[:size] = self._event_types[head:tail]
+            self._durations[:size] = self._durations[head:tail]
+            self._prefix[:size] = self._prefix[head:tail]
+        else:
+            self._timestamps = self._resized(self._timestamps, capacity, size)
+            self._event_types = self._resized(self._event_types, capacity, size)
+            self._durations = self._resized(self._durations, capacity, size)
+            self._prefix = self._resized(self._prefix, capacity, size)
+
+        self._window_cursors = {
+            window_ms: max(cursor - head, 0)
+            for window_ms, cursor in self._window_cursors.items()
+        }
+        self._head = 0
+        self._tail = size
+
+    def _resized(self, array: np.ndarray, capacity: int, size: int) -> np.ndarray:
+        """유효 구간만 복사한 새 용량의 배열 (dtype/열 구성 유지)"""
+        head = self._head
+        resized: np.ndarray = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+        resized[:size] = array[head:head + size]
+        return resized
+
+
+def _compute_pattern_scores(
+    stats_matrix: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    세션별 통계 행렬에서 WPM / 평균 간격 / 리듬 일관성을 한 번에 계산
+
+    Args:
+        stats_matrix: (세션 수, 4) 배열 - keydown 수, 간격 합, 간격 제곱합, 시간 범위(ms)
+
+    Returns:
+        (wpm, avg_interval, rhythm_consistency) 세션별 1차원 배열
+    """
+    keydown_counts = stats_matrix[:, 0]
+    interval_counts = np.maximum(keydown_counts - 1.0, 0.0)
+    time_span_seconds = stats_matrix[:, 3] / 1000.0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 평균 단어 길이 5자 가정
+        wpm = np.where(
+            time_span_seconds > 0, (keydown_counts / 5.0) / time_span_seconds * 60.0, 0.0
+        )
+        avg_interval = np.where(interval_counts > 0, stats_matrix[:, 1] / interval_counts, 0.0)
+        variance = np.where(
+            interval_counts > 0,
+            stats_matrix[:, 2] / interval_counts - avg_interval * avg_interval,
+            0.0
+        )
+        std_dev = np.sqrt(np.maximum(variance, 0.0))
+        cv = np.where(avg_interval > 0, std_dev / avg_interval, 1.0)
+
+    rhythm_consistency = np.where(
+        interval_counts >= 3, np.maximum(0.0, 1.0 - np.minimum(cv, 1.0)), 0.0
+    )
+    return wpm, avg_interval, rhythm_consistency
+
 
 class OptimizedPatternProcessor:
     """고성능 타이핑 패턴 실시간 처리기"""
@@ -129,68 +566,65 @@ class OptimizedPatternProcessor:
         self.processing_interval_ms = processing_interval_ms
         self.cleanup_interval_s = cleanup_interval_s
 
-        # 세션별 버퍼
-        self.session_buffers: Dict[str, EventBuffer] = {}
+        # 세션별 버퍼 (최근 사용 순서 유지 - LRU)
+        self.session_buffers: OrderedDict[str, EventBuffer] = OrderedDict()
+        self._total_buffered = 0  # 전체 버퍼 이벤트 수 (증분 관리)
 
-        # 처리 대기열
-        self.processing_queue: Queue[str] = Queue(maxsize=max_concurrent_sessions)
+        # 처리 대기열 (중복 없는 FIFO: 대기 중 세션 집합 + 순서 큐)
+        # 집합 크기는 max_concurrent_sessions 이하이므로 가득 차는 경우가 없음
+        self._dirty_set: Set[str] = set()
+        self._dirty_queue: Deque[str] = deque()
 
         # 성능 메트릭
         self.metrics = ProcessingMetrics()
 
-        # 이벤트 및 제어
+        # 이벤트 및 제어 (처리/정리를 하나의 백그라운드 태스크에서 수행)
         self.shutdown_event = Event()
+        self._has_work = Event()  # 대기 세션이 생기면 처리 루프를 깨움
         self.processing_task: Optional[asyncio.Task] = None
-        self.cleanup_task: Optional[asyncio.Task] = None
 
         # 패턴 분석 서비스
         self.pattern_service = PatternAnalysisService()
 
-        # 스레드 풀 (CPU 집약적 작업용)
-        self.thread_pool = ThreadPoolExecutor(
-            max_workers=min(4, threading.cpu_count()),
-            thread_name_prefix="pattern-processor"
-        )
-
         # 콜백 등록
         self.pattern_callbacks: WeakSet[Callable] = WeakSet()
 
-        # 캐시 (최근 분석 결과)
-        self.analysis_cache: Dict[str, Dict[str, Any]] = {}
+        # 캐시 (최근 분석 결과, LRU)
+        # 키: (세션 ID, 윈도우 이벤트 수, 마지막 이벤트 타임스탬프)
+        self.analysis_cache: OrderedDict[Tuple[str, int, Optional[float]], Dict[str, Any]] = (
+            OrderedDict()
+        )
         self.cache_max_size = 500
 
-        print(f"🚀 OptimizedPatternProcessor initialized (max_sessions={max_concurrent_sessions})")
+        logger.info(
+            "OptimizedPatternProcessor initialized (max_sessions=%d)", max_concurrent_sessions
+        )
 
     async def start(self) -> None:
         """프로세서 시작"""
         if self.processing_task and not self.processing_task.done():
             return
 
-        print("⚡ Starting pattern processor...")
+        logger.info("Starting pattern processor...")
         self.shutdown_event.clear()
 
         # 백그라운드 태스크 시작
         self.processing_task = asyncio.create_task(self._processing_loop())
-        self.cleanup_task = asyncio.create_task(self._cleanup_loop())
 
-        print("✅ Pattern processor started")
+        logger.info("Pattern processor started")
 
     async def stop(self) -> None:
         """프로세서 중지"""
-        print("⏹️  Stopping pattern processor...")
+        logger.info("Stopping pattern processor...")
 
         self.shutdown_event.set()
+        self._has_work.set()  # 작업 대기 중인 루프를 즉시 깨움
 
         # 태스크 종료 대기
         if self.processing_task:
             await self.processing_task
-        if self.cleanup_task:
-            await self.cleanup_task
 
-        # 스레드 풀 종료
-        self.thread_pool.shutdown(wait=True)
-
-        print("🛑 Pattern processor stopped")
+        logger.info("Pattern processor stopped")
 
     async def process_typing_event(
         self,
@@ -207,53 +641,67 @@ class OptimizedPatternProcessor:
         Returns:
             처리 결과 (패턴 업데이트가 있는 경우)
         """
-        start_time = time.perf_counter()
+        start_ns = time.perf_counter_ns()
+        metrics = self.metrics
+        session_buffers = self.session_buffers
 
         try:
-            # 1. 세션 버퍼 확인/생성
-            if session_id not in self.session_buffers:
-                if len(self.session_buffers) >= self.max_concurrent_sessions:
+            # 0. 타임스탬프 검증 (버퍼를 건드리기 전에 숫자로 변환)
+            if 'timestamp' in event_data:
+                timestamp = float(event_data['timestamp'])
+                if not math.isfinite(timestamp):
+                    raise ValueError(f"invalid timestamp: {event_data['timestamp']!r}")
+            else:
+                timestamp = time.time() * 1000
+
+            # 1. 세션 버퍼 확인/생성 (조회 1회)
+            buffer = session_buffers.get(session_id)
+            if buffer is None:
+                if len(session_buffers) >= self.max_concurrent_sessions:
                     # LRU 방식으로 오래된 세션 제거
                     await self._evict_oldest_session()
 
-                self.session_buffers[session_id] = EventBuffer(
-                    max_size=self.buffer_size_per_session
+                buffer = session_buffers[session_id] = EventBuffer(
+                    max_size=self.buffer_size_per_session,
+                    session_id=session_id
                 )
 
-            buffer = self.session_buffers[session_id]
-
-            # 2. 타이핑 이벤트 생성
-            typing_event = TypingEvent(
-                key=event_data.get('key', ''),
-                timestamp=event_data.get('timestamp', time.time() * 1000),
-                event_type=event_data.get('type', 'keydown'),
-                session_id=session_id,
-                duration=event_data.get('duration', 0.0)
+            # 2~3. 필드 배열에 직접 추가 (O(1), TypingEvent 생성 없음) 및 LRU 순서 갱신
+            total_buffered = self._total_buffered + buffer.append(
+                event_data.get('key', ''),
+                timestamp,
+                event_data.get('type', 'keydown'),
+                event_data.get('duration', 0.0)
             )
+            self._total_buffered = total_buffered
+            session_buffers.move_to_end(session_id)
 
-            # 3. 버퍼에 추가 (O(1))
-            buffer.add_event(typing_event)
-
-            # 4. 처리 대기열에 세션 추가 (중복 방지)
-            try:
-                self.processing_queue.put_nowait(session_id)
-            except asyncio.QueueFull:
-                pass  # 이미 처리 대기 중
+            # 4. 처리 대기열에 세션 추가 (중복 방지, O(1))
+            if session_id not in self._dirty_set:
+                self._dirty_set.add(session_id)
+                self._dirty_queue.append(session_id)
+                self._has_work.set()
 
             # 5. 메트릭 업데이트
-            self.metrics.events_processed += 1
-            self.metrics.buffer_size = sum(
-                len(buf.events) for buf in self.session_buffers.values()
-            )
-
-            # 6. 레이턴시 측정
-            latency_ms = (time.perf_counter() - start_time) * 1000
-            self._update_latency_metrics(latency_ms)
+            metrics.events_processed += 1
+            metrics.buffer_size = total_buffered
+
+            # 6. 레이턴시 측정 (_update_latency_metrics와 같은 규칙, 호출 비용을 줄이려고 인라인)
+            latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+            avg_latency_ms = metrics.avg_latency_ms
+            if avg_latency_ms == 0.0:
+                metrics.avg_latency_ms = latency_ms
+            else:
+                metrics.avg_latency_ms = (
+                    avg_latency_ms + LATENCY_EMA_ALPHA * (latency_ms - avg_latency_ms)
+                )
+            if latency_ms > metrics.max_latency_ms:
+                metrics.max_latency_ms = latency_ms
 
             return {"status": "queued", "latency_ms": round(latency_ms, 2)}
 
         except Exception as e:
-            print(f"❌ Error processing typing event: {e}")
+            logger.warning("Error processing typing event: session_id=%s, error=%s", session_id, e)
             return {"status": "error", "error": str(e)}
 
     async def get_session_pattern(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -262,29 +710,28 @@ class OptimizedPatternProcessor:
             return None
 
         buffer = self.session_buffers[session_id]
-        recent_events = buffer.get_recent_events(window_ms=10000)  # 10초 윈도우
+        recent_count = buffer.get_recent_count(window_ms=10000)  # 10초 윈도우
 
-        if len(recent_events) < 10:
+        if recent_count < 10:
             return None
 
         # 캐시 확인
-        cache_key = f"{session_id}_{len(recent_events)}_{recent_events[-1].timestamp}"
-        if cache_key in self.analysis_cache:
-            return self.analysis_cache[cache_key]
-
-        # 패턴 분석 (스레드 풀에서 실행)
-        loop = asyncio.get_event_loop()
-        analysis_result = await loop.run_in_executor(
-            self.thread_pool,
-            self._analyze_events_sync,
-            recent_events
-        )
+        cache_key = (session_id, recent_count, buffer.last_timestamp)
+        cached = self.analysis_cache.get(cache_key)
+        if cached is not None:
+            self.analysis_cache.move_to_end(cache_key)
+            return cached
+
+        # 패턴 분석 (누적 통계 기반 O(1) 계산이므로 이벤트 루프에서 바로 실행)
+        analysis_result = self._analyze_batch_sync([(
+            buffer.keystroke_data(recent_count),
+            buffer.get_interval_stats(recent_count)
+        )])[0]
 
         # 캐시 저장 (크기 제한)
         if len(self.analysis_cache) >= self.cache_max_size:
-            # LRU 방식으로 오래된 항목 제거
-            oldest_key = next(iter(self.analysis_cache))
-            del self.analysis_cache[oldest_key]
+            # LRU 방식으로 오래된 항목 제거 (O(1))
+            self.analysis_cache.popitem(last=False)
 
         self.analysis_cache[cache_key] = analysis_result
 
@@ -292,8 +739,8 @@ class OptimizedPatternProcessor:
 
     def get_metrics(self) -> Dict[str, Any]:
         """성능 메트릭 조회"""
-        current_time = time.time()
-        time_elapsed = current_time - self.metrics.last_reset_time
+        time_elapsed = time.monotonic() - self.metrics.last_reset_time
+        self.metrics.buffer_size = self._total_buffered
 
         if time_elapsed > 0:
             self.metrics.processing_rate = self.metrics.events_processed / time_elapsed
@@ -307,7 +754,7 @@ class OptimizedPatternProcessor:
             "processing_rate": round(self.metrics.processing_rate, 2),
             "active_sessions": len(self.session_buffers),
             "cache_size": len(self.analysis_cache),
-            "queue_size": self.processing_queue.qsize(),
+            "queue_size": len(self._dirty_set),
             "uptime_seconds": round(time_elapsed, 1)
         }
 
@@ -320,192 +767,288 @@ class OptimizedPatternProcessor:
         self.pattern_callbacks.add(callback)
 
     async def _processing_loop(self) -> None:
-        """백그라운드 처리 루프"""
-        print("🔄 Processing loop started")
+        """
+        백그라운드 처리 루프 (이벤트 기반)
+
+        대기 세션이 생기면 즉시 깨어나 배치를 처리하고, 배치 사이에는
+        processing_interval_ms만큼 쉬어 그 사이 들어온 이벤트를 다음 배치로 모은다.
+        대기할 작업이 없으면 다음 정리 시각까지 잠들며, 정리도 같은 루프에서 수행한다.
+        """
+        logger.debug("Processing loop started")
+
+        min_interval_s = self.processing_interval_ms / 1000.0
+        next_cleanup = time.monotonic() + self.cleanup_interval_s
 
         while not self.shutdown_event.is_set():
             try:
-                # 처리 간격만큼 대기
-                await asyncio.sleep(self.processing_interval_ms / 1000.0)
-
-                # 배치 처리
-                processed_sessions = []
-                batch_count = 0
-
-                while batch_count < self.batch_size and not self.processing_queue.empty():
-                    try:
-                        session_id = self.processing_queue.get_nowait()
-                        if session_id not in processed_sessions:
-                            await self._process_session_batch(session_id)
-                            processed_sessions.append(session_id)
-                            batch_count += 1
-                    except asyncio.QueueEmpty:
-                        break
-
-                if processed_sessions:
-                    print(f"📊 Processed {len(processed_sessions)} sessions")
-
-            except Exception as e:
-                print(f"❌ Error in processing loop: {e}")
+                # 작업이 들어오거나 정리 시각이 될 때까지 대기
+                try:
+                    await asyncio.wait_for(
+                        self._has_work.wait(),
+                        timeout=max(next_cleanup - time.monotonic(), 0.0)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+                if self.shutdown_event.is_set():
+                    break
+
+                now = time.monotonic()
+                if now >= next_cleanup:
+                    next_cleanup = now + self.cleanup_interval_s
+                    self._cleanup_old_data()
+
+                if self._has_work.is_set():
+                    self._has_work.clear()
+                    await self._process_pending_sessions()
+
+                    # 배치 크기를 넘어 남은 세션은 다음 차례에 이어서 처리
+                    if self._dirty_queue:
+                        self._has_work.set()
+
+                    # 최소 처리 간격 보장
+                    await asyncio.sleep(min_interval_s)
+
+            except Exception:
+                logger.exception("Error in processing loop")
                 await asyncio.sleep(1.0)  # 오류 시 잠시 대기
 
-    async def _process_session_batch(self, session_id: str) -> None:
-        """세션 배치 처리"""
-        if session_id not in self.session_buffers:
-            return
-
-        buffer = self.session_buffers[session_id]
-        recent_events = buffer.get_recent_events()
-
-        if len(recent_events) < 10:  # 최소 이벤트 수 요구
-            return
+    async def _process_pending_sessions(self) -> None:
+        """대기열에서 최대 batch_size개 세션을 꺼내 분석"""
+        # 배치 수집 (대기열에는 세션당 최대 1개 항목만 존재)
+        batch_count = 0
+        now_ms = time.time() * 1000  # 배치 전체에서 동일한 기준 시각 사용
+        ready_sessions: List[Tuple[str, List[Dict[str, Any]], IntervalStats]] = []
+
+        while batch_count < self.batch_size and self._dirty_queue:
+            session_id = self._dirty_queue.popleft()
+            if session_id not in self._dirty_set:
+                continue  # 대기 중 제거된 세션의 남은 항목
+            self._dirty_set.remove(session_id)
+            batch_count += 1
+
+            buffer = self.session_buffers.get(session_id)
+            if buffer is None:
+                continue
+
+            recent_count = buffer.get_recent_count(now_ms=now_ms)
+            if recent_count < 10:  # 최소 이벤트 수 요구
+                continue
+
+            ready_sessions.append((
+                session_id,
+                buffer.keystroke_data(recent_count),
+                buffer.get_interval_stats(recent_count)
+            ))
+
+        # 준비된 세션을 한 번에 분석
+        if ready_sessions:
+            await self._process_session_batch(ready_sessions)
+
+        if batch_count and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processed %d sessions", batch_count)
+
+    async def _process_session_batch(
+        self,
+        ready_sessions: List[Tuple[str, List[Dict[str, Any]], IntervalStats]]
+    ) -> None:
+        """세션 배치 처리 (세션별 분석을 하나의 벡터화 연산으로 묶어 실행)"""
+        # 패턴 분석 (배치당 벡터화 연산 1회, 오류는 세션별 결과로 격리됨)
+        analysis_results = self._analyze_batch_sync(
+            [(keystrokes, stats) for _, keystrokes, stats in ready_sessions]
+        )
 
-        try:
-            # 비동기로 패턴 분석
-            loop = asyncio.get_event_loop()
-            analysis_result = await loop.run_in_executor(
-                self.thread_pool,
-                self._analyze_events_sync,
-                recent_events
-            )
+        # 배치당 한 번만 콜백 목록 스냅샷 (WeakSet이므로 강한 참조 목록은 보관하지 않음)
+        callbacks = list(self.pattern_callbacks)
 
+        for (session_id, _, _), analysis_result in zip(ready_sessions, analysis_results):
             # 메트릭 업데이트
             self.metrics.patterns_analyzed += 1
 
-            # 콜백 호출
-            for callback in list(self.pattern_callbacks):
-                try:
-                    await callback(session_id, analysis_result)
-                except Exception as e:
-                    print(f"⚠️ Callback error: {e}")
-
-        except Exception as e:
-            print(f"❌ Error processing session {session_id}: {e}")
-
-    async def _cleanup_loop(self) -> None:
-        """정리 루프 (메모리 관리)"""
-        print("🧹 Cleanup loop started")
-
-        while not self.shutdown_event.is_set():
-            try:
-                await asyncio.sleep(self.cleanup_interval_s)
-
-                # 오래된 이벤트 정리
-                total_removed = 0
-                for session_id, buffer in list(self.session_buffers.items()):
-                    removed = buffer.clear_old_events(max_age_ms=300000)  # 5분
-                    total_removed += removed
-
-                    # 빈 버퍼 제거
-                    if not buffer.events:
-                        del self.session_buffers[session_id]
-
-                # 캐시 정리 (크기 제한)
-                if len(self.analysis_cache) > self.cache_max_size * 0.8:
-                    items_to_remove = len(self.analysis_cache) - int(self.cache_max_size * 0.6)
-                    for i, key in enumerate(list(self.analysis_cache.keys())):
-                        if i >= items_to_remove:
-                            break
-                        del self.analysis_cache[key]
-
-                if total_removed > 0:
-                    print(f"🗑️  Cleaned up {total_removed} old events")
-
-            except Exception as e:
-                print(f"❌ Error in cleanup loop: {e}")
+            # 콜백 동시 호출 (느린 구독자가 다른 구독자를 막지 않도록)
+            if not callbacks:
+                continue
+            callback_results = await asyncio.gather(
+                *(callback(session_id, analysis_result) for callback in callbacks),
+                return_exceptions=True
+            )
+            for callback_result in callback_results:
+                if isinstance(callback_result, BaseException):
+                    logger.warning("Pattern callback error: %r", callback_result, exc_info=callback_result)
+
+    def _cleanup_old_data(self) -> None:
+        """오래된 이벤트/빈 세션/캐시 정리 (메모리 관리)"""
+        # 오래된 이벤트 정리
+        total_removed = 0
+        now_ms = time.time() * 1000
+        for session_id, buffer in list(self.session_buffers.items()):
+            removed = buffer.clear_old_events(max_age_ms=300000, now_ms=now_ms)  # 5분
+            total_removed += removed
+            self._total_buffered -= removed
+
+            # 빈 버퍼 제거
+            if not buffer:
+                del self.session_buffers[session_id]
+
+        # 캐시 정리 (크기 제한)
+        if len(self.analysis_cache) > self.cache_max_size * 0.8:
+            items_to_remove = len(self.analysis_cache) - int(self.cache_max_size * 0.6)
+            for _ in range(items_to_remove):
+                self.analysis_cache.popitem(last=False)
+
+        if total_removed > 0:
+            logger.info("Cleaned up %d old events", total_removed)
 
     async def _evict_oldest_session(self) -> None:
         """가장 오래된 세션 제거 (LRU)"""
         if not self.session_buffers:
             return
 
-        # 마지막 이벤트 시간 기준으로 정렬
-        session_ages = [
-            (session_id, buffer.events[-1].timestamp if buffer.events else 0)
-            for session_id, buffer in self.session_buffers.items()
-        ]
-
-        if session_ages:
-            oldest_session = min(session_ages, key=lambda x: x[1])
-            del self.session_buffers[oldest_session[0]]
-            print(f"🗑️ Evicted oldest session: {oldest_session[0]}")
+        # 가장 앞쪽이 가장 오래 사용되지 않은 세션 (O(1))
+        oldest_session_id, oldest_buffer = self.session_buffers.popitem(last=False)
+        self._total_buffered -= len(oldest_buffer)
+        # 대기열 항목은 처리 루프에서 건너뛰므로 집합은 활성 세션 수 이하로 유지됨
+        self._dirty_set.discard(oldest_session_id)
+        logger.info("Evicted oldest session: %s", oldest_session_id)
 
-    def _analyze_events_sync(self, events: List[TypingEvent]) -> Dict[str, Any]:
-        """동기 이벤트 분석 (스레드 풀용)"""
-        if len(events) < 2:
-            return {"error": "insufficient_events"}
-
-        # TypingEvent를 딕셔너리로 변환
-        keystroke_data = [event.to_dict() for event in events]
-
-        # 기본 통계 계산
-        keydown_events = [e for e in events if e.event_type == 'keydown']
+    def _analyze_events_sync(
+        self,
+        events: List[TypingEvent],
+        stats: Optional[IntervalStats] = None
+    ) -> Dict[str, Any]:
+        """
+        동기 이벤트 분석
 
-        if len(keydown_events) < 2:
-            return {"error": "insufficient_keydown_events"}
+        Args:
+            events: 분석할 이벤트 목록
+            stats: 버퍼에서 미리 집계한 간격 통계 (없으면 이벤트에서 직접 계산)
+        """
+        try:
+            if stats is None:
+                stats = IntervalStats.from_events(events)
+            keystrokes = [event.to_dict() for event in events]
+        except Exception as e:
+            logger.exception("Analysis error")
+            return {"error": "analysis_failed", "detail": str(e)}
+        return self._analyze_batch_sync([(keystrokes, stats)])[0]
 
-        # 타이핑 속도 계산
-        time_span = keydown_events[-1].timestamp - keydown_events[0].timestamp
-        time_span_seconds = time_span / 1000.0
+    def _analyze_batch_sync(
+        self,
+        batch: Sequence[Tuple[List[Dict[str, Any]], IntervalStats]]
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 세션 동기 분석 (세션별 통계를 행렬로 쌓아 한 번에 계산)
 
-        if time_span_seconds <= 0:
-            return {"error": "invalid_time_span"}
+        한 세션의 분석 실패는 해당 행에 {"error": ...}로만 기록되고
+        나머지 세션 결과에는 영향을 주지 않는다.
+        """
+        results: List[Dict[str, Any]] = [
+            {"error": "analysis_failed"} for _ in batch
+        ]
+        valid_indices: List[int] = []
+        valid_stats: List[IntervalStats] = []
+        stats_rows: List[Tuple[float, float, float, float]] = []
 
-        words_count = len(keydown_events) / 5  # 평균 단어 길이 5자 가정
-        wpm = (words_count / time_span_seconds) * 60
+        for index, (keystrokes, stats) in enumerate(batch):
+            try:
+                if len(keystrokes) < 2:
+                    results[index] = {"error": "insufficient_events"}
+                    continue
+
+                if stats.keydown_count < 2:
+                    results[index] = {"error": "insufficient_keydown_events"}
+                    continue
+
+                time_span = float(stats.last_keydown_ts - stats.first_keydown_ts)
+                if time_span <= 0:
+                    results[index] = {"error": "invalid_time_span"}
+                    continue
+
+                stats_rows.append((
+                    float(stats.keydown_count),
+                    float(stats.interval_sum),
+                    float(stats.interval_sq_sum),
+                    time_span
+                ))
+                valid_indices.append(index)
+                valid_stats.append(stats)
+            except Exception as e:
+                logger.exception("Analysis error (row %d)", index)
+                results[index] = {"error": "analysis_failed", "detail": str(e)}
 
-        # 간격 분석
-        intervals = []
-        for i in range(1, len(keydown_events)):
-            interval = keydown_events[i].timestamp - keydown_events[i-1].timestamp
-            intervals.append(interval)
+        if not valid_indices:
+            return results
 
-        avg_interval = sum(intervals) / len(intervals) if intervals else 0
+        stats_matrix = np.array(stats_rows, dtype=np.float64)
+        try:
+            scores: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = (
+                _compute_pattern_scores(stats_matrix)
+            )
+        except Exception:
+            # 배치 계산 실패 시 행 단위로 다시 계산해 실패한 세션만 격리
+            logger.exception("Batch analysis error, retrying per session")
+            scores = None
+        analysis_timestamp = time.time()
 
-        # 일시정지 분석
-        pauses = [interval for interval in intervals if interval > 500]
-        pause_count = len(pauses)
+        for row, index in enumerate(valid_indices):
+            try:
+                if scores is not None:
+                    row_scores, row_pos = scores, row
+                else:
+                    row_scores, row_pos = _compute_pattern_scores(stats_matrix[row:row + 1]), 0
+                results[index] = self._build_analysis_result(
+                    batch[index][0],
+                    valid_stats[row],
+                    wpm=float(row_scores[0][row_pos]),
+                    avg_interval=float(row_scores[1][row_pos]),
+                    rhythm_consistency=float(row_scores[2][row_pos]),
+                    time_span_ms=float(stats_matrix[row, 3]),
+                    analysis_timestamp=analysis_timestamp
+                )
+            except Exception as e:
+                logger.exception("Analysis error (row %d)", index)
+                results[index] = {"error": "analysis_failed", "detail": str(e)}
 
-        # 리듬 일관성 계산
-        if len(intervals) >= 3:
-            mean_interval = sum(intervals) / len(intervals)
-            variance = sum((x - mean_interval) ** 2 for x in intervals) / len(intervals)
-            std_dev = variance ** 0.5
-            cv = std_dev / mean_interval if mean_interval > 0 else 1.0
-            rhythm_consistency = max(0.0, 1.0 - min(cv, 1.0))
-        else:
-            rhythm_consistency = 0.0
+        return results
 
+    def _build_analysis_result(
+        self,
+        keystrokes: List[Dict[str, Any]],
+        stats: IntervalStats,
+        wpm: float,
+        avg_interval: float,
+        rhythm_consistency: float,
+        time_span_ms: float,
+        analysis_timestamp: float
+    ) -> Dict[str, Any]:
+        """세션 하나의 분석 결과 딕셔너리 생성"""
+        pause_count = stats.pause_count
         return {
             "statistics": {
-                "total_keystrokes": len(events),
-                "keydown_count": len(keydown_events),
+                "total_keystrokes": len(keystrokes),
+                "keydown_count": stats.keydown_count,
                 "words_per_minute": round(wpm, 2),
                 "average_interval_ms": round(avg_interval, 2),
                 "pause_count": pause_count,
                 "rhythm_consistency": round(rhythm_consistency, 3),
-                "time_span_seconds": round(time_span_seconds, 2)
+                "time_span_seconds": round(time_span_ms / 1000.0, 2)
             },
             "patterns": {
                 "speed_score": min(wpm / 100.0, 1.0),  # 0-1 정규화
                 "rhythm_score": rhythm_consistency,
                 "pause_intensity": min(pause_count / 10.0, 1.0),  # 0-1 정규화
             },
-            "keystroke_data": keystroke_data,
-            "analysis_timestamp": time.time()
+            "keystroke_data": keystrokes,
+            "analysis_timestamp": analysis_timestamp
         }
 
     def _update_latency_metrics(self, latency_ms: float) -> None:
-        """레이턴시 메트릭 업데이트"""
-        if self.metrics.events_processed == 0:
-            self.metrics.avg_latency_ms = latency_ms
+        """레이턴시 메트릭 업데이트 (초기화 후 첫 샘플은 그대로, 이후 이동 평균)"""
+        metrics = self.metrics
+        if metrics.avg_latency_ms == 0.0:
+            metrics.avg_latency_ms = latency_ms
         else:
-            # 이동 평균
-            alpha = 0.1  # 평활화 상수
-            self.metrics.avg_latency_ms = (
-                (1 - alpha) * self.metrics.avg_latency_ms +
-                alpha * latency_ms
-            )
+            metrics.avg_latency_ms += LATENCY_EMA_ALPHA * (latency_ms - metrics.avg_latency_ms)
 
-        if latency_ms > self.metrics.max_latency_ms:
-            self.metrics.max_latency_ms = latency_ms
\ No newline at end of file
+        if latency_ms > metrics.max_latency_ms:
+            metrics.max_latency_ms = latency_ms
\ No newline at end of file
@@ -4,15 +4,18 @@
 고성능 실시간 통신을 위한 연결 풀, 메모리 관리, 백프레셔 제어
 """
 import asyncio
-import weakref
+import heapq
+import itertools
+import time
 import logging
-from typing import Dict, List, Optional, Set, Any, Callable, TypeVar
+from typing import Deque, Dict, List, Optional, Set, Any, Tuple, TypeVar
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 import psutil
 import gc
+import orjson
 
 from fastapi import WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
@@ -23,6 +26,21 @@ logger = get_logger(__name__)
 
 T = TypeVar('T')
 
+# naive datetime은 UTC로 간주하고 'Z' 접미사로 직렬화
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# 핫 패스의 연결 상태 비교용 (enum 멤버는 싱글턴이므로 `is` 비교)
+WS_CONNECTED = WebSocketState.CONNECTED
+
+_PING_SUFFIX = b'Z"}'
+
+# 전송 버퍼 워터마크 (전송 계층을 노출하는 서버에서만 적용)
+WRITE_BUFFER_HIGH_WATERMARK = 64 * 1024
+WRITE_BUFFER_LOW_WATERMARK = 16 * 1024
+
+# 시스템 메모리 정보 캐시 유지 시간 (초)
+MEMORY_STATS_TTL_SECONDS = 5.0
+
 
 class ConnectionState(str, Enum):
     """연결 상태"""
@@ -43,11 +61,11 @@ class MessagePriority(int, Enum):
     LOW = 4
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionMetrics:
     """연결 메트릭"""
-    connected_at: datetime = field(default_factory=datetime.utcnow)
-    last_activity: datetime = field(default_factory=datetime.utcnow)
+    connected_at: datetime = field(default_factory=datetime.utcnow)  # 보고용 벽시계 시각
+    last_activity: float = field(default_factory=time.monotonic)  # 단조 시계 (초)
     messages_sent: int = 0
     messages_received: int = 0
     bytes_sent: int = 0
@@ -58,7 +76,7 @@ class ConnectionMetrics:
 
     def update_activity(self):
         """활동 시간 업데이트"""
-        self.last_activity = datetime.utcnow()
+        self.last_activity = time.monotonic()
 
     def add_message_sent(self, size: int):
         """전송 메시지 통계 업데이트"""
@@ -78,17 +96,18 @@ class ConnectionMetrics:
 
     def get_idle_time(self) -> float:
         """유휴 시간 계산 (초)"""
-        return (datetime.utcnow() - self.last_activity).total_seconds()
+        return time.monotonic() - self.last_activity
 
 
-@dataclass
+@dataclass(slots=True)
 class QueuedMessage:
     """큐 메시지"""
     data: Any
     priority: MessagePriority = MessagePriority.NORMAL
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: float = field(default_factory=time.monotonic)  # 큐 삽입 시각 (단조 시계)
     retry_count: int = 0
     max_retries: int = 3
+    dead: bool = False  # 큐에서 제거됨 (힙에서는 꺼낼 때 건너뜀)
 
     def should_retry(self) -> bool:
         """재시도 가능 여부"""
@@ -108,122 +127,249 @@ class OptimizedConnection:
         connection_id: str,
         session_id: str,
         max_queue_size: int = 1000,
-        max_idle_time: int = 300  # 5분
+        max_idle_time: int = 300,  # 5분
+        send_timeout: float = 10.0
     ):
         self.websocket = websocket
         self.connection_id = connection_id
         self.session_id = session_id
-        self.state = ConnectionState.CONNECTING
+        self._state = ConnectionState.CONNECTING
+
+        # 핑 프레임 템플릿 (타임스탬프만 바뀌므로 매번 JSON 직렬화하지 않음)
+        self._ping_prefix = (
+            b'{"type":"ping","connection_id":' + orjson.dumps(connection_id) + b',"timestamp":"'
+        )
         self.metrics = ConnectionMetrics()
 
         # 메시지 큐 및 제한
         self.max_queue_size = max_queue_size
         self.max_idle_time = max_idle_time
-        self.message_queue: deque[QueuedMessage] = deque(maxlen=max_queue_size)
-        self.send_lock = asyncio.Lock()
+        # 우선순위 힙: (우선순위 값, 순번, 메시지) - 같은 우선순위는 순번(FIFO) 순서
+        self._heap: List[Tuple[int, int, QueuedMessage]] = []
+        self._seq = 0  # 새 메시지 순번 (증가)
+        self._retry_seq = 0  # 재삽입 순번 (감소, 같은 우선순위의 앞쪽에 배치)
+        # 우선순위별 대기 메시지 (힙과 같은 순서) - 낮은 우선순위 제거를 O(k)로 수행
+        self._buckets: Dict[int, Deque[QueuedMessage]] = {
+            priority.value: deque() for priority in MessagePriority
+        }
+        self._queued_count = 0  # 제거되지 않은 대기 메시지 수
+
+        # 단일 전송 태스크: 생산자는 큐에 넣고 깨우기만 하며, 소켓 쓰기는 이 태스크만 수행
+        # (락 불필요). 재시도 백오프/스로틀 대기가 필요해도 이 태스크 안에서만 기다린다
+        self._wake = asyncio.Event()
+        self._drain_task: Optional[asyncio.Task] = None
 
         # 백프레셔 제어
-        self.pending_sends = 0
-        self.max_pending_sends = 10
-        self.throttle_enabled = False
+        self.throttle_enabled = False  # 큐가 가득 차 메시지를 거부하는 중
+        self.send_timeout = send_timeout  # 응답 없는 클라이언트 판정 기준 (초)
+        self._close_task: Optional[asyncio.Task] = None
+        self._set_write_buffer_limits()
 
-        # 리소스 관리
-        self._cleanup_callbacks: List[Callable] = []
+        # 소속 풀 (활동 시 LRU 순서/통계 갱신, 종료 시 참조 제거)
+        self._pool: Optional['WebSocketConnectionPool'] = None
 
     async def send_message(self, data: Any, priority: MessagePriority = MessagePriority.NORMAL) -> bool:
-        """메시지 전송 (큐 기반)"""
-        if self.state not in [ConnectionState.CONNECTED, ConnectionState.ACTIVE]:
-            return False
+        """
+        메시지 전송 (큐 기반)
 
-        # 백프레셔 체크
-        if self.pending_sends >= self.max_pending_sends:
-            logger.warning(f"연결 {self.connection_id} 백프레셔 활성화")
-            self.throttle_enabled = True
+        메시지를 우선순위 큐에 넣고 전송 태스크를 깨운다. 실제 전송은 전송 태스크가
+        순서대로 수행하므로 반환값은 큐에 들어갔는지 여부이다.
+        """
+        if self.state not in [ConnectionState.CONNECTED, ConnectionState.ACTIVE]:
             return False
 
-        # 큐 크기 체크
-        if len(self.message_queue) >= self.max_queue_size:
+        # 백프레셔 체크 (전송 태스크가 하나뿐이므로 큐 적체가 곧 전송 지연 신호)
+        if self._queued_count >= self.max_queue_size:
             # 낮은 우선순위 메시지 제거
             self._evict_low_priority_messages()
+            if self._queued_count >= self.max_queue_size:
+                if not self.throttle_enabled:
+                    logger.warning(f"연결 {self.connection_id} 백프레셔 활성화 (메시지 큐 가득 참)")
+                    self.throttle_enabled = True
+                return False
+
+        self._push_message(QueuedMessage(data, priority))
+
+        # 전송 태스크 깨우기 (첫 전송 시 시작)
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain_loop())
+        self._wake.set()
+        return True
+
+    async def send_raw(self, payload: bytes, priority: MessagePriority = MessagePriority.NORMAL) -> bool:
+        """이미 직렬화된 JSON 바이트 전송 (브로드캐스트에서 한 번 직렬화한 페이로드 공유)"""
+        return await self.send_message(payload, priority)
+
+    async def _drain_loop(self) -> None:
+        """전송 태스크: 깨어날 때마다 큐가 빌 때까지 순서대로 전송"""
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+
+            while self._queued_count:
+                if not await self._send_next():
+                    break  # 전송 실패 - 다음 send_message 호출까지 대기
+
+    async def _send_next(self) -> bool:
+        """가장 높은 우선순위 메시지 하나 전송"""
+        message = self._pop_message()
+        try:
+            serialized_data = self._serialize_message(message.data)
+        except Exception as e:
+            logger.error(f"메시지 직렬화 실패 {self.connection_id}: {e}")
+            self.metrics.add_error()
+            return True  # 재시도해도 같은 결과이므로 폐기하고 다음 메시지 진행
+
+        websocket = self.websocket
+        if websocket.client_state is not WS_CONNECTED:
+            self._requeue_message(message)
+            self.state = ConnectionState.ERROR
+            return False
 
-        message = QueuedMessage(data, priority)
-        self.message_queue.append(message)
+        try:
+            # 클라이언트가 텍스트 프레임을 JSON.parse 하므로 텍스트로 전송
+            # (asyncio.timeout은 wait_for와 달리 전송마다 태스크를 만들지 않음)
+            async with asyncio.timeout(self.send_timeout):
+                await websocket.send_text(serialized_data.decode('utf-8'))
 
-        # 즉시 전송 시도
-        return await self._process_queue()
+            self.metrics.add_message_sent(len(serialized_data))
+            self.state = ConnectionState.ACTIVE
+            self._record_activity(sent=True)
+            return True
 
-    async def _process_queue(self) -> bool:
-        """메시지 큐 처리"""
-        if not self.message_queue or self.pending_sends >= self.max_pending_sends:
+        except TimeoutError:
+            # 전송 버퍼가 비워지지 않는 클라이언트 - 재시도하지 않고 연결 종료
+            logger.warning(f"연결 {self.connection_id} 전송 시간 초과 ({self.send_timeout}초), 연결 종료")
+            self.metrics.add_error()
+            self.state = ConnectionState.ERROR
+            if self._close_task is None:
+                self._close_task = asyncio.create_task(self.close())
             return False
 
-        async with self.send_lock:
-            if self.websocket.client_state != WebSocketState.CONNECTED:
-                self.state = ConnectionState.ERROR
-                return False
+        except Exception as e:
+            logger.error(f"메시지 전송 실패 {self.connection_id}: {e}")
+            self.metrics.add_error()
 
-            message = self.message_queue.popleft()
-            try:
-                self.pending_sends += 1
-                serialized_data = self._serialize_message(message.data)
+            # 재시도 로직 (큐에 되돌리기만 하고 대기하지 않음)
+            if message.should_retry():
+                message.increment_retry()
+                self._requeue_message(message)
 
-                await self.websocket.send_text(serialized_data)
+            self.state = ConnectionState.ERROR
+            return False
 
-                self.metrics.add_message_sent(len(serialized_data))
-                self.state = ConnectionState.ACTIVE
-                return True
+        finally:
+            if self.throttle_enabled and self._queued_count < self.max_queue_size // 2:
+                self.throttle_enabled = False
 
-            except Exception as e:
-                logger.error(f"메시지 전송 실패 {self.connection_id}: {e}")
-                self.metrics.add_error()
+    def _set_write_buffer_limits(self) -> None:
+        """전송 계층 쓰기 버퍼 워터마크 설정 (노출된 경우에만)"""
+        transport = getattr(self.websocket, 'transport', None)
+        set_limits = getattr(transport, 'set_write_buffer_limits', None)
+        if set_limits is None:
+            return
+        try:
+            set_limits(high=WRITE_BUFFER_HIGH_WATERMARK, low=WRITE_BUFFER_LOW_WATERMARK)
+        except Exception as e:
+            logger.debug(f"쓰기 버퍼 제한 설정 실패 {self.connection_id}: {e}")
 
-                # 재시도 로직
-                if message.should_retry():
-                    message.increment_retry()
-                    self.message_queue.appendleft(message)
+    @property
+    def state(self) -> ConnectionState:
+        """연결 상태"""
+        return self._state
 
-                self.state = ConnectionState.ERROR
-                return False
+    @state.setter
+    def state(self, new_state: ConnectionState) -> None:
+        self._set_state(new_state)
 
-            finally:
-                self.pending_sends = max(0, self.pending_sends - 1)
-                if self.pending_sends < self.max_pending_sends // 2:
-                    self.throttle_enabled = False
+    def _set_state(self, new_state: ConnectionState) -> None:
+        """상태 변경 (풀의 상태별 연결 수를 함께 갱신하는 유일한 경로)"""
+        old_state = self._state
+        if old_state is new_state:
+            return
+        self._state = new_state
+        pool = self._pool
+        if pool is not None:
+            pool._on_state_change(old_state, new_state)
+            if new_state is ConnectionState.CLOSED or new_state is ConnectionState.ERROR:
+                pool._mark_for_removal(self.connection_id)
+
+    @property
+    def queue_size(self) -> int:
+        """대기 중인 메시지 수"""
+        return self._queued_count
+
+    def _adjust_queued(self, delta: int) -> None:
+        """대기 메시지 수 변경 (풀 전체 합계도 함께 갱신)"""
+        self._queued_count += delta
+        if self._pool is not None:
+            self._pool._queued_total += delta
+
+    def _push_message(self, message: QueuedMessage) -> None:
+        """메시지를 우선순위 힙에 추가 (O(log N))"""
+        priority = message.priority.value
+        heapq.heappush(self._heap, (priority, self._seq, message))
+        self._seq += 1
+        self._buckets[priority].append(message)
+        self._adjust_queued(1)
+
+    def _requeue_message(self, message: QueuedMessage) -> None:
+        """꺼낸 메시지를 같은 우선순위의 맨 앞으로 되돌림 (재시도/전송 불가)"""
+        priority = message.priority.value
+        self._retry_seq -= 1
+        heapq.heappush(self._heap, (priority, self._retry_seq, message))
+        self._buckets[priority].appendleft(message)
+        self._adjust_queued(1)
+
+    def _pop_message(self) -> QueuedMessage:
+        """가장 높은 우선순위 메시지 꺼내기 (제거된 항목은 건너뜀)"""
+        while True:
+            priority, _, message = heapq.heappop(self._heap)
+            if message.dead:
+                continue
+            # 같은 우선순위 안에서는 힙과 버킷 순서가 같으므로 버킷의 맨 앞 항목
+            self._buckets[priority].popleft()
+            self._adjust_queued(-1)
+            return message
 
     def _evict_low_priority_messages(self):
-        """낮은 우선순위 메시지 제거"""
-        # 우선순위가 낮은 메시지부터 제거
-        eviction_count = min(10, len(self.message_queue) // 4)
-        temp_queue = deque()
-
-        for _ in range(len(self.message_queue)):
-            if eviction_count > 0:
-                msg = self.message_queue.popleft()
-                if msg.priority >= MessagePriority.NORMAL:
-                    eviction_count -= 1
-                    continue  # 제거
-                else:
-                    temp_queue.append(msg)
-            else:
-                temp_queue.append(self.message_queue.popleft())
-
-        self.message_queue = temp_queue
-        logger.debug(f"연결 {self.connection_id} 메시지 {eviction_count}개 제거")
-
-    def _serialize_message(self, data: Any) -> str:
-        """메시지 직렬화"""
-        import json
-        return json.dumps(data, ensure_ascii=False)
+        """낮은 우선순위 메시지 제거 (LOW부터, 같은 우선순위에서는 오래된 순)"""
+        eviction_count = max(1, min(10, self._queued_count // 4))
+        evicted = 0
+
+        for priority in (MessagePriority.LOW, MessagePriority.NORMAL):
+            bucket = self._buckets[priority.value]
+            while bucket and evicted < eviction_count:
+                bucket.popleft().dead = True
+                evicted += 1
+        self._adjust_queued(-evicted)
+
+        # 힙에 남은 제거 항목이 대기 메시지보다 많아지면 압축 (분할 상환 O(1))
+        if len(self._heap) > 2 * self._queued_count:
+            self._heap = [entry for entry in self._heap if not entry[2].dead]
+            heapq.heapify(self._heap)
+
+        logger.debug(f"연결 {self.connection_id} 메시지 {evicted}개 제거")
+
+    def _serialize_message(self, data: Any) -> bytes:
+        """메시지 직렬화 (orjson, UTF-8 바이트 - 이미 직렬화된 페이로드는 그대로 사용)"""
+        if isinstance(data, bytes):
+            return data
+        if isinstance(data, (bytearray, memoryview)):
+            return bytes(data)
+        return orjson.dumps(data, option=ORJSON_OPTIONS)
 
     async def receive_message(self) -> Optional[Any]:
         """메시지 수신"""
         try:
-            if self.websocket.client_state != WebSocketState.CONNECTED:
+            websocket = self.websocket
+            if websocket.client_state is not WS_CONNECTED:
                 return None
 
-            raw_data = await self.websocket.receive_text()
+            raw_data = await websocket.receive_text()
             self.metrics.add_message_received(len(raw_data))
             self.state = ConnectionState.ACTIVE
+            self._record_activity(sent=False)
 
             return self._deserialize_message(raw_data)
 
@@ -238,48 +384,60 @@ class OptimizedConnection:
 
     def _deserialize_message(self, data: str) -> Any:
         """메시지 역직렬화"""
-        import json
-        return json.loads(data)
+        return orjson.loads(data)
 
     async def ping(self) -> bool:
         """핑 전송"""
-        ping_data = {
-            "type": "ping",
-            "timestamp": datetime.utcnow().isoformat(),
-            "connection_id": self.connection_id
-        }
-        success = await self.send_message(ping_data, MessagePriority.HIGH)
+        # ORJSON_OPTIONS와 같은 UTC 'Z' 표기
+        payload = self._ping_prefix + datetime.utcnow().isoformat().encode() + _PING_SUFFIX
+        success = await self.send_raw(payload, MessagePriority.HIGH)
         if success:
             self.metrics.ping_count += 1
         return success
 
+    def _record_activity(self, sent: bool) -> None:
+        """풀의 LRU 순서에서 최근 활동 연결로 표시하고 메시지 수 집계"""
+        pool = self._pool
+        if pool is None:
+            return
+        pool.touch(self.connection_id)
+        if sent:
+            pool.total_messages_sent += 1
+        else:
+            pool.total_messages_received += 1
+
     def is_idle(self) -> bool:
         """유휴 상태 확인"""
         return self.metrics.get_idle_time() > self.max_idle_time
 
-    def add_cleanup_callback(self, callback: Callable):
-        """정리 콜백 추가"""
-        self._cleanup_callbacks.append(callback)
-
     async def close(self):
         """연결 종료 및 정리"""
         self.state = ConnectionState.CLOSING
 
+        # 전송 태스크 종료
+        drain_task = self._drain_task
+        if drain_task is not None and drain_task is not asyncio.current_task():
+            drain_task.cancel()
+            try:
+                await drain_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"전송 태스크 오류 {self.connection_id}: {e}")
+        self._drain_task = None
+
         try:
-            if self.websocket.client_state == WebSocketState.CONNECTED:
-                await self.websocket.close()
+            websocket = self.websocket
+            if websocket.client_state is WS_CONNECTED:
+                async with asyncio.timeout(self.send_timeout):
+                    await websocket.close()
         except Exception as e:
             logger.error(f"연결 종료 실패 {self.connection_id}: {e}")
 
-        # 정리 콜백 실행
-        for callback in self._cleanup_callbacks:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback()
-                else:
-                    callback()
-            except Exception as e:
-                logger.error(f"정리 콜백 실패: {e}")
+        # 풀에서 연결 참조 제거
+        pool = self._pool
+        if pool is not None:
+            pool._remove_connection_references(self.connection_id, self.session_id)
 
         self.state = ConnectionState.CLOSED
 
@@ -298,23 +456,31 @@ class WebSocketConnectionPool:
         self.memory_threshold = memory_threshold
 
         # 연결 저장소
-        self.connections: Dict[str, OptimizedConnection] = {}
+        # 최근 활동 순서 유지 (앞쪽이 가장 오래 활동하지 않은 연결 - LRU)
+        self.connections: OrderedDict[str, OptimizedConnection] = OrderedDict()
         self.session_connections: Dict[str, Set[str]] = defaultdict(set)
+        # 세션별 연결 객체 목록 캐시 (연결 추가/제거 시 무효화)
+        self._session_connlist_cache: Dict[str, List[OptimizedConnection]] = {}
 
-        # 성능 모니터링
+        # 성능 모니터링 (통계 조회 시 전체 순회를 피하기 위해 증분 집계)
         self.total_connections = 0
         self.peak_connections = 0
         self.total_messages_sent = 0
         self.total_messages_received = 0
+        self._state_counts: Dict[ConnectionState, int] = defaultdict(int)
+        self._queued_total = 0  # 등록된 연결들의 대기 메시지 합계
+
+        # 시스템 메모리 정보 캐시 (조회 시각, psutil.virtual_memory() 결과)
+        self._mem_cache: Tuple[float, Any] = (0.0, None)
+
+        # 종료/오류 상태로 바뀐 연결 ID (정리 워커가 전체 순회 없이 처리)
+        self._pending_removal: Deque[str] = deque()
 
         # 백그라운드 작업
         self._cleanup_task: Optional[asyncio.Task] = None
         self._monitoring_task: Optional[asyncio.Task] = None
         self._shutdown_event = asyncio.Event()
 
-        # 약한 참조 사용 (메모리 누수 방지)
-        self._weak_refs: Set[weakref.ref] = set()
-
     async def start(self):
         """풀 시작"""
         logger.info("WebSocket 연결 풀 시작")
@@ -342,6 +508,10 @@ class WebSocketConnectionPool:
 
         self.connections.clear()
         self.session_connections.clear()
+        self._session_connlist_cache.clear()
+        self._pending_removal.clear()
+        self._state_counts.clear()
+        self._queued_total = 0
 
     async def add_connection(
         self,
@@ -355,18 +525,13 @@ class WebSocketConnectionPool:
             await self._enforce_connection_limit()
 
         connection = OptimizedConnection(websocket, connection_id, session_id)
-
-        # 정리 콜백 등록
-        cleanup_callback = lambda: self._remove_connection_references(connection_id, session_id)
-        connection.add_cleanup_callback(cleanup_callback)
+        connection._pool = self
+        self._state_counts[connection.state] += 1
 
         # 연결 등록
         self.connections[connection_id] = connection
         self.session_connections[session_id].add(connection_id)
-
-        # 약한 참조 등록
-        weak_ref = weakref.ref(connection, self._weak_ref_callback)
-        self._weak_refs.add(weak_ref)
+        self._session_connlist_cache.pop(session_id, None)
 
         # 통계 업데이트
         self.total_connections += 1
@@ -377,18 +542,36 @@ class WebSocketConnectionPool:
 
         return connection
 
+    def touch(self, connection_id: str) -> None:
+        """연결을 최근 활동 위치로 이동 (O(1))"""
+        try:
+            self.connections.move_to_end(connection_id)
+        except KeyError:
+            pass  # 이미 제거된 연결
+
+    def _on_state_change(self, old_state: ConnectionState, new_state: ConnectionState) -> None:
+        """등록된 연결의 상태 변경 반영"""
+        self._state_counts[old_state] -= 1
+        self._state_counts[new_state] += 1
+
+    def _mark_for_removal(self, connection_id: str) -> None:
+        """정리 대상 연결 등록 (다음 정리 주기에 처리)"""
+        self._pending_removal.append(connection_id)
+
     def _remove_connection_references(self, connection_id: str, session_id: str):
         """연결 참조 제거"""
-        self.connections.pop(connection_id, None)
+        connection = self.connections.pop(connection_id, None)
+        if connection is not None and connection._pool is self:
+            # 집계에서 빼고 풀과 분리 (이후 상태 변경은 집계하지 않음)
+            self._state_counts[connection.state] -= 1
+            self._queued_total -= connection.queue_size
+            connection._pool = None
+        self._session_connlist_cache.pop(session_id, None)
         if session_id in self.session_connections:
             self.session_connections[session_id].discard(connection_id)
             if not self.session_connections[session_id]:
                 del self.session_connections[session_id]
 
-    def _weak_ref_callback(self, ref: weakref.ref):
-        """약한 참조 콜백 (가비지 컬렉션 시 호출)"""
-        self._weak_refs.discard(ref)
-
     async def remove_connection(self, connection_id: str) -> bool:
         """연결 제거"""
         connection = self.connections.get(connection_id)
@@ -404,11 +587,24 @@ class WebSocketConnectionPool:
 
     def get_session_connections(self, session_id: str) -> List[OptimizedConnection]:
         """세션별 연결 목록"""
-        connection_ids = self.session_connections.get(session_id, set())
-        return [
-            self.connections[cid] for cid in connection_ids
-            if cid in self.connections
-        ]
+        return list(self._cached_session_connections(session_id))
+
+    def _cached_session_connections(self, session_id: str) -> List[OptimizedConnection]:
+        """
+        세션별 연결 목록 (캐시)
+
+        캐시는 연결 추가/제거 시 무효화되므로 연결 저장소와 항상 일치한다.
+        반환된 목록은 내부 캐시이므로 수정하지 않는다.
+        """
+        cached = self._session_connlist_cache.get(session_id)
+        if cached is None:
+            connection_ids = self.session_connections.get(session_id)
+            if not connection_ids:
+                return []  # 없는 세션은 캐시하지 않음
+            connections = self.connections
+            cached = [connections[cid] for cid in connection_ids]
+            self._session_connlist_cache[session_id] = cached
+        return cached
 
     async def broadcast_to_session(
         self,
@@ -417,20 +613,31 @@ class WebSocketConnectionPool:
         priority: MessagePriority = MessagePriority.NORMAL
     ) -> int:
         """세션에 속한 모든 연결에 브로드캐스트"""
-        connections = self.get_session_connections(session_id)
+        connections = self._cached_session_connections(session_id)
         if not connections:
             return 0
 
-        tasks = []
-        for connection in connections:
-            if connection.state in [ConnectionState.CONNECTED, ConnectionState.ACTIVE]:
-                tasks.append(connection.send_message(data, priority))
+        # 같은 페이로드를 연결마다 다시 직렬화하지 않도록 한 번만 직렬화
+        try:
+            payload = orjson.dumps(data, option=ORJSON_OPTIONS)
+        except Exception as e:
+            logger.error(f"브로드캐스트 메시지 직렬화 실패 (세션: {session_id}): {e}")
+            return 0
 
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            return sum(1 for result in results if result is True)
+        # send_raw는 큐에 넣고 전송 태스크를 깨우기만 하므로(네트워크 대기 없음)
+        # 연결마다 태스크를 만들지 않고 순서대로 호출한다. 느린 클라이언트는
+        # 자신의 전송 태스크만 지연시키고 브로드캐스트를 붙잡지 않는다.
+        sent_count = 0
+        for connection in connections:
+            if connection.state not in (ConnectionState.CONNECTED, ConnectionState.ACTIVE):
+                continue
+            try:
+                if await connection.send_raw(payload, priority):
+                    sent_count += 1
+            except Exception as e:
+                logger.error(f"브로드캐스트 전송 실패 {connection.connection_id}: {e}")
 
-        return 0
+        return sent_count
 
     async def _cleanup_worker(self):
         """정리 작업 워커"""
@@ -457,28 +664,35 @@ class WebSocketConnectionPool:
 
         if idle_connections:
             logger.info(f"유휴 연결 {len(idle_connections)}개 정리 중")
-            for connection in idle_connections:
-                await connection.close()
+            # 종료 핸드셰이크가 서로 겹치도록 동시에 종료
+            await asyncio.gather(
+                *(connection.close() for connection in idle_connections),
+                return_exceptions=True
+            )
 
     async def _cleanup_closed_connections(self):
-        """종료된 연결 정리"""
-        closed_connection_ids = [
-            cid for cid, conn in self.connections.items()
-            if conn.state == ConnectionState.CLOSED or
-               conn.websocket.client_state != WebSocketState.CONNECTED
-        ]
+        """종료된 연결 정리 (정리 대상으로 등록된 연결만 확인, O(k))"""
+        pending_removal = self._pending_removal
+        removed_count = 0
 
-        for connection_id in closed_connection_ids:
+        while pending_removal:
+            connection_id = pending_removal.popleft()
             connection = self.connections.get(connection_id)
-            if connection:
+            if connection is None:
+                continue  # 이미 제거됨 (중복 등록 포함)
+
+            # 등록 이후 복구된 연결(오류 후 재전송 성공 등)은 유지
+            if (connection.state is ConnectionState.CLOSED or
+                    connection.websocket.client_state is not WS_CONNECTED):
                 self._remove_connection_references(connection_id, connection.session_id)
+                removed_count += 1
 
-        if closed_connection_ids:
-            logger.debug(f"종료된 연결 {len(closed_connection_ids)}개 정리")
+        if removed_count:
+            logger.debug(f"종료된 연결 {removed_count}개 정리")
 
     async def _check_memory_usage(self):
         """메모리 사용량 확인"""
-        memory_percent = psutil.virtual_memory().percent / 100.0
+        memory_percent = self._vmem().percent / 100.0
 
         if memory_percent > self.memory_threshold:
             logger.warning(f"메모리 사용률 높음: {memory_percent:.1%}")
@@ -490,31 +704,37 @@ class WebSocketConnectionPool:
             if memory_percent > 0.9:  # 90% 이상
                 await self._emergency_cleanup()
 
+    def _vmem(self) -> Any:
+        """시스템 메모리 정보 (MEMORY_STATS_TTL_SECONDS 동안 캐시)"""
+        fetched_at, memory_info = self._mem_cache
+        now = time.monotonic()
+        if memory_info is None or now - fetched_at > MEMORY_STATS_TTL_SECONDS:
+            memory_info = psutil.virtual_memory()
+            self._mem_cache = (now, memory_info)
+        return memory_info
+
     async def _emergency_cleanup(self):
         """응급 메모리 정리"""
-        # 오래된 연결부터 정리 (25% 정도)
+        # 오래 활동하지 않은 연결부터 정리 (25% 정도, LRU 앞쪽부터 O(k))
         cleanup_count = max(1, len(self.connections) // 4)
 
-        sorted_connections = sorted(
-            self.connections.values(),
-            key=lambda conn: conn.metrics.last_activity
-        )
+        # close()가 연결 저장소를 수정하므로 먼저 목록으로 복사
+        oldest_connections = list(itertools.islice(self.connections.values(), cleanup_count))
 
         logger.warning(f"응급 메모리 정리: {cleanup_count}개 연결 종료")
 
-        for connection in sorted_connections[:cleanup_count]:
-            await connection.close()
+        await asyncio.gather(
+            *(connection.close() for connection in oldest_connections),
+            return_exceptions=True
+        )
 
     async def _enforce_connection_limit(self):
         """연결 수 제한 강제"""
         if len(self.connections) < self.max_connections:
             return
 
-        # 가장 오래된 연결 종료
-        oldest_connection = min(
-            self.connections.values(),
-            key=lambda conn: conn.metrics.connected_at
-        )
+        # 가장 오래 활동하지 않은 연결 종료 (LRU 맨 앞, O(1))
+        oldest_connection = next(iter(self.connections.values()))
 
         logger.info(f"연결 제한 초과, 가장 오래된 연결 종료: {oldest_connection.connection_id}")
         await oldest_connection.close()
@@ -542,38 +762,38 @@ class WebSocketConnectionPool:
                 await asyncio.sleep(10)
 
     def get_pool_statistics(self) -> Dict[str, Any]:
-        """풀 통계 조회"""
-        active_connections = sum(
-            1 for conn in self.connections.values()
-            if conn.state == ConnectionState.ACTIVE
-        )
-
-        idle_connections = sum(
-            1 for conn in self.connections.values()
-            if conn.is_idle()
-        )
-
-        total_messages = sum(
-            conn.metrics.messages_sent + conn.metrics.messages_received
-            for conn in self.connections.values()
-        )
-
-        memory_info = psutil.virtual_memory()
+        """풀 통계 조회 (증분 집계값 사용)"""
+        memory_info = self._vmem()
+        connection_count = len(self.connections)
 
         return {
-            'total_connections': len(self.connections),
-            'active_connections': active_connections,
-            'idle_connections': idle_connections,
+            'total_connections': connection_count,
+            'active_connections': self._state_counts[ConnectionState.ACTIVE],
+            'idle_connections': self._count_idle_connections(),
             'peak_connections': self.peak_connections,
-            'total_messages_processed': total_messages,
+            'total_messages_processed': self.total_messages_sent + self.total_messages_received,
             'memory_usage_percent': memory_info.percent,
             'memory_available_mb': memory_info.available // 1024 // 1024,
             'sessions_count': len(self.session_connections),
-            'average_queue_size': sum(
-                len(conn.message_queue) for conn in self.connections.values()
-            ) / len(self.connections) if self.connections else 0
+            'average_queue_size': (
+                self._queued_total / connection_count if connection_count else 0
+            )
         }
 
+    def _count_idle_connections(self) -> int:
+        """
+        유휴 연결 수
+
+        연결 저장소는 마지막 활동 순서(LRU)로 정렬되어 있으므로 유휴 연결은
+        항상 앞쪽에 모여 있다. 앞에서부터 첫 활성 연결까지만 센다 (O(유휴 연결 수)).
+        """
+        idle_count = 0
+        for connection in self.connections.values():
+            if not connection.is_idle():
+                break
+            idle_count += 1
+        return idle_count
+
 
 # 글로벌 연결 풀 인스턴스
 _global_connection_pool: Optional[WebSocketConnectionPool] = None
@@ -3,21 +3,97 @@ PatternAnalysisService - 타이핑 패턴 분석 서비스
 
 이 서비스는 키스트로크 데이터를 분석하여 타이핑 패턴과 감정 프로필을 생성합니다.
 """
-from typing import List, Dict, Any, Optional, Tuple
-from sqlalchemy import select
+import asyncio
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import List, Dict, Any, AsyncIterator, ClassVar, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import IntegrityError
 
 from src.models.typing_pattern import TypingPattern
 from src.models.emotion_profile import EmotionProfile
 from src.models.user_session import UserSession
+from src.config import settings
 from src.database.connection import get_async_session
 from src.lib.pattern_analyzer.analyzer import PatternAnalyzer
 from src.lib.emotion_mapper.mapper import EmotionMapper
 
 
+# 감정 벡터 차원 (요약 평균 계산 순서)
+EMOTION_KEYS = ('energy', 'valence', 'tension', 'focus')
+
+# 세션 요약 시 감정 프로필 스트리밍 배치 크기
+SUMMARY_STREAM_BATCH_SIZE = 500
+
+# 프로세스 풀로 병렬 분석할 최소 배치 수 (이보다 적으면 프로세스 간 전송 비용이 더 큼)
+PARALLEL_ANALYSIS_MIN_BATCHES = 4
+
+# 프로세스 풀 워커의 분석기 (워커 프로세스마다 한 번 생성)
+_worker_pattern_analyzer: Optional[PatternAnalyzer] = None
+
+
+def _validate_and_analyze(
+    pattern_analyzer: PatternAnalyzer,
+    keystrokes: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    키스트로크 검증 및 분석 (DB 접근 없음)
+
+    Raises:
+        ValueError: 유효하지 않은 키스트로크 데이터
+    """
+    is_valid, error_message = pattern_analyzer.validate_keystrokes(keystrokes)
+    if not is_valid:
+        raise ValueError(f"Invalid keystrokes data: {error_message}")
+
+    analysis_result: Dict[str, Any] = pattern_analyzer.analyze_typing_pattern(keystrokes)
+    return analysis_result
+
+
+def _cpu_pool_size() -> int:
+    """
+    워커 프로세스당 배치 분석 프로세스 수
+
+    uvicorn 워커마다 풀이 하나씩 생기므로, 설정값이 없으면 CPU 코어를 워커 수로 나눠
+    전체 프로세스 수가 코어 수를 넘지 않게 한다.
+    """
+    if settings.ANALYSIS_PROCESS_WORKERS > 0:
+        return settings.ANALYSIS_PROCESS_WORKERS
+    return max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY))
+
+
+def _analyze_in_worker(keystrokes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """프로세스 풀 워커에서 실행되는 키스트로크 분석"""
+    global _worker_pattern_analyzer
+    if _worker_pattern_analyzer is None:
+        _worker_pattern_analyzer = PatternAnalyzer()
+    return _validate_and_analyze(_worker_pattern_analyzer, keystrokes)
+
+
 class PatternAnalysisService:
-    """타이핑 패턴 분석 및 감정 프로필 생성 서비스"""
+    """
+    타이핑 패턴 분석 및 감정 프로필 생성 서비스
+
+    공개 메서드는 각각 세션을 한 번만 얻어(_with_session) 내부 헬퍼에 전달하므로
+    호출 하나가 연결 하나, 트랜잭션 하나로 처리된다.
+    """
+
+    # 분석기/매퍼는 상태가 없으므로 모든 인스턴스가 공유 (요청마다 새로 만들지 않음)
+    _shared_pattern_analyzer: ClassVar[Optional[PatternAnalyzer]] = None
+    _shared_emotion_mapper: ClassVar[Optional[EmotionMapper]] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    # 대량 배치 분석용 프로세스 풀 (첫 사용 시 생성)
+    _cpu_pool: ClassVar[Optional[ProcessPoolExecutor]] = None
 
     def __init__(self, db_session: Optional[AsyncSession] = None):
         """
@@ -27,8 +103,48 @@ class PatternAnalysisService:
             db_session: 데이터베이스 세션 (의존성 주입용)
         """
         self.db_session = db_session
-        self.pattern_analyzer = PatternAnalyzer()
-        self.emotion_mapper = EmotionMapper()
+        self.pattern_analyzer, self.emotion_mapper = self._get_shared_components()
+
+        # 존재가 확인된 세션 ID (같은 인스턴스에서 반복 조회 방지)
+        self._validated_sessions: Set[str] = set()
+
+    @classmethod
+    def _get_shared_components(cls) -> Tuple[PatternAnalyzer, EmotionMapper]:
+        """공유 분석기/매퍼 반환 (최초 호출 시 한 번만 생성)"""
+        if cls._shared_pattern_analyzer is None or cls._shared_emotion_mapper is None:
+            with cls._shared_lock:
+                if cls._shared_pattern_analyzer is None:
+                    cls._shared_pattern_analyzer = PatternAnalyzer()
+                if cls._shared_emotion_mapper is None:
+                    cls._shared_emotion_mapper = EmotionMapper()
+        return cls._shared_pattern_analyzer, cls._shared_emotion_mapper
+
+    @classmethod
+    def _get_cpu_pool(cls) -> ProcessPoolExecutor:
+        """배치 분석용 프로세스 풀 반환 (최초 호출 시 생성)"""
+        if cls._cpu_pool is None:
+            with cls._shared_lock:
+                if cls._cpu_pool is None:
+                    cls._cpu_pool = ProcessPoolExecutor(max_workers=_cpu_pool_size())
+        return cls._cpu_pool
+
+    @classmethod
+    def shutdown_cpu_pool(cls) -> None:
+        """배치 분석용 프로세스 풀 종료 (애플리케이션 종료 시 호출)"""
+        with cls._shared_lock:
+            if cls._cpu_pool is not None:
+                cls._cpu_pool.shutdown(wait=False, cancel_futures=True)
+                cls._cpu_pool = None
+
+    @asynccontextmanager
+    async def _with_session(self) -> AsyncIterator[AsyncSession]:
+        """주입된 세션이 있으면 그대로 사용하고, 없으면 새 세션을 연다"""
+        if self.db_session:
+            yield self.db_session
+            return
+
+        async with get_async_session() as session:
+            yield session
 
     async def analyze_typing_pattern(
         self,
@@ -51,36 +167,45 @@ class PatternAnalysisService:
             ValueError: 유효하지 않은 키스트로크 데이터
             RuntimeError: 세션을 찾을 수 없음
         """
-        # 1. 세션 존재 확인
-        if not await self._validate_session_exists(session_id):
-            raise RuntimeError(f"Session not found: {session_id}")
+        async with self._with_session() as session:
+            # 1. 세션 존재 확인
+            if not await self._validate_session_exists(session, session_id):
+                raise RuntimeError(f"Session not found: {session_id}")
+
+            # 2-4. 검증, 분석, 텍스트 내용 추출
+            analysis_result, text_content = self._run_analysis(keystrokes, text_content)
+
+            # 5-6. 타이핑 패턴과 감정 프로필을 한 트랜잭션으로 저장
+            typing_pattern, emotion_profile = self._build_pattern_with_profile(
+                session_id, keystrokes, text_content, analysis_result
+            )
+            session.add_all([typing_pattern, emotion_profile])
+            await session.commit()
+
+        return typing_pattern, emotion_profile
+
+    def _run_analysis(
+        self,
+        keystrokes: List[Dict[str, Any]],
+        text_content: Optional[str]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        키스트로크 검증 및 분석 (DB 접근 없음)
 
-        # 2. 키스트로크 데이터 유효성 검증
-        is_valid, error_message = self.pattern_analyzer.validate_keystrokes(keystrokes)
-        if not is_valid:
-            raise ValueError(f"Invalid keystrokes data: {error_message}")
+        Returns:
+            (분석 결과, 텍스트 내용) 튜플
 
-        # 3. 타이핑 패턴 분석
-        analysis_result = self.pattern_analyzer.analyze_typing_pattern(keystrokes)
+        Raises:
+            ValueError: 유효하지 않은 키스트로크 데이터
+        """
+        # 2-3. 키스트로크 데이터 유효성 검증 및 타이핑 패턴 분석
+        analysis_result = _validate_and_analyze(self.pattern_analyzer, keystrokes)
 
         # 4. 텍스트 내용 추출 (제공되지 않은 경우)
         if not text_content:
             text_content = analysis_result.get('text_content', '')
 
-        # 5. TypingPattern 모델 생성 및 저장
-        typing_pattern = await self._create_typing_pattern(
-            session_id=session_id,
-            keystrokes=keystrokes,
-            text_content=text_content
-        )
-
-        # 6. 감정 프로필 생성
-        emotion_profile = await self._create_emotion_profile(
-            typing_pattern_id=typing_pattern.id,
-            analysis_result=analysis_result
-        )
-
-        return typing_pattern, emotion_profile
+        return analysis_result, text_content
 
     async def get_pattern_by_id(self, pattern_id: str) -> Optional[TypingPattern]:
         """
@@ -92,19 +217,8 @@ class PatternAnalysisService:
         Returns:
             TypingPattern 객체 또는 None
         """
-        if self.db_session:
-            session = self.db_session
-        else:
-            async with get_async_session() as session:
-                result = await session.execute(
-                    select(TypingPattern).where(TypingPattern.id == pattern_id)
-                )
-                return result.scalar_one_or_none()
-
-        result = await session.execute(
-            select(TypingPattern).where(TypingPattern.id == pattern_id)
-        )
-        return result.scalar_one_or_none()
+        async with self._with_session() as session:
+            return await self._fetch_pattern(session, pattern_id)
 
     async def get_patterns_by_session(
         self,
@@ -123,27 +237,37 @@ class PatternAnalysisService:
         Returns:
             타이핑 패턴 리스트
         """
-        if self.db_session:
-            session = self.db_session
-        else:
-            async with get_async_session() as session:
-                result = await session.execute(
-                    select(TypingPattern)
-                    .where(TypingPattern.session_id == session_id)
-                    .order_by(TypingPattern.created_at.desc())
-                    .limit(limit)
-                    .offset(offset)
-                )
-                return result.scalars().all()
+        async with self._with_session() as session:
+            result = await session.execute(
+                select(TypingPattern)
+                .where(TypingPattern.session_id == session_id)
+                .order_by(TypingPattern.created_at.desc())
+                .limit(limit)
+                .offset(offset)
+            )
+            return result.scalars().all()
 
-        result = await session.execute(
-            select(TypingPattern)
-            .where(TypingPattern.session_id == session_id)
-            .order_by(TypingPattern.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-        )
-        return result.scalars().all()
+    async def get_patterns_with_profiles(
+        self,
+        session_id: str,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[TypingPattern]:
+        """
+        세션별 타이핑 패턴 목록을 감정 프로필과 함께 조회
+
+        1:1 관계이므로 JOIN 한 번으로 패턴과 프로필을 함께 가져온다.
+
+        Args:
+            session_id: 사용자 세션 ID
+            limit: 최대 반환 개수
+            offset: 시작 위치
+
+        Returns:
+            emotion_profile이 로드된 타이핑 패턴 리스트
+        """
+        async with self._with_session() as session:
+            return await self._fetch_patterns_with_profiles(session, session_id, limit, offset)
 
     async def get_emotion_profile_by_pattern(
         self,
@@ -158,19 +282,8 @@ class PatternAnalysisService:
         Returns:
             EmotionProfile 객체 또는 None
         """
-        if self.db_session:
-            session = self.db_session
-        else:
-            async with get_async_session() as session:
-                result = await session.execute(
-                    select(EmotionProfile).where(EmotionProfile.pattern_id == pattern_id)
-                )
-                return result.scalar_one_or_none()
-
-        result = await session.execute(
-            select(EmotionProfile).where(EmotionProfile.pattern_id == pattern_id)
-        )
-        return result.scalar_one_or_none()
+        async with self._with_session() as session:
+            return await self._fetch_emotion_profile(session, pattern_id)
 
     async def reanalyze_pattern(self, pattern_id: str) -> Optional[EmotionProfile]:
         """
@@ -182,32 +295,19 @@ class PatternAnalysisService:
         Returns:
             업데이트된 EmotionProfile 객체 또는 None
         """
-        # 1. 기존 타이핑 패턴 조회
-        typing_pattern = await self.get_pattern_by_id(pattern_id)
-        if not typing_pattern:
-            return None
-
-        # 2. 키스트로크 데이터 재분석
-        analysis_result = self.pattern_analyzer.analyze_typing_pattern(
-            typing_pattern.keystrokes
-        )
-
-        # 3. 기존 감정 프로필 조회
-        existing_emotion_profile = await self.get_emotion_profile_by_pattern(pattern_id)
-
-        if existing_emotion_profile:
-            # 기존 프로필 업데이트
-            updated_profile = await self._update_emotion_profile(
-                existing_emotion_profile, analysis_result
-            )
-            return updated_profile
-        else:
-            # 새 감정 프로필 생성
-            new_profile = await self._create_emotion_profile(
-                typing_pattern_id=pattern_id,
-                analysis_result=analysis_result
+        async with self._with_session() as session:
+            # 1. 기존 타이핑 패턴 조회
+            typing_pattern = await self._fetch_pattern(session, pattern_id)
+            if not typing_pattern:
+                return None
+
+            # 2. 키스트로크 데이터 재분석
+            analysis_result = self.pattern_analyzer.analyze_typing_pattern(
+                typing_pattern.keystrokes
             )
-            return new_profile
+
+            # 3. 감정 프로필 생성 또는 갱신 (조회 없이 upsert 한 번)
+            return await self._upsert_emotion_profile(session, pattern_id, analysis_result)
 
     async def get_session_analysis_summary(
         self,
@@ -222,62 +322,76 @@ class PatternAnalysisService:
         Returns:
             분석 요약 딕셔너리
         """
-        # 세션의 모든 패턴 조회
-        patterns = await self.get_patterns_by_session(session_id)
-
-        if not patterns:
-            return {
-                "session_id": session_id,
-                "total_patterns": 0,
-                "analysis_summary": "No patterns analyzed yet"
-            }
-
-        # 감정 프로필 수집
-        emotion_profiles = []
-        for pattern in patterns:
-            emotion_profile = await self.get_emotion_profile_by_pattern(pattern.id)
-            if emotion_profile:
-                emotion_profiles.append(emotion_profile)
-
-        # 통계 계산
-        total_keystrokes = sum(len(p.keystrokes) for p in patterns)
-        total_text_length = sum(len(p.text_content or '') for p in patterns)
-
-        # 감정 분포 계산
-        emotion_distribution = {}
-        if emotion_profiles:
-            for profile in emotion_profiles:
-                emotion = profile.get_dominant_emotion()
-                emotion_distribution[emotion] = emotion_distribution.get(emotion, 0) + 1
-
-        # 평균 감정 벡터 계산
-        avg_emotion_vector = {}
-        if emotion_profiles:
-            emotion_keys = ['energy', 'valence', 'tension', 'focus']
-            for key in emotion_keys:
-                values = [
-                    profile.emotion_vector.get(key, 0)
-                    for profile in emotion_profiles
-                    if profile.emotion_vector
-                ]
-                avg_emotion_vector[key] = sum(values) / len(values) if values else 0
+        async with self._with_session() as session:
+            # 개수/길이 합계는 저장된 파생 컬럼으로 SQL에서 집계 (키스트로크 JSONB를 읽지 않음)
+            (
+                total_patterns,
+                total_keystrokes,
+                total_text_length,
+                total_profiles
+            ) = await self._aggregate_session_stats(session, session_id)
+
+            if not total_patterns:
+                return {
+                    "session_id": session_id,
+                    "total_patterns": 0,
+                    "analysis_summary": "No patterns analyzed yet"
+                }
+
+            # 감정 통계는 프로필을 배치 단위로 스트리밍하며 누적 (메모리 사용량 일정)
+            emotion_distribution: Counter[str] = Counter()
+            vector_sum: np.ndarray = np.zeros(len(EMOTION_KEYS), dtype=np.float64)
+            vector_count = 0
+            confidence_sum = 0.0
+            profile_count = 0
+
+            if total_profiles:
+                async for profiles in self._stream_session_emotion_profiles(session, session_id):
+                    emotion_distribution.update(
+                        profile.get_dominant_emotion() for profile in profiles
+                    )
+
+                    # 프로필 x 감정 차원 행렬의 열 합계
+                    emotion_vectors = [
+                        profile.emotion_vector for profile in profiles if profile.emotion_vector
+                    ]
+                    if emotion_vectors:
+                        matrix = np.array(
+                            [[vector.get(key, 0) for key in EMOTION_KEYS] for vector in emotion_vectors],
+                            dtype=np.float64
+                        )
+                        vector_sum += matrix.sum(axis=0)
+                        vector_count += len(emotion_vectors)
+
+                    confidence_sum += float(np.fromiter(
+                        (float(profile.confidence_score) for profile in profiles),
+                        dtype=np.float64,
+                        count=len(profiles)
+                    ).sum())
+                    profile_count += len(profiles)
+
+        most_common = emotion_distribution.most_common(1)
+
+        # 평균 감정 벡터
+        avg_emotion_vector: Dict[str, float] = {}
+        if vector_count:
+            avg_emotion_vector = dict(zip(EMOTION_KEYS, (vector_sum / vector_count).tolist()))
+        elif profile_count:
+            avg_emotion_vector = dict.fromkeys(EMOTION_KEYS, 0)
 
         # 신뢰도 평균
-        avg_confidence = 0
-        if emotion_profiles:
-            confidences = [float(profile.confidence_score) for profile in emotion_profiles]
-            avg_confidence = sum(confidences) / len(confidences)
+        avg_confidence = confidence_sum / profile_count if profile_count else 0.0
 
         return {
             "session_id": session_id,
-            "total_patterns": len(patterns),
+            "total_patterns": total_patterns,
             "total_keystrokes": total_keystrokes,
             "total_text_length": total_text_length,
-            "emotion_distribution": emotion_distribution,
+            "emotion_distribution": dict(emotion_distribution),
             "average_emotion_vector": avg_emotion_vector,
             "average_confidence": round(avg_confidence, 3),
-            "most_common_emotion": max(emotion_distribution, key=emotion_distribution.get) if emotion_distribution else "unknown",
-            "analysis_complete": len(emotion_profiles) == len(patterns)
+            "most_common_emotion": most_common[0][0] if most_common else "unknown",
+            "analysis_complete": total_profiles == total_patterns
         }
 
     async def delete_pattern(self, pattern_id: str) -> bool:
@@ -291,105 +405,145 @@ class PatternAnalysisService:
             삭제 성공 여부
         """
         try:
-            if self.db_session:
-                session = self.db_session
-            else:
-                async with get_async_session() as session:
-                    # 타이핑 패턴 조회
+            async with self._with_session() as session:
+                # 조회 없이 DELETE 한 번으로 삭제
+                # (emotion_profiles.pattern_id의 ON DELETE CASCADE로 감정 프로필도 삭제됨)
+                try:
                     result = await session.execute(
-                        select(TypingPattern).where(TypingPattern.id == pattern_id)
+                        delete(TypingPattern).where(TypingPattern.id == pattern_id)
                     )
-                    pattern = result.scalar_one_or_none()
-
-                    if not pattern:
-                        return False
-
-                    # CASCADE 설정으로 감정 프로필도 자동 삭제됨
-                    await session.delete(pattern)
                     await session.commit()
-                    return True
-
-            # 타이핑 패턴 조회
-            result = await session.execute(
-                select(TypingPattern).where(TypingPattern.id == pattern_id)
-            )
-            pattern = result.scalar_one_or_none()
-
-            if not pattern:
-                return False
+                except IntegrityError as e:
+                    # 감정 프로필을 참조하는 음악 프롬프트가 있으면 삭제할 수 없음
+                    await session.rollback()
+                    print(f"Failed to delete pattern {pattern_id}: still referenced ({e.orig})")
+                    return False
 
-            # CASCADE 설정으로 감정 프로필도 자동 삭제됨
-            await session.delete(pattern)
-            await session.commit()
-            return True
+                return bool(result.rowcount)
 
         except Exception:
             return False
 
-    async def _validate_session_exists(self, session_id: str) -> bool:
-        """세션 존재 여부 확인"""
-        if self.db_session:
-            session = self.db_session
-        else:
-            async with get_async_session() as session:
-                result = await session.execute(
-                    select(UserSession).where(UserSession.id == session_id)
-                )
-                return result.scalar_one_or_none() is not None
+    def clear_session_cache(self) -> None:
+        """세션 존재 확인 캐시 초기화 (오래 유지되는 인스턴스용)"""
+        self._validated_sessions.clear()
+
+    async def _validate_session_exists(self, session: AsyncSession, session_id: str) -> bool:
+        """세션 존재 여부 확인 (확인된 세션은 캐시)"""
+        if session_id in self._validated_sessions:
+            return True
 
         result = await session.execute(
             select(UserSession).where(UserSession.id == session_id)
         )
-        return result.scalar_one_or_none() is not None
+        exists = result.scalar_one_or_none() is not None
+        if exists:
+            self._validated_sessions.add(session_id)
+        return exists
+
+    async def _fetch_pattern(
+        self,
+        session: AsyncSession,
+        pattern_id: str
+    ) -> Optional[TypingPattern]:
+        """ID로 타이핑 패턴 조회"""
+        result = await session.execute(
+            select(TypingPattern).where(TypingPattern.id == pattern_id)
+        )
+        return result.scalar_one_or_none()
 
-    async def _create_typing_pattern(
+    async def _fetch_patterns_with_profiles(
         self,
+        session: AsyncSession,
         session_id: str,
-        keystrokes: List[Dict[str, Any]],
-        text_content: str
-    ) -> TypingPattern:
-        """타이핑 패턴 모델 생성 및 저장"""
-        typing_pattern = TypingPattern(
-            session_id=session_id,
-            keystrokes=keystrokes,
-            text_content=text_content
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[TypingPattern]:
+        """세션별 타이핑 패턴을 감정 프로필과 함께 조회 (JOIN 1회)"""
+        result = await session.execute(
+            select(TypingPattern)
+            .options(joinedload(TypingPattern.emotion_profile))
+            .where(TypingPattern.session_id == session_id)
+            .order_by(TypingPattern.created_at.desc())
+            .limit(limit)
+            .offset(offset)
         )
+        return result.scalars().all()
 
-        if self.db_session:
-            session = self.db_session
-        else:
-            async with get_async_session() as session:
-                session.add(typing_pattern)
-                await session.commit()
-                await session.refresh(typing_pattern)
-                return typing_pattern
+    async def _aggregate_session_stats(
+        self,
+        session: AsyncSession,
+        session_id: str
+    ) -> Tuple[int, int, int, int]:
+        """세션의 (패턴 수, 키스트로크 합계, 텍스트 길이 합계, 프로필 수)를 한 번에 집계"""
+        result = await session.execute(
+            select(
+                func.count(TypingPattern.id),
+                func.coalesce(func.sum(TypingPattern.keystroke_count), 0),
+                func.coalesce(func.sum(TypingPattern.text_length), 0),
+                func.count(EmotionProfile.id)
+            )
+            .select_from(TypingPattern)
+            .outerjoin(EmotionProfile, EmotionProfile.pattern_id == TypingPattern.id)
+            .where(TypingPattern.session_id == session_id)
+        )
+        count, keystrokes, text_length, profiles = result.one()
+        return int(count), int(keystrokes), int(text_length), int(profiles)
 
-        session.add(typing_pattern)
-        await session.commit()
-        await session.refresh(typing_pattern)
-        return typing_pattern
+    async def _stream_session_emotion_profiles(
+        self,
+        session: AsyncSession,
+        session_id: str
+    ) -> AsyncIterator[Sequence[EmotionProfile]]:
+        """세션에 속한 감정 프로필을 서버 측 커서로 배치 단위 조회 (패턴 행은 로드하지 않음)"""
+        result = await session.stream_scalars(
+            select(EmotionProfile)
+            .join(TypingPattern, EmotionProfile.pattern_id == TypingPattern.id)
+            .where(TypingPattern.session_id == session_id)
+            .execution_options(yield_per=SUMMARY_STREAM_BATCH_SIZE)
+        )
+        async for profiles in result.partitions():
+            yield profiles
 
-    async def _create_emotion_profile(
+    async def _fetch_emotion_profile(
         self,
-        typing_pattern_id: str,
+        session: AsyncSession,
+        pattern_id: str
+    ) -> Optional[EmotionProfile]:
+        """타이핑 패턴 ID로 감정 프로필 조회"""
+        result = await session.execute(
+            select(EmotionProfile).where(EmotionProfile.pattern_id == pattern_id)
+        )
+        return result.scalar_one_or_none()
+
+    def _build_pattern_with_profile(
+        self,
+        session_id: str,
+        keystrokes: List[Dict[str, Any]],
+        text_content: str,
         analysis_result: Dict[str, Any]
-    ) -> EmotionProfile:
-        """감정 프로필 생성 및 저장"""
-        # 타이핑 통계에서 감정 프로필 생성
-        statistics = analysis_result.get('statistics', {})
-        patterns = analysis_result.get('patterns', {})
+    ) -> Tuple[TypingPattern, EmotionProfile]:
+        """
+        타이핑 패턴과 감정 프로필 모델 생성 (저장하지 않음)
 
-        # statistics와 patterns를 결합
-        combined_stats = {**statistics}
-        if patterns and 'error' not in patterns:
-            combined_stats['patterns'] = patterns
+        관계로 연결하므로 flush 시 pattern_id 외래 키가 채워지고,
+        created_at 등 서버 기본값은 INSERT ... RETURNING으로 함께 로드된다.
+        """
+        typing_pattern = TypingPattern(
+            session_id=session_id,
+            keystrokes=keystrokes,
+            text_content=text_content
+        )
+        emotion_profile = self._build_emotion_profile(analysis_result)
+        emotion_profile.typing_pattern = typing_pattern
+        return typing_pattern, emotion_profile
 
-        # 감정 매퍼로 감정 프로필 생성
-        emotion_profile_data = self.emotion_mapper.map_typing_to_emotion(combined_stats)
+    def _build_emotion_profile(self, analysis_result: Dict[str, Any]) -> EmotionProfile:
+        """분석 결과로 감정 프로필 모델 생성 (저장하지 않음, pattern_id 미설정)"""
+        emotion_profile_data = self._map_emotion(analysis_result)
 
         # EmotionProfile 모델 생성
-        emotion_profile = EmotionProfile(
-            pattern_id=typing_pattern_id,
+        return EmotionProfile(
             tempo_score=emotion_profile_data.tempo_score,
             rhythm_consistency=emotion_profile_data.rhythm_consistency,
             pause_intensity=emotion_profile_data.pause_intensity,
@@ -397,55 +551,52 @@ class PatternAnalysisService:
             confidence_score=emotion_profile_data.confidence_score
         )
 
-        if self.db_session:
-            session = self.db_session
-        else:
-            async with get_async_session() as session:
-                session.add(emotion_profile)
-                await session.commit()
-                await session.refresh(emotion_profile)
-                return emotion_profile
-
-        session.add(emotion_profile)
-        await session.commit()
-        await session.refresh(emotion_profile)
-        return emotion_profile
-
-    async def _update_emotion_profile(
-        self,
-        emotion_profile: EmotionProfile,
-        analysis_result: Dict[str, Any]
-    ) -> EmotionProfile:
-        """기존 감정 프로필 업데이트"""
-        # 새로운 감정 프로필 데이터 생성
+    def _map_emotion(self, analysis_result: Dict[str, Any]) -> Any:
+        """분석 결과를 감정 매퍼 입력으로 변환하여 감정 데이터 생성"""
+        # 타이핑 통계에서 감정 프로필 생성
         statistics = analysis_result.get('statistics', {})
         patterns = analysis_result.get('patterns', {})
 
+        # statistics와 patterns를 결합
         combined_stats = {**statistics}
         if patterns and 'error' not in patterns:
             combined_stats['patterns'] = patterns
 
-        emotion_profile_data = self.emotion_mapper.map_typing_to_emotion(combined_stats)
-
-        # 기존 모델 업데이트
-        emotion_profile.tempo_score = emotion_profile_data.tempo_score
-        emotion_profile.rhythm_consistency = emotion_profile_data.rhythm_consistency
-        emotion_profile.pause_intensity = emotion_profile_data.pause_intensity
-        emotion_profile.emotion_vector = emotion_profile_data.emotion_vector
-        emotion_profile.confidence_score = emotion_profile_data.confidence_score
+        # 감정 매퍼로 감정 프로필 생성
+        return self.emotion_mapper.map_typing_to_emotion(combined_stats)
 
-        if self.db_session:
-            session = self.db_session
-        else:
-            async with get_async_session() as session:
-                session.add(emotion_profile)
-                await session.commit()
-                await session.refresh(emotion_profile)
-                return emotion_profile
+    async def _upsert_emotion_profile(
+        self,
+        session: AsyncSession,
+        pattern_id: str,
+        analysis_result: Dict[str, Any]
+    ) -> EmotionProfile:
+        """패턴의 감정 프로필 upsert (pattern_id 유니크 제약 기준 INSERT ... ON CONFLICT DO UPDATE)"""
+        emotion_profile_data = self._map_emotion(analysis_result)
+        values = {
+            "tempo_score": emotion_profile_data.tempo_score,
+            "rhythm_consistency": emotion_profile_data.rhythm_consistency,
+            "pause_intensity": emotion_profile_data.pause_intensity,
+            "emotion_vector": emotion_profile_data.emotion_vector,
+            "confidence_score": emotion_profile_data.confidence_score
+        }
 
-        session.add(emotion_profile)
+        # ON CONFLICT 경로에서는 onupdate가 적용되지 않으므로 updated_at을 직접 갱신
+        statement = (
+            pg_insert(EmotionProfile)
+            .values(pattern_id=pattern_id, **values)
+            .on_conflict_do_update(
+                index_elements=[EmotionProfile.pattern_id],
+                set_={**values, "updated_at": func.now()}
+            )
+            .returning(EmotionProfile)
+        )
+        result = await session.scalars(
+            statement,
+            execution_options={"populate_existing": True}
+        )
+        emotion_profile = result.one()
         await session.commit()
-        await session.refresh(emotion_profile)
         return emotion_profile
 
     async def analyze_batch_patterns(
@@ -463,40 +614,81 @@ class PatternAnalysisService:
         Returns:
             (TypingPattern, EmotionProfile) 튜플 리스트
         """
-        results = []
-
-        for i, keystrokes in enumerate(keystroke_batches):
-            try:
-                typing_pattern, emotion_profile = await self.analyze_typing_pattern(
-                    session_id=session_id,
-                    keystrokes=keystrokes,
-                    text_content=None  # 자동 추출
-                )
-                results.append((typing_pattern, emotion_profile))
-
-            except (ValueError, RuntimeError) as e:
-                # 개별 배치 실패 시 로그만 남기고 계속 진행
-                print(f"Failed to analyze batch {i}: {e}")
-                continue
+        results: List[Tuple[TypingPattern, EmotionProfile]] = []
+
+        async with self._with_session() as session:
+            # 세션 존재 확인은 배치 전체에 대해 한 번만 수행
+            if not await self._validate_session_exists(session, session_id):
+                print(f"Failed to analyze batches: Session not found: {session_id}")
+                return results
+
+            # 1) 분석 및 모델 생성 (메모리에서만 수행)
+            analyses = await self._analyze_batches(keystroke_batches)
+            for i, (keystrokes, analysis) in enumerate(zip(keystroke_batches, analyses)):
+                if isinstance(analysis, ValueError):
+                    # 개별 배치 실패 시 로그만 남기고 계속 진행
+                    print(f"Failed to analyze batch {i}: {analysis}")
+                    continue
+
+                results.append(self._build_pattern_with_profile(
+                    session_id, keystrokes, analysis.get('text_content', ''), analysis
+                ))
+
+            # 2) 한 번의 트랜잭션으로 일괄 저장
+            if results:
+                session.add_all([model for pair in results for model in pair])
+                await session.commit()
 
         return results
 
-    def get_analysis_statistics(self) -> Dict[str, Any]:
+    async def _analyze_batches(
+        self,
+        keystroke_batches: List[List[Dict[str, Any]]]
+    ) -> List[Any]:
+        """
+        배치별 검증 및 분석 결과 반환 (실패한 배치는 ValueError 객체)
+
+        배치가 많으면 프로세스 풀에서 병렬로 분석해 이벤트 루프를 막지 않는다.
+        """
+        if len(keystroke_batches) < PARALLEL_ANALYSIS_MIN_BATCHES:
+            analyses: List[Any] = []
+            for keystrokes in keystroke_batches:
+                try:
+                    analyses.append(_validate_and_analyze(self.pattern_analyzer, keystrokes))
+                except ValueError as e:
+                    analyses.append(e)
+            return analyses
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_cpu_pool()
+        analyses = await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, _analyze_in_worker, keystrokes)
+                for keystrokes in keystroke_batches
+            ),
+            return_exceptions=True
+        )
+        for analysis in analyses:
+            if isinstance(analysis, BaseException) and not isinstance(analysis, ValueError):
+                raise analysis
+        return analyses
+
+    def get_analysis_statistics(self) -> Mapping[str, Any]:
         """
         분석기 설정 및 통계 정보 반환
 
         Returns:
-            분석기 정보 딕셔너리
+            분석기 정보 매핑 (읽기 전용)
         """
-        return {
-            "pattern_analyzer": {
+        return MappingProxyType({
+            "pattern_analyzer": MappingProxyType({
                 "pause_threshold_ms": self.pattern_analyzer.pause_threshold_ms,
                 "version": "1.0.0"
-            },
-            "emotion_mapper": {
+            }),
+            "emotion_mapper": MappingProxyType({
                 "emotion_thresholds": self.emotion_mapper.emotion_thresholds,
                 "genre_mapping_count": len(self.emotion_mapper.genre_mapping),
                 "version": "1.0.0"
-            },
+            }),
             "service_version": "1.0.0"
-        }
\ No newline at end of file
+        })
\ No newline at end of file
@@ -6,83 +6,335 @@ WebSocket으로 받은 타이핑 데이터를 처리하고 감정 분석 결과
 import logging
 import random
 import asyncio
-from datetime import datetime
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import ClassVar, Deque, Dict, List, Any, Optional, Sequence, Set, Tuple, Union
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
+from src.models.emotion_profile import EmotionProfile
+from src.models.typing_pattern import TypingPattern
+from src.models.user_session import UserSession
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# 세션별 타이핑 이벤트 버퍼 최대 크기 (가득 차면 가장 오래된 이벤트부터 밀려남)
+SESSION_BUFFER_SIZE = 100
+
+# 감정 분석에 필요한 최소 타이핑 이벤트 수 (실시간 패턴 분석과 같은 기준)
+MIN_EVENTS_FOR_ANALYSIS = 10
+
+# 캐시된 감정 분석 결과를 다시 분석하기까지의 시간 (10분, ns)
+EMOTION_REFRESH_INTERVAL_NS = 10 * 60 * 1_000_000_000
+
+# 세션 ID → UserSession PK 캐시 최대 크기 (LRU)
+SESSION_PK_CACHE_SIZE = 1024
+
+# 패턴 분석 결과 캐시: 최근 이벤트 수, 간격 양자화 단위(ms), 최대 항목 수 (LRU)
+PATTERN_FINGERPRINT_EVENTS = 50
+PATTERN_FINGERPRINT_BUCKET_MS = 50
+PATTERN_RESULT_CACHE_SIZE = 512
+
+# 캐시에 저장하는 감정 점수 해상도 (0.01 단위, -1.0~1.0 점수는 int8 범위의 정수 격자)
+EMOTION_CACHE_SCALE = 100
+
+# Redis 타이핑 버퍼 write-behind: 최대 대기 시간(초)과 한 번에 기록할 최대 이벤트 수
+TYPING_FLUSH_DELAY = 0.05
+TYPING_FLUSH_MAX_EVENTS = 20
+
+# 실시간 패턴 구간 경계 (searchsorted(side='right')로 구간 인덱스 계산)
+# 상한은 nextafter로 한 칸 올려 경계값(500, 200) 자체는 가운데 구간에 포함
+_SPEED_BOUNDS = np.array([100.0, np.nextafter(500.0, np.inf)])
+_SPEED_LABELS = ('fast_typing', 'normal_typing', 'slow_typing')
+_RHYTHM_BOUNDS = np.array([50.0, np.nextafter(200.0, np.inf)])
+_RHYTHM_LABELS = ('consistent_rhythm', None, 'irregular_rhythm')
+
+# 감정 기반 음악 스타일 (mood, tempo, genre)
+_MUSIC_STYLES = (
+    ("energetic and positive", "fast", "electronic or pop"),
+    ("calm and melancholic", "slow", "ambient or classical"),
+    ("tense and dramatic", "moderate to fast", "cinematic or rock"),
+    ("focused and contemplative", "moderate", "minimal or instrumental"),
+    ("balanced and neutral", "moderate", "acoustic or indie"),
+)
+
+
+# 스타일 조건 비트(energetic<<3 | calm<<2 | tense<<1 | focused) → _MUSIC_STYLES 인덱스
+# 여러 조건이 동시에 참이면 앞선 스타일 우선 (가장 높은 비트), 모두 거짓이면 balanced
+_STYLE_TABLE = tuple(
+    next((style for style, bit in enumerate((8, 4, 2, 1)) if index & bit), 4)
+    for index in range(16)
+)
+
+
+def _select_music_style(energy: float, valence: float, tension: float, focus: float) -> int:
+    """감정 값으로 _MUSIC_STYLES 인덱스 결정 (조건 비트로 _STYLE_TABLE 조회)"""
+    index = (
+        (energy > 0.7 and valence > 0.3) << 3
+        | (energy < 0.3 and valence < -0.3) << 2
+        | (tension > 0.7) << 1
+        | (focus > 0.7)
+    )
+    return _STYLE_TABLE[index]
+
+
+@lru_cache(maxsize=256)
+def _compose_prompt(style: int, energy_bucket: int, valence_bucket: int,
+                    tension_bucket: int, focus_bucket: int, dominant_emotion: str) -> str:
+    """
+    음악 프롬프트 문자열 생성
+
+    수치는 0.1 단위로 양자화된 정수(값 * 10)로 받아 같은 구간이면 캐시된 문자열을 재사용
+    """
+    mood, tempo, genre = _MUSIC_STYLES[style]
+
+    prompt = f"""
+            Create a {tempo}-tempo {genre} piece with a {mood} atmosphere.
+
+            Musical characteristics:
+            - Energy level: {energy_bucket / 10:.1f}/1.0
+            - Emotional valence: {valence_bucket / 10:.1f} (negative to positive)
+            - Tension: {tension_bucket / 10:.1f}/1.0
+            - Focus: {focus_bucket / 10:.1f}/1.0
+            - Dominant emotion: {dominant_emotion}
+
+            Duration: 60-90 seconds
+            Style: Instrumental, suitable for background listening
+            """
+
+    return prompt.strip()
+
+
+@dataclass(slots=True)
 class ProcessingResult:
     """처리 결과 클래스"""
     success: bool
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class TypingEvent:
-    """타이핑 이벤트 클래스"""
-    timestamp: datetime
-    char: str
-    key_code: str
-    duration: float
+    """타이핑 이벤트 클래스 (_parse_typing_event 결과)"""
+    keystroke: str
+    timestamp: float
     interval: float
+    key_code: Optional[str]
+    is_special: bool
+    session_time: float
 
-@dataclass
+@dataclass(slots=True)
 class TypingMetrics:
-    """타이핑 메트릭 클래스"""
+    """타이핑 메트릭 클래스 (_calculate_realtime_metrics 결과 항목)"""
     wpm: float
-    accuracy: float
-    rhythm_stability: float
-    pause_frequency: float
+    total_keystrokes: int
+    session_duration: float
+    average_interval: float
+    rhythm_variance: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EmotionSnapshot:
-    """감정 스냅샷 클래스"""
+    """감정 스냅샷 클래스 (불변, 직렬화 결과는 인스턴스당 한 번만 생성)"""
     energy: float
+    valence: float
     tension: float
     focus: float
-    stress: float
+    confidence: float
+    dominant_emotion: str
     timestamp: datetime
+    _payload: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def to_payload(self) -> Dict[str, Any]:
+        """캐시/응답용 딕셔너리 (처음 호출 시 만들어 인스턴스에 보관)"""
+        payload = self._payload
+        if payload is None:
+            payload = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+            object.__setattr__(self, '_payload', payload)
+        return payload
+
+    def to_cache_payload(self) -> Dict[str, Any]:
+        """캐시 저장용 딕셔너리 (점수를 0.01 단위로 양자화해 직렬화 크기를 줄임)"""
+        return {
+            key: round(value * EMOTION_CACHE_SCALE) / EMOTION_CACHE_SCALE
+            if isinstance(value, float) else value
+            for key, value in self.to_payload().items()
+        }
+
+class _ProgressBuffer:
+    """
+    음악 생성 진행 메시지 묶음 전송
+
+    연속된 진행 단계를 모아 두었다가 오래 걸리는 작업 직전(flush)이나 종료 메시지
+    전송 시 WebSocket 메시지 하나로 보낸다. 최상위 stage/progress/message는 마지막 단계,
+    stages에는 묶인 단계 전체가 담긴다.
+    """
+
+    __slots__ = ('_manager', '_session_id', '_stages')
+
+    def __init__(self, websocket_manager, session_id: str):
+        self._manager = websocket_manager
+        self._session_id = session_id
+        self._stages: List[Dict[str, Any]] = []
+
+    def push(self, stage: str, progress: int, message: str) -> None:
+        """진행 단계 추가 (전송은 flush 시점까지 지연)"""
+        if self._manager:
+            self._stages.append({'stage': stage, 'progress': progress, 'message': message})
+
+    async def flush(self) -> None:
+        """쌓인 진행 단계를 메시지 하나로 전송"""
+        if not self._stages:
+            return
+
+        stages, self._stages = self._stages, []
+        await self._manager.send_personal_message(self._session_id, {
+            'type': 'music_generation_progress',
+            **stages[-1],
+            'stages': stages
+        })
+
+    async def finish(self, message: Dict[str, Any]) -> None:
+        """남은 진행 단계를 보낸 뒤 종료 메시지(complete/failed) 전송"""
+        if not self._manager:
+            return
+
+        await self.flush()
+        await self._manager.send_personal_message(self._session_id, message)
+
+
+class _SessionRing:
+    """
+    세션별 타이핑 수치 링 버퍼 (SoA)
+
+    이벤트 저장 시점에 간격/처리 시각/문자 입력 여부를 미리 할당한 배열에 기록해
+    분석할 때마다 이벤트 딕셔너리에서 배열을 다시 추출하지 않는다.
+    """
+
+    __slots__ = ('intervals', 'timestamps_ns', 'is_char', 'head', 'size')
+
+    def __init__(self, capacity: int = SESSION_BUFFER_SIZE):
+        self.intervals: np.ndarray = np.empty(capacity, dtype=np.float64)
+        self.timestamps_ns: np.ndarray = np.empty(capacity, dtype=np.int64)
+        self.is_char: np.ndarray = np.empty(capacity, dtype=np.bool_)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, event: Dict[str, Any], timestamp_ns: int) -> None:
+        """이벤트 수치 기록 (가득 차면 가장 오래된 값을 덮어씀)"""
+        head = self.head
+        self.intervals[head] = float(event.get('interval') or 0)
+        self.timestamps_ns[head] = timestamp_ns
+        self.is_char[head] = bool(event.get('keystroke', '')) and not event.get('is_special', False)
+
+        capacity = self.intervals.size
+        self.head = (head + 1) % capacity
+        self.size = min(self.size + 1, capacity)
+
+    def recent(self, values: np.ndarray, count: Optional[int] = None) -> np.ndarray:
+        """
+        values(intervals/timestamps_ns/is_char)의 최근 count개를 시간순으로 반환
+
+        배열 끝에서 처음으로 넘어가지 않으면 복사 없는 뷰를 반환한다.
+        """
+        count = self.size if count is None else min(count, self.size)
+        capacity = values.size
+        start = (self.head - count) % capacity
+        end = start + count
+        if end <= capacity:
+            return values[start:end]
+        return np.concatenate((values[start:], values[:end - capacity]))
+
+
+# 실시간 분석 입력: 세션 링 버퍼 또는 이벤트 딕셔너리 목록 (Redis 버퍼 등)
+RealtimeBuffer = Union[_SessionRing, Sequence[Dict[str, Any]]]
+
 
 class RealtimeProcessor:
     """실시간 타이핑 데이터 처리기"""
 
+    # 워커 전체에서 공유하는 AI 음악 생성 동시 실행 제한 (첫 사용 시 생성)
+    _music_gen_semaphore: ClassVar[Optional[asyncio.Semaphore]] = None
+
     def __init__(self, cache_service, db_session: AsyncSession):
         self.cache_service = cache_service
         self.db_session = db_session
-        self.session_buffers: Dict[str, List[Dict[str, Any]]] = {}
+        # AsyncSession은 동시 작업을 지원하지 않으므로 백그라운드 분석과 요청 처리의 DB 접근을 직렬화
+        self._db_lock = asyncio.Lock()
+        self.session_buffers: Dict[str, Deque[Dict[str, Any]]] = {}
+        # 세션별 수치 링 버퍼 (session_buffers와 같은 이벤트를 배열로 보관)
+        self.session_rings: Dict[str, _SessionRing] = {}
+        # 세션별 마지막 실시간 메트릭 (새 이벤트가 들어오면 무효화, 통계 조회 시 재사용)
+        self._last_metrics: Dict[str, Dict[str, float]] = {}
+
+        # 세션별 진행 중인 감정 분석 태스크 (세션당 하나만 실행)
+        self._analysis_tasks: Dict[str, asyncio.Task] = {}
+
+        # 세션 ID → UserSession PK (세션 중에는 바뀌지 않으므로 LRU로 캐시)
+        self._session_pk_cache: "OrderedDict[str, str]" = OrderedDict()
+
+        # 간격 지문 → 패턴 분석 결과 (비슷한 버퍼는 분석기를 다시 호출하지 않음, LRU)
+        self._pattern_result_cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+
+        # Redis 타이핑 버퍼 write-behind 상태 (세션별 대기 이벤트, 예약된 플러시 타이머)
+        self._pending_writes: Dict[str, List[Dict[str, Any]]] = {}
+        self._flush_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._write_tasks: Set[asyncio.Task] = set()
+
+    async def process_typing_event(self, session_id: str, typing_data: Dict[str, Any],
+                                   websocket_manager=None) -> Dict[str, Any]:
+        """
+        타이핑 이벤트 처리
 
-    async def process_typing_event(self, session_id: str, typing_data: Dict[str, Any]) -> Dict[str, Any]:
-        """타이핑 이벤트 처리"""
+        websocket_manager가 주어지면 감정 분석 트리거 시 분석을 백그라운드로 예약하고
+        결과는 분석이 끝난 뒤 WebSocket으로 전송한다 (이벤트 처리는 분석을 기다리지 않음).
+        """
         try:
             logger.info(f"타이핑 이벤트 처리: session_id={session_id}, data={typing_data}")
 
-            # 세션 버퍼 초기화
-            if session_id not in self.session_buffers:
-                self.session_buffers[session_id] = []
+            # 세션 버퍼 초기화 (최대 100개 이벤트, 초과 시 오래된 이벤트 자동 제거)
+            buffer = self.session_buffers.get(session_id)
+            if buffer is None:
+                buffer = self.session_buffers[session_id] = deque(maxlen=SESSION_BUFFER_SIZE)
 
-            # 타이핑 데이터를 버퍼에 저장
-            self.session_buffers[session_id].append({
+            # 타이핑 데이터를 버퍼에 저장 (처리 시각은 정수 ns로 기록, 문자열 변환은 필요할 때만)
+            processed_at_ns = time.time_ns()
+            buffer.append({
                 **typing_data,
-                'processed_at': datetime.utcnow().isoformat()
+                'processed_at_ns': processed_at_ns
             })
 
-            # 버퍼 크기 제한 (최대 100개 이벤트)
-            if len(self.session_buffers[session_id]) > 100:
-                self.session_buffers[session_id] = self.session_buffers[session_id][-100:]
+            # 분석용 수치는 링 버퍼에 바로 기록
+            ring = self.session_rings.get(session_id)
+            if ring is None:
+                ring = self.session_rings[session_id] = _SessionRing()
+            ring.push(typing_data, processed_at_ns)
+            self._last_metrics.pop(session_id, None)
+
+            # Redis 버퍼 기록은 모아서 나중에 한 번에 (이벤트 처리는 기다리지 않음)
+            self._queue_typing_write(session_id, buffer[-1])
 
-            buffer_size = len(self.session_buffers[session_id])
+            buffer_size = len(buffer)
 
             # 간단한 패턴 감지 (모킹)
-            patterns_detected = self._detect_patterns(self.session_buffers[session_id])
+            patterns_detected = self._detect_patterns(buffer)
 
             # 감정 분석 트리거 조건 (버퍼에 5개 이상 이벤트가 있으면)
             trigger_emotion_analysis = buffer_size >= 5 and buffer_size % 5 == 0
+            if trigger_emotion_analysis and websocket_manager:
+                self.schedule_emotion_analysis(session_id, websocket_manager)
 
             # 기본 감정 점수 계산 (모킹)
-            emotion_score = self._calculate_basic_emotion(self.session_buffers[session_id]) if buffer_size >= 3 else None
+            emotion_score = self._calculate_basic_emotion(buffer) if buffer_size >= 3 else None
 
             return {
                 'success': True,
@@ -99,18 +351,97 @@ class RealtimeProcessor:
                 'error': f'타이핑 이벤트 처리 실패: {str(e)}'
             }
 
-    async def trigger_emotion_analysis(self, session_id: str) -> Dict[str, Any]:
+    def _queue_typing_write(self, session_id: str, event: Dict[str, Any]) -> None:
+        """
+        Redis 타이핑 버퍼 기록 예약 (write-behind)
+
+        이벤트마다 RPUSH 하지 않고 TYPING_FLUSH_DELAY 동안(최대 TYPING_FLUSH_MAX_EVENTS개)
+        모았다가 한 번에 기록한다.
+        """
+        pending = self._pending_writes.setdefault(session_id, [])
+        pending.append(event)
+
+        if len(pending) >= TYPING_FLUSH_MAX_EVENTS:
+            self._start_typing_flush(session_id)
+        elif session_id not in self._flush_handles:
+            self._flush_handles[session_id] = asyncio.get_running_loop().call_later(
+                TYPING_FLUSH_DELAY, self._start_typing_flush, session_id
+            )
+
+    def _start_typing_flush(self, session_id: str) -> None:
+        """대기 중인 이벤트 기록을 백그라운드 태스크로 시작"""
+        task = asyncio.ensure_future(self.flush_typing_writes(session_id))
+        self._write_tasks.add(task)
+        task.add_done_callback(self._write_tasks.discard)
+
+    async def flush_typing_writes(self, session_id: str) -> bool:
+        """대기 중인 타이핑 이벤트를 Redis 버퍼에 즉시 기록"""
+        handle = self._flush_handles.pop(session_id, None)
+        if handle is not None:
+            handle.cancel()
+
+        events = self._pending_writes.pop(session_id, None)
+        if not events:
+            return True
+
+        try:
+            return await self.cache_service.push_typing_batch(session_id, events)
+        except Exception as e:
+            logger.error("타이핑 버퍼 기록 실패: session_id=%s, error=%s", session_id, str(e))
+            return False
+
+    def schedule_emotion_analysis(self, session_id: str, websocket_manager) -> bool:
+        """
+        감정 분석을 백그라운드 태스크로 예약
+
+        같은 세션의 분석이 이미 진행 중이면 새로 예약하지 않는다 (요청 병합).
+
+        Returns:
+            새 분석 태스크 예약 여부
+        """
+        task = self._analysis_tasks.get(session_id)
+        if task is not None and not task.done():
+            return False
+
+        task = asyncio.create_task(self._run_emotion_pipeline(session_id, websocket_manager))
+        self._analysis_tasks[session_id] = task
+
+        def _forget(finished: asyncio.Task) -> None:
+            if self._analysis_tasks.get(session_id) is finished:
+                del self._analysis_tasks[session_id]
+
+        task.add_done_callback(_forget)
+        return True
+
+    async def _run_emotion_pipeline(self, session_id: str, websocket_manager) -> None:
+        """감정 분석 실행 후 결과를 WebSocket으로 전송"""
+        try:
+            result = await self.trigger_emotion_analysis(session_id)
+            if result.success:
+                await websocket_manager.send_personal_message(session_id, {
+                    'type': 'emotion_analysis_result',
+                    'data': result.data
+                })
+        except Exception as e:
+            logger.error("백그라운드 감정 분석 실패: session_id=%s, error=%s", session_id, str(e))
+
+    async def trigger_emotion_analysis(self, session_id: str) -> ProcessingResult:
         """
         감정 분석 트리거
         """
         try:
-            # 타이핑 버퍼에서 데이터 조회
-            typing_buffer = await self.cache.get_typing_buffer(
-                session_id,
-                limit=self.BUFFER_SIZE_LIMIT
-            )
+            # 이 워커가 처리 중인 세션은 메모리 버퍼를 그대로 사용 (Redis 왕복/역직렬화 생략)
+            local_buffer = self.session_buffers.get(session_id)
+            if local_buffer:
+                typing_buffer = list(local_buffer)
+            else:
+                # 다른 워커의 세션은 Redis 타이핑 버퍼에서 같은 크기만큼 조회
+                typing_buffer = await self.cache_service.get_typing_buffer(
+                    session_id,
+                    limit=SESSION_BUFFER_SIZE
+                )
 
-            if len(typing_buffer) < self.MIN_EVENTS_FOR_ANALYSIS:
+            if len(typing_buffer) < MIN_EVENTS_FOR_ANALYSIS:
                 return ProcessingResult(
                     success=False,
                     error="감정 분석을 위한 충분한 데이터가 없습니다"
@@ -132,23 +463,28 @@ class RealtimeProcessor:
                     error="감정 매핑 실패"
                 )
 
-            # 감정 데이터 캐싱
+            # 감정 데이터 캐싱과 감정 프로필 저장은 서로 독립적이므로 동시에 수행
             emotion_snapshot = emotion_result['emotion']
-            cache_success = await self.cache.cache_emotion_analysis(
-                session_id,
-                emotion_snapshot.__dict__
+            emotion_payload = emotion_snapshot.to_payload()
+            cache_success, _ = await asyncio.gather(
+                self.cache_service.cache_emotion_analysis(session_id, {
+                    **emotion_snapshot.to_cache_payload(),
+                    # 캐시 시각: 비교용 정수(ns)와 표시용 ISO 문자열을 함께 저장
+                    'cached_at': datetime.utcnow().isoformat(),
+                    'cached_at_ns': time.time_ns()
+                }),
+                self._save_emotion_profile(
+                    session_id, emotion_snapshot, self._typing_scores(typing_buffer)
+                )
             )
 
             if cache_success:
                 logger.info("감정 분석 완료 및 캐시됨: session_id=%s", session_id)
 
-            # 데이터베이스에 감정 프로필 저장
-            await self._save_emotion_profile(session_id, emotion_snapshot)
-
             return ProcessingResult(
                 success=True,
                 data={
-                    'emotion': emotion_snapshot.__dict__,
+                    'emotion': emotion_payload,
                     'patterns': pattern_result['patterns'],
                     'analysis_metadata': {
                         'events_analyzed': len(typing_buffer),
@@ -169,9 +505,11 @@ class RealtimeProcessor:
         """
         음악 생성 트리거
         """
+        progress = _ProgressBuffer(websocket_manager, session_id)
+
         try:
             # 캐시된 감정 데이터 조회
-            emotion_data = await self.cache.get_cached_emotion(session_id)
+            emotion_data = await self.cache_service.get_cached_emotion(session_id)
             if not emotion_data:
                 # 감정 분석이 없으면 먼저 실행
                 emotion_result = await self.trigger_emotion_analysis(session_id)
@@ -183,46 +521,32 @@ class RealtimeProcessor:
                 emotion_data = emotion_result.data['emotion']
 
             # 음악 생성 시작 알림
-            if websocket_manager:
-                await websocket_manager.send_personal_message(session_id, {
-                    'type': 'music_generation_progress',
-                    'stage': 'analyzing',
-                    'progress': 10,
-                    'message': '감정 데이터를 분석하고 있습니다...'
-                })
+            progress.push('analyzing', 10, '감정 데이터를 분석하고 있습니다...')
 
             # AI 음악 생성 요청
             music_prompt = await self._create_music_prompt(emotion_data)
 
-            if websocket_manager:
-                await websocket_manager.send_personal_message(session_id, {
-                    'type': 'music_generation_progress',
-                    'stage': 'generating',
-                    'progress': 50,
-                    'message': 'AI가 음악을 생성하고 있습니다...'
-                })
+            progress.push('generating', 50, 'AI가 음악을 생성하고 있습니다...')
 
             generation_result = await self._generate_music_with_ai(
-                session_id, music_prompt, websocket_manager
+                session_id, music_prompt, progress
             )
 
             if generation_result['success']:
-                if websocket_manager:
-                    await websocket_manager.send_personal_message(session_id, {
-                        'type': 'music_generation_complete',
-                        'data': generation_result['data']
-                    })
+                await progress.finish({
+                    'type': 'music_generation_complete',
+                    'data': generation_result['data']
+                })
 
                 return ProcessingResult(
                     success=True,
                     data=generation_result['data']
                 )
             else:
-                if websocket_manager:
-                    await websocket_manager.send_personal_message(session_id, {
-                        'type': 'music_generation_failed',
-                        'error': generation_result.get('error', '음악 생성 실패')
-                    })
+                await progress.finish({
+                    'type': 'music_generation_failed',
+                    'error': generation_result.get('error', '음악 생성 실패')
+                })
 
                 return ProcessingResult(
                     success=False,
@@ -232,11 +556,10 @@ class RealtimeProcessor:
         except Exception as e:
             logger.error("음악 생성 실패: session_id=%s, error=%s", session_id, str(e))
 
-            if websocket_manager:
-                await websocket_manager.send_personal_message(session_id, {
-                    'type': 'music_generation_failed',
-                    'error': '음악 생성 중 오류가 발생했습니다'
-                })
+            await progress.finish({
+                'type': 'music_generation_failed',
+                'error': '음악 생성 중 오류가 발생했습니다'
+            })
 
             return ProcessingResult(
                 success=False,
@@ -255,45 +578,112 @@ class RealtimeProcessor:
                 timestamp=float(event_data.get('timestamp', 0)),
                 interval=float(event_data.get('interval', 0)),
                 key_code=event_data.get('key_code'),
-                is_special=event_data.get('is_special', False),
+                is_special=bool(event_data.get('is_special', False)),
                 session_time=float(event_data.get('session_time', 0))
             )
         except (ValueError, TypeError) as e:
             logger.warning("타이핑 이벤트 파싱 실패: %s", str(e))
             return None
 
-    async def _analyze_realtime_patterns(self, session_id: str, buffer: List[Dict[str, Any]]) -> List[str]:
-        """실시간 패턴 분석"""
+    @staticmethod
+    def _intervals_array(buffer: RealtimeBuffer, last: Optional[int] = None) -> np.ndarray:
+        """
+        버퍼의 (최근 last개) 키 입력 간격 배열
+
+        링 버퍼는 저장된 배열을 그대로 쓰고, 딕셔너리 목록은 한 번에 NumPy 배열로 추출
+        """
+        if isinstance(buffer, _SessionRing):
+            return buffer.recent(buffer.intervals, last)
+
+        # deque는 슬라이싱 대신 islice 사용
+        events = buffer if last is None else list(islice(buffer, max(len(buffer) - last, 0), None))
+        return np.fromiter(
+            (float(event.get('interval', 0)) for event in events),
+            dtype=np.float64,
+            count=len(events)
+        )
+
+    @staticmethod
+    def _interval_stats(intervals: np.ndarray) -> Tuple[float, float, float]:
+        """
+        간격 배열의 (합계, 평균, 표준편차)
+
+        합계 한 번으로 평균을 구하고, 평균을 뺀 값의 내적으로 분산을 구해
+        np.mean/np.std가 배열을 여러 번 다시 읽는 것을 피한다.
+        """
+        count = intervals.size
+        total = float(intervals.sum())
+        mean = total / count
+        if count < 2:
+            return total, mean, 0.0
+
+        centered = intervals - mean
+        return total, mean, float(np.sqrt(np.dot(centered, centered) / count))
+
+    @classmethod
+    def _typing_scores(cls, buffer: RealtimeBuffer) -> Tuple[float, float, float]:
+        """
+        감정 프로필 저장용 (속도, 리듬 일관성, 일시정지 강도) 점수 (0.0~1.0, 0.01 단위)
+
+        실시간 패턴과 같은 경계를 사용: 평균 간격 100ms 이하면 속도 1, 500ms 이상이면 0,
+        표준편차 50ms 이하면 일관성 1, 200ms 이상이면 0, 일시정지는 1초 이상 간격의 비율
+        """
+        intervals = cls._intervals_array(buffer)
+        if intervals.size == 0:
+            return 0.0, 0.0, 0.0
+
+        _, average_interval, rhythm_variance = cls._interval_stats(intervals)
+        tempo_score = np.clip((500.0 - average_interval) / 400.0, 0.0, 1.0)
+        rhythm_consistency = np.clip((200.0 - rhythm_variance) / 150.0, 0.0, 1.0)
+        pause_intensity = np.count_nonzero(intervals > 1000) / intervals.size
+        return (
+            round(float(tempo_score), 2),
+            round(float(rhythm_consistency), 2),
+            round(float(pause_intensity), 2)
+        )
+
+    @staticmethod
+    def _char_mask(buffer: RealtimeBuffer) -> np.ndarray:
+        """버퍼의 문자 입력 여부 배열 (특수키/빈 입력 제외)"""
+        if isinstance(buffer, _SessionRing):
+            return buffer.recent(buffer.is_char)
+
+        return np.fromiter(
+            (
+                bool(event.get('keystroke', '')) and not event.get('is_special', False)
+                for event in buffer
+            ),
+            dtype=np.bool_,
+            count=len(buffer)
+        )
+
+    async def _analyze_realtime_patterns(self, session_id: str,
+                                         buffer: Optional[RealtimeBuffer] = None) -> List[str]:
+        """실시간 패턴 분석 (buffer가 없으면 세션 링 버퍼 사용)"""
         try:
+            if buffer is None:
+                buffer = self.session_rings.get(session_id, ())
+
             if len(buffer) < 10:  # 최소 10개 이벤트 필요
                 return []
 
-            # 최근 데이터만 사용 (마지막 50개 이벤트)
-            recent_buffer = buffer[-50:] if len(buffer) > 50 else buffer
-
             patterns = []
 
-            # 타이핑 속도 패턴
-            intervals = [float(event.get('interval', 0)) for event in recent_buffer]
-            if intervals:
-                avg_interval = np.mean(intervals)
-                if avg_interval < 100:  # 100ms 미만
-                    patterns.append('fast_typing')
-                elif avg_interval > 500:  # 500ms 초과
-                    patterns.append('slow_typing')
-                else:
-                    patterns.append('normal_typing')
+            # 최근 50개 이벤트의 간격 배열 한 번 추출 후 평균/표준편차/긴 일시정지 수를 모두 계산
+            intervals = self._intervals_array(buffer, 50)
+
+            # 타이핑 속도 패턴 (100ms 미만 / 500ms 초과)
+            _, avg_interval, rhythm_variance = self._interval_stats(intervals)
+            patterns.append(_SPEED_LABELS[int(np.searchsorted(_SPEED_BOUNDS, avg_interval, side='right'))])
 
-                # 리듬 일관성
-                rhythm_variance = np.std(intervals) if len(intervals) > 1 else 0
-                if rhythm_variance < 50:
-                    patterns.append('consistent_rhythm')
-                elif rhythm_variance > 200:
-                    patterns.append('irregular_rhythm')
+            # 리듬 일관성 (표준편차 50 미만 / 200 초과, 그 사이는 라벨 없음)
+            rhythm_label = _RHYTHM_LABELS[int(np.searchsorted(_RHYTHM_BOUNDS, rhythm_variance, side='right'))]
+            if rhythm_label:
+                patterns.append(rhythm_label)
 
             # 일시정지 패턴 감지
-            long_pauses = [interval for interval in intervals if interval > 1000]  # 1초 이상
-            if len(long_pauses) > len(intervals) * 0.2:  # 20% 이상이 긴 일시정지
+            long_pauses = int((intervals > 1000).sum())  # 1초 이상
+            if long_pauses > intervals.size * 0.2:  # 20% 이상이 긴 일시정지
                 patterns.append('frequent_pauses')
 
             return patterns
@@ -302,25 +692,19 @@ class RealtimeProcessor:
             logger.error("실시간 패턴 분석 실패: session_id=%s, error=%s", session_id, str(e))
             return []
 
-    async def _calculate_realtime_metrics(self, buffer: List[Dict[str, Any]]) -> Dict[str, float]:
+    async def _calculate_realtime_metrics(self, buffer: RealtimeBuffer) -> Dict[str, float]:
         """실시간 메트릭스 계산"""
         try:
             if not buffer:
                 return {}
 
-            # 타이핑 속도 계산 (WPM)
-            total_time = 0
-            total_chars = 0
-            intervals = []
+            # 간격 배열과 문자 입력 여부 배열을 한 번씩 추출
+            intervals = self._intervals_array(buffer)
+            is_char = self._char_mask(buffer)
 
-            for event in buffer:
-                interval = float(event.get('interval', 0))
-                keystroke = event.get('keystroke', '')
-
-                intervals.append(interval)
-                total_time += interval
-                if keystroke and not event.get('is_special', False):
-                    total_chars += 1
+            # 합계/평균/표준편차를 한 번에 계산
+            total_time, average_interval, rhythm_variance = self._interval_stats(intervals)
+            total_chars = int(np.count_nonzero(is_char))
 
             # WPM 계산 (5글자 = 1단어 가정)
             wpm = (total_chars / 5) / (total_time / 60000) if total_time > 0 else 0
@@ -330,8 +714,8 @@ class RealtimeProcessor:
                 'wpm': round(wpm, 2),
                 'total_keystrokes': len(buffer),
                 'session_duration': total_time / 1000,  # 초 단위
-                'average_interval': np.mean(intervals) if intervals else 0,
-                'rhythm_variance': np.std(intervals) if len(intervals) > 1 else 0
+                'average_interval': average_interval,
+                'rhythm_variance': rhythm_variance
             }
 
             return metrics
@@ -354,14 +738,19 @@ class RealtimeProcessor:
                 return True
 
             # 시간 기반 트리거 (마지막 분석으로부터 일정 시간 경과)
-            last_emotion = await self.cache.get_cached_emotion(session_id)
+            last_emotion = await self.cache_service.get_cached_emotion(session_id)
             if last_emotion:
-                # 캐시된 감정 데이터가 10분 이상 오래된 경우
-                cached_at = last_emotion.get('cached_at')
-                if cached_at:
-                    cache_time = datetime.fromisoformat(cached_at)
-                    if datetime.utcnow() - cache_time > timedelta(minutes=10):
+                # 캐시된 감정 데이터가 10분 이상 오래된 경우 (정수 ns 비교, 이전 캐시는 ISO 문자열로 확인)
+                cached_at_ns = last_emotion.get('cached_at_ns')
+                if cached_at_ns is not None:
+                    if time.time_ns() - cached_at_ns > EMOTION_REFRESH_INTERVAL_NS:
                         return True
+                else:
+                    cached_at = last_emotion.get('cached_at')
+                    if cached_at:
+                        cache_time = datetime.fromisoformat(cached_at)
+                        if datetime.utcnow() - cache_time > timedelta(minutes=10):
+                            return True
 
             return False
 
@@ -373,7 +762,7 @@ class RealtimeProcessor:
         """음악 생성 트리거 조건 확인"""
         try:
             # 감정 데이터 존재 여부 확인
-            emotion_data = await self.cache.get_cached_emotion(session_id)
+            emotion_data = await self.cache_service.get_cached_emotion(session_id)
             if not emotion_data:
                 return False
 
@@ -386,9 +775,25 @@ class RealtimeProcessor:
             logger.error("음악 생성 트리거 조건 확인 실패: session_id=%s, error=%s", session_id, str(e))
             return False
 
+    @classmethod
+    def _pattern_fingerprint(cls, typing_buffer: RealtimeBuffer) -> int:
+        """최근 이벤트 간격을 50ms 단위로 양자화한 배열의 해시 (패턴 분석 캐시 키)"""
+        intervals = cls._intervals_array(typing_buffer, PATTERN_FINGERPRINT_EVENTS)
+        buckets = np.clip(intervals // PATTERN_FINGERPRINT_BUCKET_MS, -32768, 32767)
+        return hash(buckets.astype(np.int16).tobytes())
+
     async def _analyze_typing_patterns(self, typing_buffer: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """타이핑 패턴 심화 분석"""
+        """타이핑 패턴 심화 분석 (간격 지문이 같으면 이전 분석 결과 재사용)"""
         try:
+            fingerprint = self._pattern_fingerprint(typing_buffer)
+            cached_patterns = self._pattern_result_cache.get(fingerprint)
+            if cached_patterns is not None:
+                self._pattern_result_cache.move_to_end(fingerprint)
+                return {
+                    'success': True,
+                    'patterns': cached_patterns
+                }
+
             # PatternAnalyzer를 사용한 패턴 분석
             analysis_result = await self.pattern_analyzer.analyze_typing_patterns({
                 'events': typing_buffer,
@@ -397,9 +802,15 @@ class RealtimeProcessor:
             })
 
             if analysis_result.get('success', False):
+                patterns = analysis_result.get('patterns', {})
+
+                self._pattern_result_cache[fingerprint] = patterns
+                if len(self._pattern_result_cache) > PATTERN_RESULT_CACHE_SIZE:
+                    self._pattern_result_cache.popitem(last=False)
+
                 return {
                     'success': True,
-                    'patterns': analysis_result.get('patterns', {})
+                    'patterns': patterns
                 }
             else:
                 return {
@@ -450,36 +861,87 @@ class RealtimeProcessor:
                 'error': f'감정 매핑 중 오류: {str(e)}'
             }
 
-    async def _save_emotion_profile(self, session_id: str, emotion: EmotionSnapshot) -> None:
-        """감정 프로필을 데이터베이스에 저장"""
-        try:
-            # UserSession 조회
-            result = await self.db.execute(
-                select(UserSession).where(UserSession.session_id == session_id)
-            )
-            user_session = result.scalar_one_or_none()
-
-            if user_session:
-                # 새 EmotionProfile 생성
-                emotion_profile = EmotionProfile(
-                    session_id=user_session.id,
-                    energy_level=emotion.energy,
-                    valence_score=emotion.valence,
-                    tension_level=emotion.tension,
-                    focus_level=emotion.focus,
-                    dominant_emotion=emotion.dominant_emotion,
-                    confidence_score=emotion.confidence,
-                    analysis_timestamp=emotion.timestamp
-                )
+    async def _get_user_session_pk(self, session_id: str) -> Optional[str]:
+        """세션 ID의 UserSession PK 조회 (LRU 캐시 우선, 없는 세션은 캐시하지 않음)"""
+        pk = self._session_pk_cache.get(session_id)
+        if pk is not None:
+            self._session_pk_cache.move_to_end(session_id)
+            return pk
+
+        result = await self.db_session.execute(
+            select(UserSession.id).where(UserSession.id == session_id)
+        )
+        pk = result.scalar_one_or_none()
+
+        if pk is not None:
+            self._session_pk_cache[session_id] = pk
+            if len(self._session_pk_cache) > SESSION_PK_CACHE_SIZE:
+                self._session_pk_cache.popitem(last=False)
+
+        return pk
+
+    async def _get_latest_pattern_id(self, user_session_pk: str) -> Optional[str]:
+        """세션의 가장 최근 타이핑 패턴 ID 조회 (session_id, created_at 인덱스 사용)"""
+        result = await self.db_session.execute(
+            select(TypingPattern.id)
+            .where(TypingPattern.session_id == user_session_pk)
+            .order_by(TypingPattern.created_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def _save_emotion_profile(self, session_id: str, emotion: EmotionSnapshot,
+                                    scores: Tuple[float, float, float]) -> None:
+        """
+        감정 프로필을 데이터베이스에 저장
 
-                self.db.add(emotion_profile)
-                await self.db.commit()
+        감정 프로필은 타이핑 패턴과 1:1이므로 세션의 가장 최근 패턴 프로필을 갱신한다
+        (저장된 타이핑 패턴이 없으면 저장하지 않음).
+        """
+        async with self._db_lock:
+            try:
+                # UserSession PK 조회
+                user_session_pk = await self._get_user_session_pk(session_id)
+
+                if user_session_pk:
+                    pattern_id = await self._get_latest_pattern_id(user_session_pk)
+                    if not pattern_id:
+                        logger.debug("감정 프로필 저장 생략 (타이핑 패턴 없음): session_id=%s", session_id)
+                        return
+
+                    tempo_score, rhythm_consistency, pause_intensity = scores
+                    values = {
+                        'tempo_score': tempo_score,
+                        'rhythm_consistency': rhythm_consistency,
+                        'pause_intensity': pause_intensity,
+                        'emotion_vector': {
+                            'energy': emotion.energy,
+                            'valence': emotion.valence,
+                            'tension': emotion.tension,
+                            'focus': emotion.focus
+                        },
+                        'confidence_score': round(min(max(emotion.confidence, 0.0), 1.0), 2)
+                    }
 
-                logger.info("감정 프로필 저장됨: session_id=%s", session_id)
+                    # 조회 없이 쓰기만 하므로 ORM 작업 단위(flush) 대신 Core upsert 실행
+                    # (ON CONFLICT 경로에서는 onupdate가 적용되지 않으므로 updated_at을 직접 갱신)
+                    stmt = (
+                        pg_insert(EmotionProfile)
+                        .values(pattern_id=pattern_id, **values)
+                        .on_conflict_do_update(
+                            index_elements=[EmotionProfile.pattern_id],
+                            set_={**values, 'updated_at': func.now()}
+                        )
+                    )
 
-        except Exception as e:
-            logger.error("감정 프로필 저장 실패: session_id=%s, error=%s", session_id, str(e))
-            await self.db.rollback()
+                    await self.db_session.execute(stmt)
+                    await self.db_session.commit()
+
+                    logger.info("감정 프로필 저장됨: session_id=%s", session_id)
+
+            except Exception as e:
+                logger.error("감정 프로필 저장 실패: session_id=%s, error=%s", session_id, str(e))
+                await self.db_session.rollback()
 
     async def _create_music_prompt(self, emotion_data: Dict[str, Any]) -> str:
         """감정 데이터를 기반으로 음악 프롬프트 생성"""
@@ -490,62 +952,33 @@ class RealtimeProcessor:
             focus = emotion_data.get('focus', 0.5)
             dominant_emotion = emotion_data.get('dominant_emotion', 'neutral')
 
-            # 감정 기반 음악 스타일 결정
-            if energy > 0.7 and valence > 0.3:
-                mood = "energetic and positive"
-                tempo = "fast"
-                genre = "electronic or pop"
-            elif energy < 0.3 and valence < -0.3:
-                mood = "calm and melancholic"
-                tempo = "slow"
-                genre = "ambient or classical"
-            elif tension > 0.7:
-                mood = "tense and dramatic"
-                tempo = "moderate to fast"
-                genre = "cinematic or rock"
-            elif focus > 0.7:
-                mood = "focused and contemplative"
-                tempo = "moderate"
-                genre = "minimal or instrumental"
-            else:
-                mood = "balanced and neutral"
-                tempo = "moderate"
-                genre = "acoustic or indie"
-
-            prompt = f"""
-            Create a {tempo}-tempo {genre} piece with a {mood} atmosphere.
-
-            Musical characteristics:
-            - Energy level: {energy:.1f}/1.0
-            - Emotional valence: {valence:.1f} (negative to positive)
-            - Tension: {tension:.1f}/1.0
-            - Focus: {focus:.1f}/1.0
-            - Dominant emotion: {dominant_emotion}
-
-            Duration: 60-90 seconds
-            Style: Instrumental, suitable for background listening
-            """
-
-            return prompt.strip()
+            # 스타일은 원래 값으로 결정하고, 수치는 0.1 단위로 양자화해 캐시된 프롬프트 사용
+            return _compose_prompt(
+                _select_music_style(energy, valence, tension, focus),
+                round(energy * 10), round(valence * 10),
+                round(tension * 10), round(focus * 10),
+                dominant_emotion
+            )
 
         except Exception as e:
             logger.error("음악 프롬프트 생성 실패: %s", str(e))
             return "Create a moderate-tempo instrumental piece suitable for background listening."
 
-    async def _generate_music_with_ai(self, session_id: str, prompt: str,
-                                    websocket_manager=None) -> Dict[str, Any]:
-        """AI를 사용하여 음악 생성"""
-        try:
-            # 진행 상황 업데이트
-            if websocket_manager:
-                await websocket_manager.send_personal_message(session_id, {
-                    'type': 'music_generation_progress',
-                    'stage': 'processing',
-                    'progress': 75,
-                    'message': 'AI 서버에서 음악을 처리하고 있습니다...'
-                })
+    @classmethod
+    def _get_music_gen_semaphore(cls) -> asyncio.Semaphore:
+        """AI 음악 생성 동시 실행 제한 세마포어 (settings.MAX_CONCURRENT_MUSIC_GENERATIONS)"""
+        if cls._music_gen_semaphore is None:
+            cls._music_gen_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_MUSIC_GENERATIONS)
+        return cls._music_gen_semaphore
 
-            # AIConnector를 사용한 음악 생성
+    async def _request_music(self, session_id: str, prompt: str) -> Dict[str, Any]:
+        """
+        AIConnector 음악 생성 요청 및 결과 임시 캐싱
+
+        동시 요청 수를 세마포어로 제한한다. 세마포어는 요청이 끝날 때까지 유지되므로
+        호출자가 취소되어도 상한을 넘는 요청이 AI 서버로 가지 않는다.
+        """
+        async with self._get_music_gen_semaphore():
             generation_result = await self.ai_connector.generate_music({
                 'prompt': prompt,
                 'session_id': session_id,
@@ -553,16 +986,33 @@ class RealtimeProcessor:
                 'format': 'mp3'
             })
 
+        if generation_result.get('success', False):
+            music_data = generation_result.get('music', {})
+
+            # 임시 음악 데이터 캐싱
+            await self.cache_service.set_temp_music_data(
+                music_data.get('id', session_id),
+                music_data,
+                ttl=1800  # 30분 TTL
+            )
+
+        return generation_result
+
+    async def _generate_music_with_ai(self, session_id: str, prompt: str,
+                                    progress: Optional[_ProgressBuffer] = None) -> Dict[str, Any]:
+        """AI를 사용하여 음악 생성"""
+        try:
+            # 진행 상황 업데이트 (AI 호출 전에 쌓인 단계를 한 번에 전송)
+            if progress:
+                progress.push('processing', 75, 'AI 서버에서 음악을 처리하고 있습니다...')
+                await progress.flush()
+
+            # 클라이언트 연결이 끊겨도 진행 중인 AI 요청과 결과 캐싱은 끝까지 수행
+            generation_result = await asyncio.shield(self._request_music(session_id, prompt))
+
             if generation_result.get('success', False):
                 music_data = generation_result.get('music', {})
 
-                # 임시 음악 데이터 캐싱
-                await self.cache.set_temp_music_data(
-                    music_data.get('id', session_id),
-                    music_data,
-                    ttl=1800  # 30분 TTL
-                )
-
                 return {
                     'success': True,
                     'data': {
@@ -592,13 +1042,28 @@ class RealtimeProcessor:
 
     async def cleanup_session_data(self, session_id: str) -> bool:
         """세션 데이터 정리"""
+        # 진행 중인 감정 분석 취소 (연결이 끝난 뒤 DB 세션을 쓰지 않도록 종료까지 대기)
+        task = self._analysis_tasks.pop(session_id, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        # 메모리 내 세션 상태 정리 (Redis 정리 실패와 무관하게 수행)
+        self.session_buffers.pop(session_id, None)
+        self.session_rings.pop(session_id, None)
+        self._last_metrics.pop(session_id, None)
+        self._session_pk_cache.pop(session_id, None)
+
+        # 기록 대기 중인 이벤트는 버퍼와 함께 삭제되므로 버림
+        handle = self._flush_handles.pop(session_id, None)
+        if handle is not None:
+            handle.cancel()
+        self._pending_writes.pop(session_id, None)
+
         try:
             # Redis 캐시 정리
-            await self.cache.clear_typing_buffer(session_id)
-            await self.cache.delete_session(session_id)
-
-            # 처리 상태 정리
-            self.processing_sessions.pop(session_id, None)
+            await self.cache_service.clear_typing_buffer(session_id)
+            await self.cache_service.delete_session(session_id)
 
             logger.info("세션 데이터 정리 완료: session_id=%s", session_id)
             return True
@@ -608,20 +1073,30 @@ class RealtimeProcessor:
             return False
 
     async def get_session_statistics(self, session_id: str) -> Dict[str, Any]:
-        """세션 통계 조회"""
-        try:
-            # 타이핑 버퍼 통계
-            typing_buffer = await self.cache.get_typing_buffer(session_id)
-
-            # 캐시된 감정 데이터
-            emotion_data = await self.cache.get_cached_emotion(session_id)
+        """
+        세션 통계 조회
 
-            # 통계 계산
-            metrics = await self._calculate_realtime_metrics(typing_buffer)
+        이 워커가 처리 중인 세션은 링 버퍼와 마지막 메트릭을 재사용하고(Redis 버퍼 조회 생략),
+        그 외 세션은 Redis 타이핑 버퍼와 감정 캐시를 파이프라인 한 번으로 조회해 계산한다.
+        """
+        try:
+            ring = self.session_rings.get(session_id)
+            if ring is not None:
+                emotion_data = await self.cache_service.get_cached_emotion(session_id)
+                typing_events = len(ring)
+
+                metrics = self._last_metrics.get(session_id)
+                if metrics is None:
+                    metrics = await self._calculate_realtime_metrics(ring)
+                    self._last_metrics[session_id] = metrics
+            else:
+                typing_buffer, emotion_data = await self.cache_service.get_typing_buffer_with_emotion(session_id)
+                typing_events = len(typing_buffer)
+                metrics = await self._calculate_realtime_metrics(typing_buffer)
 
             return {
                 'session_id': session_id,
-                'typing_events': len(typing_buffer),
+                'typing_events': typing_events,
                 'metrics': metrics,
                 'emotion_data': emotion_data,
                 'last_analysis': emotion_data.get('cached_at') if emotion_data else None,
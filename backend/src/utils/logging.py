@@ -425,6 +425,11 @@ def setup_application_logging():
     logging_config.setup_logging()
 
 
+def get_logger(name: str) -> logging.Logger:
+    """모듈 로거 반환"""
+    return logging.getLogger(name)
+
+
 def get_performance_logger() -> PerformanceLogger:
     """성능 로거 인스턴스 반환"""
     return performance_logger
@@ -0,0 +1,121 @@
+"""
+CacheService 단위 테스트
+
+Redis 클라이언트를 목 객체로 대체하여 캐시 값 직렬화/역직렬화를 검증
+"""
+from datetime import datetime
+
+import numpy as np
+import orjson
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.cache.redis_client import CacheService
+
+
+@pytest.fixture
+def redis_mock():
+    """setex로 저장한 값을 get으로 돌려주는 Redis 목 객체"""
+    store = {}
+    redis = MagicMock()
+
+    async def setex(key, ttl, value):
+        store[key] = value
+        return True
+
+    async def get(key):
+        return store.get(key)
+
+    redis.setex = AsyncMock(side_effect=setex)
+    redis.get = AsyncMock(side_effect=get)
+    return redis
+
+
+class TestCacheSerialization:
+    """캐시 직렬화 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_emotion_roundtrip(self, redis_mock):
+        """NumPy 값과 datetime을 포함한 감정 데이터 저장/조회"""
+        cache = CacheService(redis_mock)
+        emotion = {
+            "energy": np.float64(0.75),
+            "timestamp": datetime(2024, 1, 1, 12, 0),
+            "label": "집중",
+        }
+
+        assert await cache.cache_emotion_analysis("s1", emotion) is True
+        cached = await cache.get_cached_emotion("s1")
+
+        assert cached["energy"] == 0.75
+        assert cached["timestamp"] == "2024-01-01T12:00:00"
+        assert cached["label"] == "집중"
+
+    @pytest.mark.asyncio
+    async def test_non_string_keys(self, redis_mock):
+        """문자열이 아닌 키도 json.dumps처럼 문자열 키로 저장"""
+        cache = CacheService(redis_mock)
+
+        assert await cache.set_session("s1", {1: "a"}) is True
+        assert await cache.get_session("s1") == {"1": "a"}
+
+
+class TestTypingBuffer:
+    """타이핑 버퍼 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_push_batch_single_rpush(self):
+        """여러 이벤트를 RPUSH 한 번으로 파이프라인에 담아 기록"""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[3, True, True])
+        redis = MagicMock()
+        redis.pipeline = MagicMock(return_value=pipe)
+        cache = CacheService(redis)
+
+        assert await cache.push_typing_batch("s1", [{"interval": i} for i in range(3)]) is True
+
+        pipe.rpush.assert_called_once()
+        key, *values = pipe.rpush.call_args.args
+        assert key == "vibemusic:typing:s1"
+        assert [orjson.loads(value)["interval"] for value in values] == [0, 1, 2]
+        pipe.expire.assert_called_once_with(key, CacheService.TYPING_TTL)
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_push_empty_batch(self):
+        """빈 배치는 Redis를 호출하지 않음"""
+        redis = MagicMock()
+        cache = CacheService(redis)
+
+        assert await cache.push_typing_batch("s1", []) is True
+        redis.pipeline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_buffer_with_emotion_single_pipeline(self):
+        """타이핑 버퍼와 감정 캐시를 파이프라인 한 번으로 조회"""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[
+            [orjson.dumps({"interval": 100}), b"broken", orjson.dumps({"interval": 200})],
+            orjson.dumps({"emotion_data": {"energy": 0.5}, "cached_at": "2024-01-01T00:00:00"})
+        ])
+        redis = MagicMock()
+        redis.pipeline = MagicMock(return_value=pipe)
+        cache = CacheService(redis)
+
+        buffer, emotion = await cache.get_typing_buffer_with_emotion("s1", limit=50)
+
+        assert buffer == [{"interval": 100}, {"interval": 200}]
+        assert emotion == {"energy": 0.5}
+        pipe.lrange.assert_called_once_with("vibemusic:typing:s1", -50, -1)
+        pipe.get.assert_called_once_with("vibemusic:emotion:s1")
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_buffer_with_emotion_missing_emotion(self):
+        """감정 캐시가 없으면 None"""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[[], None])
+        redis = MagicMock()
+        redis.pipeline = MagicMock(return_value=pipe)
+
+        assert await CacheService(redis).get_typing_buffer_with_emotion("s1") == ([], None)
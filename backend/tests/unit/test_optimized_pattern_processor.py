@@ -12,7 +12,8 @@ from src.services.optimized_pattern_processor import (
     OptimizedPatternProcessor,
     TypingEvent,
     ProcessingMetrics,
-    EventBuffer
+    EventBuffer,
+    IntervalStats
 )
 
 
@@ -24,7 +25,7 @@ class TestEventBuffer:
         buffer = EventBuffer(max_size=5)
         event = TypingEvent(
             key='a',
-            timestamp=time.time() * 1000,
+            timestamp=float(int(time.time() * 1000)),
             event_type='keydown',
             session_id='test-session'
         )
@@ -41,7 +42,7 @@ class TestEventBuffer:
         for i in range(3):
             event = TypingEvent(
                 key=str(i),
-                timestamp=time.time() * 1000,
+                timestamp=float(int(time.time() * 1000)),
                 event_type='keydown',
                 session_id='test-session'
             )
@@ -52,7 +53,7 @@ class TestEventBuffer:
         # 4번째 이벤트 추가 - 첫 번째가 제거되어야 함
         event4 = TypingEvent(
             key='4',
-            timestamp=time.time() * 1000,
+            timestamp=float(int(time.time() * 1000)),
             event_type='keydown',
             session_id='test-session'
         )
@@ -65,7 +66,7 @@ class TestEventBuffer:
     def test_get_recent_events(self):
         """최근 이벤트 조회 테스트"""
         buffer = EventBuffer(max_size=10)
-        now = time.time() * 1000
+        now = float(int(time.time() * 1000))
 
         # 다양한 시간대의 이벤트 추가
         old_event = TypingEvent(
@@ -94,7 +95,7 @@ class TestEventBuffer:
     def test_clear_old_events(self):
         """오래된 이벤트 정리 테스트"""
         buffer = EventBuffer(max_size=10)
-        now = time.time() * 1000
+        now = float(int(time.time() * 1000))
 
         # 오래된 이벤트들 추가
         for i in range(3):
@@ -122,6 +123,151 @@ class TestEventBuffer:
         assert len(buffer.events) == 1
         assert buffer.events[0] == recent_event
 
+    def test_interval_stats_match_direct_calculation(self):
+        """누적값 기반 윈도우 통계가 직접 계산 결과와 같은지 테스트"""
+        buffer = EventBuffer(max_size=8)
+        base_time = 1_000_000.0
+        offsets = [0, 120, 300, 950, 1010, 1800, 1900, 2100, 2150, 2900]
+
+        for i, offset in enumerate(offsets):
+            buffer.add_event(TypingEvent(
+                key='a',
+                timestamp=base_time + offset,
+                event_type='keyup' if i % 4 == 3 else 'keydown',
+                session_id='test-session'
+            ))
+
+        # 최대 크기 초과로 앞의 이벤트가 제거된 상태에서도 일치해야 함
+        assert len(buffer.events) == 8
+
+        for window in range(1, 9):
+            expected = IntervalStats.from_events(list(buffer.events)[-window:])
+            actual = buffer.get_interval_stats(window)
+
+            assert actual.event_count == expected.event_count
+            assert actual.keydown_count == expected.keydown_count
+            assert actual.pause_count == expected.pause_count
+            assert actual.interval_sum == pytest.approx(expected.interval_sum)
+            assert actual.variance == pytest.approx(expected.variance)
+            assert actual.first_keydown_ts == expected.first_keydown_ts
+            assert actual.last_keydown_ts == expected.last_keydown_ts
+
+    def test_ring_buffer_wraparound(self):
+        """링 버퍼가 여러 번 순환해도 순서와 윈도우 조회가 유지되는지 테스트"""
+        buffer = EventBuffer(max_size=4)
+        base_time = 1_000_000.0
+
+        for i in range(25):
+            buffer.add_event(TypingEvent(
+                key=str(i),
+                timestamp=base_time + i * 100,
+                event_type='keydown',
+                session_id='test-session'
+            ))
+            now_ms = base_time + i * 100
+
+            # 매 이벤트마다 윈도우 조회 (커서가 함께 이동해야 함)
+            recent = buffer.get_recent_events(window_ms=250, now_ms=now_ms)
+            assert [e.key for e in recent] == [str(j) for j in range(max(0, i - 2), i + 1)]
+
+        assert [e.key for e in buffer.events] == ['21', '22', '23', '24']
+        assert len(buffer) == 4
+
+        # 기준 시각이 과거로 가도 올바른 결과 반환
+        recent = buffer.get_recent_events(window_ms=150, now_ms=base_time + 2250)
+        assert [e.key for e in recent] == ['21', '22', '23', '24']
+
+    def test_storage_grows_on_demand(self):
+        """저장소가 작게 시작해 필요할 때만 늘어나는지 테스트"""
+        buffer = EventBuffer(max_size=1000)
+        initial_capacity = len(buffer._timestamps)
+        assert initial_capacity < 1000
+
+        for i in range(1500):
+            buffer.add_event(TypingEvent(
+                key='a',
+                timestamp=1_000_000.0 + i,
+                event_type='keydown',
+                session_id='test-session'
+            ))
+
+        assert len(buffer) == 1000
+        assert initial_capacity < len(buffer._timestamps) <= 2000
+        assert buffer.events[0].timestamp == 1_000_500.0
+
+    def test_field_arrays(self):
+        """필드별 배열 뷰와 직렬화 데이터가 이벤트와 일치하는지 테스트"""
+        buffer = EventBuffer(max_size=10, session_id='test-session')
+        base_time = 1_000_000.0
+        events = [
+            TypingEvent(
+                key=str(i),
+                timestamp=base_time + i * 100,
+                event_type='keydown' if i % 2 == 0 else 'keyup',
+                session_id='test-session',
+                duration=float(i)
+            )
+            for i in range(6)
+        ]
+        for event in events:
+            buffer.add_event(event)
+
+        timestamps, event_types = buffer.get_recent_events_arrays(
+            window_ms=250, now_ms=base_time + 500
+        )
+        assert buffer.epoch_ms == base_time
+        assert timestamps.tolist() == [300, 400, 500]
+        assert event_types.tolist() == [1, 0, 1]
+        assert buffer.keystroke_data(2) == [e.to_dict() for e in events[-2:]]
+        assert buffer.events == events
+
+    def test_out_of_order_timestamp_clamped(self):
+        """직전 이벤트보다 이른 이벤트는 직전 시각으로 보정되어 정렬/간격이 유지되는지 테스트"""
+        buffer = EventBuffer(max_size=10, session_id='test-session')
+        base_time = 1_000_000.0
+
+        buffer.append('a', base_time + 1000.4, 'keydown')
+        buffer.append('b', base_time, 'keydown')  # 늦게 도착한 이벤트
+        buffer.append('c', base_time + 1100, 'keydown')
+
+        assert buffer.epoch_ms == base_time + 1000
+        assert [e.timestamp for e in buffer.events] == [
+            base_time + 1000, base_time + 1000, base_time + 1100
+        ]
+        timestamps, _ = buffer.get_recent_events_arrays(window_ms=50, now_ms=base_time + 1100)
+        assert timestamps.tolist() == [100]
+
+        stats = buffer.get_interval_stats(3)
+        assert stats.interval_count == 2
+        assert stats.interval_sum == 100.0
+
+    def test_timestamp_offsets_rebase(self):
+        """오래된 이벤트 정리 후 범위를 넘는 이벤트가 오면 오프셋이 재계산되는지 테스트"""
+        buffer = EventBuffer(max_size=10, session_id='test-session')
+        base_time = 1_000_000.0
+
+        buffer.append('a', base_time, 'keydown')
+        buffer.append('b', base_time + 1000.4, 'keydown')
+
+        late_time = base_time + 2 ** 31 + 5000
+        buffer.append('c', late_time, 'keydown')
+        assert buffer.clear_old_events(max_age_ms=1000, now_ms=late_time) == 2
+        assert buffer.epoch_ms == late_time
+        assert [e.timestamp for e in buffer.events] == [late_time]
+
+        with pytest.raises(ValueError):
+            buffer.append('d', late_time + 2 ** 32, 'keydown')
+        assert len(buffer) == 1
+
+    def test_rejects_unknown_event_type(self):
+        """지원하지 않는 이벤트 타입은 버퍼를 바꾸지 않고 거부되는지 테스트"""
+        buffer = EventBuffer(max_size=10)
+
+        with pytest.raises(ValueError):
+            buffer.append('a', 1_000_000.0, 'keypress')
+
+        assert len(buffer) == 0
+
 
 class TestTypingEvent:
     """TypingEvent 테스트"""
@@ -199,13 +345,38 @@ class TestOptimizedPatternProcessor:
 
         # 백그라운드 태스크가 실행 중인지 확인
         assert processor.processing_task is not None
-        assert processor.cleanup_task is not None
         assert not processor.shutdown_event.is_set()
 
         await processor.stop()
 
         # 종료 상태 확인
         assert processor.shutdown_event.is_set()
+        assert processor.processing_task.done()
+
+    @pytest.mark.asyncio
+    async def test_event_wakes_processing_loop(self):
+        """이벤트가 들어오면 다음 정리 시각을 기다리지 않고 바로 처리되는지 테스트"""
+        processor = OptimizedPatternProcessor(processing_interval_ms=10, cleanup_interval_s=3600)
+        analyzed = asyncio.Event()
+
+        async def on_pattern(session_id, pattern):
+            analyzed.set()
+
+        processor.register_pattern_callback(on_pattern)
+        await processor.start()
+
+        try:
+            base_time = time.time() * 1000
+            for i in range(12):
+                await processor.process_typing_event(
+                    "wake-session", {'key': 'a', 'timestamp': base_time + i * 100, 'type': 'keydown'}
+                )
+
+            await asyncio.wait_for(analyzed.wait(), timeout=1.0)
+            assert processor.metrics.patterns_analyzed == 1
+        finally:
+            # 작업 대기 중이어도 정리 간격(1시간)을 기다리지 않고 종료되어야 함
+            await asyncio.wait_for(processor.stop(), timeout=1.0)
 
     @pytest.mark.asyncio
     async def test_process_typing_event_basic(self, processor, sample_event_data):
@@ -290,6 +461,10 @@ class TestOptimizedPatternProcessor:
         assert 'statistics' in pattern
         assert 'patterns' in pattern
 
+        # 같은 윈도우 재조회 시 캐시된 결과 반환 (튜플 키)
+        assert await processor.get_session_pattern(session_id) is pattern
+        assert next(iter(processor.analysis_cache))[:2] == (session_id, 15)
+
     @pytest.mark.asyncio
     async def test_insufficient_events_pattern(self, processor, sample_event_data):
         """이벤트 부족 시 패턴 조회 테스트"""
@@ -377,6 +552,38 @@ class TestOptimizedPatternProcessor:
         finally:
             await processor.stop()
 
+    @pytest.mark.asyncio
+    async def test_pattern_callbacks_run_concurrently(self, processor):
+        """콜백이 동시에 호출되고 한 콜백의 오류가 다른 콜백을 막지 않는지 테스트"""
+        started = []
+        release = asyncio.Event()
+
+        async def slow_callback(session_id, pattern):
+            started.append('slow')
+            await release.wait()
+
+        async def failing_callback(session_id, pattern):
+            started.append('failing')
+            raise RuntimeError("subscriber failed")
+
+        async def fast_callback(session_id, pattern):
+            started.append('fast')
+            release.set()
+
+        for callback in (slow_callback, failing_callback, fast_callback):
+            processor.register_pattern_callback(callback)
+
+        events = [
+            TypingEvent(key='a', timestamp=1_000_000.0 + i * 100, event_type='keydown', session_id='s')
+            for i in range(12)
+        ]
+        await asyncio.wait_for(processor._process_session_batch([
+            ('s', [e.to_dict() for e in events], IntervalStats.from_events(events))
+        ]), timeout=1.0)
+
+        assert sorted(started) == ['failing', 'fast', 'slow']
+        assert processor.metrics.patterns_analyzed == 1
+
     def test_analyze_events_sync(self, processor):
         """동기 이벤트 분석 테스트"""
         # 충분한 타이핑 이벤트 생성
@@ -415,13 +622,42 @@ class TestOptimizedPatternProcessor:
         assert 'rhythm_score' in patterns
         assert 'pause_intensity' in patterns
 
+    def test_analyze_events_sync_interval_statistics(self, processor):
+        """keydown 간격 통계 (keyup 제외, 일시정지 집계) 테스트"""
+        base_time = 1_000_000.0
+        offsets = [0, 100, 200, 900, 1000, 1700]
+        events = []
+
+        for offset in offsets:
+            events.append(TypingEvent(
+                key='a',
+                timestamp=base_time + offset,
+                event_type='keydown',
+                session_id='test'
+            ))
+            events.append(TypingEvent(
+                key='a',
+                timestamp=base_time + offset + 50,
+                event_type='keyup',
+                session_id='test'
+            ))
+
+        result = processor._analyze_events_sync(events)
+        stats = result['statistics']
+
+        assert stats['total_keystrokes'] == 12
+        assert stats['keydown_count'] == 6
+        assert stats['average_interval_ms'] == 340.0
+        assert stats['pause_count'] == 2
+        assert stats['time_span_seconds'] == 1.7
+
     def test_analyze_events_insufficient(self, processor):
         """이벤트 부족 시 분석 테스트"""
         # 부족한 이벤트
         events = [
             TypingEvent(
                 key='a',
-                timestamp=time.time() * 1000,
+                timestamp=float(int(time.time() * 1000)),
                 event_type='keydown',
                 session_id='test',
                 duration=50.0
@@ -449,6 +685,14 @@ class TestOptimizedPatternProcessor:
         assert processor.metrics.avg_latency_ms > 50.0  # 이동 평균
         assert processor.metrics.avg_latency_ms < 100.0
 
+    @pytest.mark.asyncio
+    async def test_first_event_seeds_latency_average(self, processor, sample_event_data):
+        """첫 이벤트의 레이턴시가 이동 평균의 초기값이 되는지 테스트"""
+        await processor.process_typing_event("latency-session", sample_event_data)
+
+        assert processor.metrics.avg_latency_ms > 0.0
+        assert processor.metrics.avg_latency_ms == processor.metrics.max_latency_ms
+
     @pytest.mark.asyncio
     async def test_evict_oldest_session(self, processor, sample_event_data):
         """가장 오래된 세션 제거 테스트"""
@@ -467,4 +711,136 @@ class TestOptimizedPatternProcessor:
 
         # 세션 수 확인
         assert len(processor.session_buffers) <= 2
-        assert "old-session" not in processor.session_buffers
\ No newline at end of file
+        assert "old-session" not in processor.session_buffers
+
+    @pytest.mark.asyncio
+    async def test_evict_least_recently_used_session(self, processor, sample_event_data):
+        """최근 이벤트가 들어온 세션은 제거되지 않는지 테스트 (LRU)"""
+        processor.max_concurrent_sessions = 2
+
+        await processor.process_typing_event("first-session", sample_event_data)
+        await processor.process_typing_event("second-session", sample_event_data)
+
+        # 첫 번째 세션을 다시 사용 - 두 번째 세션이 가장 오래된 세션이 됨
+        await processor.process_typing_event("first-session", sample_event_data)
+        await processor.process_typing_event("third-session", sample_event_data)
+
+        assert list(processor.session_buffers) == ["first-session", "third-session"]
+
+    @pytest.mark.asyncio
+    async def test_processing_queue_deduplicates_sessions(self, processor, sample_event_data):
+        """같은 세션의 연속 이벤트는 대기열에 한 번만 등록되는지 테스트"""
+        for _ in range(5):
+            await processor.process_typing_event("session-a", sample_event_data)
+        await processor.process_typing_event("session-b", sample_event_data)
+
+        assert list(processor._dirty_queue) == ["session-a", "session-b"]
+        assert processor.get_metrics()['queue_size'] == 2
+
+    def test_analyze_batch_sync_matches_single_analysis(self, processor):
+        """배치 분석 결과가 세션별 단일 분석 결과와 같은지 테스트"""
+        base_time = 1_000_000.0
+        fast_events = [
+            TypingEvent(key='a', timestamp=base_time + i * 80, event_type='keydown', session_id='fast')
+            for i in range(12)
+        ]
+        uneven_events = [
+            TypingEvent(key='b', timestamp=base_time + offset, event_type='keydown', session_id='uneven')
+            for offset in [0, 100, 700, 750, 1600, 1700, 1720, 2500]
+        ]
+        short_events = fast_events[:1]
+
+        batch_results = processor._analyze_batch_sync([
+            ([e.to_dict() for e in events], IntervalStats.from_events(events))
+            for events in (fast_events, short_events, uneven_events)
+        ])
+
+        assert batch_results[1] == {"error": "insufficient_events"}
+        for events, result in ((fast_events, batch_results[0]), (uneven_events, batch_results[2])):
+            single = processor._analyze_events_sync(events)
+            assert result['statistics'] == single['statistics']
+            assert result['patterns'] == single['patterns']
+
+    @pytest.mark.asyncio
+    async def test_buffer_size_tracked_incrementally(self, processor, sample_event_data):
+        """버퍼 크기 메트릭이 버퍼 초과/세션 제거 후에도 실제 크기와 같은지 테스트"""
+        processor.max_concurrent_sessions = 2
+        processor.buffer_size_per_session = 3
+
+        for _ in range(5):
+            await processor.process_typing_event("session-a", sample_event_data)
+        for _ in range(2):
+            await processor.process_typing_event("session-b", sample_event_data)
+        # session-a 제거
+        await processor.process_typing_event("session-c", sample_event_data)
+
+        expected = sum(len(buf) for buf in processor.session_buffers.values())
+        assert expected == 3
+        assert processor.get_metrics()['buffer_size'] == expected
+
+    @pytest.mark.asyncio
+    async def test_evicted_session_removed_from_processing_queue(self, processor, sample_event_data):
+        """제거된 세션은 처리 대기 집합에서도 빠지는지 테스트"""
+        processor.max_concurrent_sessions = 2
+
+        for session_id in ["session-a", "session-b", "session-c"]:
+            await processor.process_typing_event(session_id, sample_event_data)
+
+        assert processor._dirty_set == {"session-b", "session-c"}
+        assert processor.get_metrics()['queue_size'] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_timestamp_does_not_corrupt_session(self, processor):
+        """잘못된 타임스탬프 이벤트가 이후 이벤트 처리에 영향을 주지 않는지 테스트"""
+        session_id = "bad-timestamp"
+        base_time = 1_000_000.0
+
+        # 문자열 숫자는 변환되어 정상 처리
+        result = await processor.process_typing_event(
+            session_id, {'key': 'a', 'timestamp': str(base_time), 'type': 'keydown'}
+        )
+        assert result['status'] == 'queued'
+
+        # 숫자로 변환할 수 없는 값은 거부되고 버퍼는 그대로 유지
+        result = await processor.process_typing_event(
+            session_id, {'key': 'b', 'timestamp': 'not-a-number', 'type': 'keydown'}
+        )
+        assert result['status'] == 'error'
+
+        for i in range(1, 4):
+            result = await processor.process_typing_event(
+                session_id, {'key': 'c', 'timestamp': base_time + i * 100, 'type': 'keydown'}
+            )
+            assert result['status'] == 'queued'
+
+        buffer = processor.session_buffers[session_id]
+        assert len(buffer) == 4
+        assert buffer.get_interval_stats(4).interval_sum == 300.0
+        assert processor.get_metrics()['buffer_size'] == 4
+
+    def test_analyze_batch_sync_isolates_failing_session(self, processor):
+        """한 세션의 분석 실패가 같은 배치의 다른 세션 결과에 영향을 주지 않는지 테스트"""
+        base_time = 1_000_000.0
+        good_events = [
+            TypingEvent(key='a', timestamp=base_time + i * 100, event_type='keydown', session_id='good')
+            for i in range(12)
+        ]
+        broken_stats = IntervalStats(
+            event_count=12,
+            keydown_count=12,
+            interval_sum="broken",
+            first_keydown_ts=base_time,
+            last_keydown_ts=base_time + 1100
+        )
+
+        keystrokes = [e.to_dict() for e in good_events]
+        good_stats = IntervalStats.from_events(good_events)
+        results = processor._analyze_batch_sync([
+            (keystrokes, good_stats),
+            (keystrokes, broken_stats),
+            (keystrokes, good_stats)
+        ])
+
+        assert results[1]['error'] == 'analysis_failed'
+        assert results[0]['statistics']['keydown_count'] == 12
+        assert results[2]['statistics'] == results[0]['statistics']
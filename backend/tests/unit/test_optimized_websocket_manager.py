@@ -0,0 +1,439 @@
+"""
+OptimizedWebSocketManager 단위 테스트
+
+WebSocket 연결 래퍼의 직렬화/큐/정리 동작 테스트
+"""
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+import orjson
+from unittest.mock import AsyncMock, Mock, patch
+
+from fastapi.websockets import WebSocketState
+
+from src.services.optimized_websocket_manager import (
+    ConnectionMetrics,
+    ConnectionState,
+    MessagePriority,
+    OptimizedConnection,
+    QueuedMessage,
+    WebSocketConnectionPool,
+)
+
+
+def make_websocket():
+    """테스트용 WebSocket 목 객체"""
+    websocket = Mock()
+    websocket.client_state = WebSocketState.CONNECTED
+    websocket.send_text = AsyncMock()
+    websocket.receive_text = AsyncMock()
+    websocket.close = AsyncMock()
+    return websocket
+
+
+async def drain(connection):
+    """전송 태스크가 큐를 비울 때까지 대기"""
+    for _ in range(100):
+        if connection.queue_size == 0 and not connection._wake.is_set():
+            await asyncio.sleep(0)  # 마지막 메시지 전송 완료 대기
+            return
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def connection():
+    """연결된 상태의 테스트용 연결"""
+    conn = OptimizedConnection(make_websocket(), "conn-1", "session-1")
+    conn.state = ConnectionState.CONNECTED
+    return conn
+
+
+class TestOptimizedConnection:
+    """OptimizedConnection 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_send_message_serializes_to_text_frame(self, connection):
+        """메시지가 JSON 텍스트 프레임으로 전송되는지 테스트"""
+        data = {"type": "pattern", "text": "안녕", "value": 1.5}
+
+        assert await connection.send_message(data) is True
+        await drain(connection)
+
+        sent = connection.websocket.send_text.await_args.args[0]
+        assert isinstance(sent, str)
+        assert orjson.loads(sent) == data
+        assert connection.metrics.bytes_sent == len(sent.encode('utf-8'))
+
+    @pytest.mark.asyncio
+    async def test_ping_timestamp_is_utc(self, connection):
+        """핑 메시지의 타임스탬프가 UTC 표기로 직렬화되는지 테스트"""
+        assert await connection.ping() is True
+        await drain(connection)
+
+        sent = orjson.loads(connection.websocket.send_text.await_args.args[0])
+        assert sent["type"] == "ping"
+        assert sent["connection_id"] == "conn-1"
+        assert sent["timestamp"].endswith("Z")
+        assert connection.metrics.ping_count == 1
+
+    @pytest.mark.asyncio
+    async def test_ping_frame_escapes_connection_id(self):
+        """핑 템플릿이 연결 ID를 JSON 규칙대로 이스케이프하는지 테스트"""
+        conn = OptimizedConnection(make_websocket(), 'conn-"\\-1', "session-1")
+        conn.state = ConnectionState.CONNECTED
+
+        with patch("src.services.optimized_websocket_manager.orjson.dumps") as dumps:
+            assert await conn.ping() is True
+            await drain(conn)
+            dumps.assert_not_called()
+
+        sent = orjson.loads(conn.websocket.send_text.await_args.args[0])
+        assert sent["connection_id"] == 'conn-"\\-1'
+        datetime.fromisoformat(sent["timestamp"].replace("Z", "+00:00"))
+
+    @pytest.mark.asyncio
+    async def test_receive_message_deserializes(self, connection):
+        """수신한 텍스트가 역직렬화되는지 테스트"""
+        connection.websocket.receive_text.return_value = '{"type": "keystroke", "key": "a"}'
+
+        message = await connection.receive_message()
+
+        assert message == {"type": "keystroke", "key": "a"}
+        assert connection.metrics.messages_received == 1
+        assert connection.state == ConnectionState.ACTIVE
+
+    @pytest.mark.asyncio
+    async def test_send_message_rejected_when_not_connected(self, connection):
+        """연결 상태가 아니면 전송하지 않는지 테스트"""
+        connection.state = ConnectionState.CLOSED
+
+        assert await connection.send_message({"type": "x"}, MessagePriority.HIGH) is False
+        connection.websocket.send_text.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_single_writer_sends_in_order(self, connection):
+        """동시 생산자의 메시지가 겹치지 않고 순서대로 전송되는지 테스트"""
+        in_flight = 0
+        max_in_flight = 0
+        sent = []
+
+        async def slow_send(text):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            sent.append(orjson.loads(text)["n"])
+            in_flight -= 1
+
+        connection.websocket.send_text.side_effect = slow_send
+
+        results = await asyncio.gather(*(connection.send_message({"n": n}) for n in range(5)))
+        await drain(connection)
+
+        assert results == [True] * 5
+        assert sent == [0, 1, 2, 3, 4]
+        assert max_in_flight == 1
+
+        await connection.close()
+        assert connection._drain_task is None
+
+    @pytest.mark.asyncio
+    async def test_unserializable_message_is_dropped(self, connection):
+        """직렬화할 수 없는 메시지는 연결 상태를 바꾸지 않고 폐기되는지 테스트"""
+        assert await connection.send_message({"bad": object()}) is True
+        await drain(connection)
+
+        assert connection.queue_size == 0
+        assert connection.metrics.errors == 1
+        assert connection.state == ConnectionState.CONNECTED
+        connection.websocket.send_text.assert_not_awaited()
+
+    def test_queue_pops_by_priority_then_fifo(self, connection):
+        """우선순위가 높은 메시지부터, 같은 우선순위는 먼저 들어온 순서로 꺼내는지 테스트"""
+        for name, priority in [
+            ("low", MessagePriority.LOW),
+            ("normal-1", MessagePriority.NORMAL),
+            ("critical", MessagePriority.CRITICAL),
+            ("normal-2", MessagePriority.NORMAL),
+        ]:
+            connection._push_message(QueuedMessage(name, priority))
+
+        retried = connection._pop_message()
+        connection._requeue_message(retried)  # 재시도 메시지는 같은 우선순위의 맨 앞
+
+        order = [connection._pop_message().data for _ in range(connection.queue_size)]
+        assert order == ["critical", "normal-1", "normal-2", "low"]
+
+    @pytest.mark.asyncio
+    async def test_backpressure_while_queue_is_full(self):
+        """큐가 가득 차면 메시지를 거부하고, 큐가 절반 아래로 줄면 해제되는지 테스트"""
+        conn = OptimizedConnection(make_websocket(), "conn-2", "session-1", max_queue_size=4)
+        conn.state = ConnectionState.CONNECTED
+        for n in range(4):
+            conn._push_message(QueuedMessage({"n": n}, MessagePriority.HIGH))
+
+        assert await conn.send_message({"n": 4}, MessagePriority.HIGH) is False
+        assert conn.throttle_enabled is True
+
+        conn._wake.set()
+        conn._drain_task = asyncio.create_task(conn._drain_loop())
+        await drain(conn)
+
+        assert conn.throttle_enabled is False
+        assert conn.websocket.send_text.await_count == 4
+
+        await conn.close()
+
+    def test_write_buffer_limits_applied_when_transport_exposed(self):
+        """전송 계층이 노출되면 쓰기 버퍼 워터마크를 설정하는지 테스트"""
+        websocket = make_websocket()
+        OptimizedConnection(websocket, "conn-2", "session-1")
+
+        websocket.transport.set_write_buffer_limits.assert_called_once_with(
+            high=64 * 1024, low=16 * 1024
+        )
+
+    def test_eviction_drops_lowest_priority_first(self):
+        """큐가 가득 차면 가장 낮은 우선순위의 오래된 메시지부터 제거되는지 테스트"""
+        conn = OptimizedConnection(make_websocket(), "conn-2", "session-1", max_queue_size=4)
+        for name, priority in [
+            ("low-1", MessagePriority.LOW),
+            ("high", MessagePriority.HIGH),
+            ("normal", MessagePriority.NORMAL),
+            ("low-2", MessagePriority.LOW),
+        ]:
+            conn._push_message(QueuedMessage(name, priority))
+
+        conn._evict_low_priority_messages()
+
+        assert conn.queue_size == 3
+        order = [conn._pop_message().data for _ in range(conn.queue_size)]
+        assert order == ["high", "normal", "low-2"]
+
+
+class TestWebSocketConnectionPool:
+    """WebSocketConnectionPool 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_serializes_once(self):
+        """브로드캐스트 페이로드가 연결 수와 무관하게 한 번만 직렬화되는지 테스트"""
+        pool = WebSocketConnectionPool()
+        connections = [
+            await pool.add_connection(make_websocket(), f"conn-{i}", "session-1")
+            for i in range(3)
+        ]
+
+        dumps_path = "src.services.optimized_websocket_manager.orjson.dumps"
+        with patch(dumps_path, wraps=orjson.dumps) as dumps:
+            sent_count = await pool.broadcast_to_session("session-1", {"type": "emotion", "v": 1})
+            for connection in connections:
+                await drain(connection)
+
+        assert sent_count == 3
+        assert dumps.call_count == 1
+        for connection in connections:
+            sent = connection.websocket.send_text.await_args.args[0]
+            assert orjson.loads(sent) == {"type": "emotion", "v": 1}
+
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_broadcast_continues_after_connection_failure(self):
+        """한 연결의 전송 실패가 다른 연결의 브로드캐스트를 막지 않는지 테스트"""
+        pool = WebSocketConnectionPool()
+        connections = [
+            await pool.add_connection(make_websocket(), f"conn-{i}", "session-1")
+            for i in range(3)
+        ]
+        connections[1].send_raw = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with patch("src.services.optimized_websocket_manager.asyncio.create_task",
+                   wraps=asyncio.create_task) as create_task:
+            sent_count = await pool.broadcast_to_session("session-1", {"type": "x"})
+
+        assert sent_count == 2
+        # 전송 태스크(연결당 1개) 외에 팬아웃용 태스크를 만들지 않음
+        assert create_task.call_count == 2
+
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_stuck_client_is_closed_after_send_timeout(self):
+        """전송이 시간 내에 끝나지 않는 클라이언트는 종료 후 풀에서 제거되는지 테스트"""
+        pool = WebSocketConnectionPool()
+        connection = await pool.add_connection(make_websocket(), "conn-1", "session-1")
+        connection.send_timeout = 0.01
+
+        async def stuck_send(text):
+            await asyncio.sleep(10)
+
+        connection.websocket.send_text.side_effect = stuck_send
+
+        assert await connection.send_message({"type": "x"}) is True
+        await asyncio.sleep(0.05)
+        await connection._close_task
+
+        assert connection.state == ConnectionState.CLOSED
+        assert connection.metrics.errors == 1
+        assert "conn-1" not in pool.connections
+        connection.websocket.close.assert_awaited_once()
+
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_session_connection_cache_invalidated_on_add_and_remove(self):
+        """세션 연결 목록 캐시가 연결 추가/제거 시 갱신되는지 테스트"""
+        pool = WebSocketConnectionPool()
+        first = await pool.add_connection(make_websocket(), "conn-1", "session-1")
+        assert pool.get_session_connections("session-1") == [first]
+
+        second = await pool.add_connection(make_websocket(), "conn-2", "session-1")
+        assert set(pool.get_session_connections("session-1")) == {first, second}
+
+        await pool.remove_connection("conn-1")
+        assert pool.get_session_connections("session-1") == [second]
+        assert await pool.broadcast_to_session("session-1", {"type": "x"}) == 1
+
+        assert pool.get_session_connections("unknown") == []
+        assert "unknown" not in pool._session_connlist_cache
+
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_connection_limit_closes_least_recently_active(self):
+        """연결 수 제한 초과 시 가장 오래 활동하지 않은 연결이 종료되는지 테스트"""
+        pool = WebSocketConnectionPool(max_connections=2)
+        first = await pool.add_connection(make_websocket(), "conn-1", "session-1")
+        await pool.add_connection(make_websocket(), "conn-2", "session-1")
+
+        # conn-1이 메시지를 받아 최근 활동 연결이 됨
+        first.websocket.receive_text.return_value = '{"type": "keystroke"}'
+        await first.receive_message()
+        assert list(pool.connections) == ["conn-2", "conn-1"]
+
+        await pool.add_connection(make_websocket(), "conn-3", "session-1")
+
+        assert list(pool.connections) == ["conn-1", "conn-3"]
+
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_statistics_use_incremental_counters(self):
+        """증분 집계 통계가 실제 연결 상태와 일치하는지 테스트"""
+        pool = WebSocketConnectionPool()
+        first = await pool.add_connection(make_websocket(), "conn-1", "session-1")
+        second = await pool.add_connection(make_websocket(), "conn-2", "session-1")
+
+        first.websocket.receive_text.return_value = '{"type": "keystroke"}'
+        await first.receive_message()
+        second._push_message(QueuedMessage({"n": 1}, MessagePriority.NORMAL))
+        second._push_message(QueuedMessage({"n": 2}, MessagePriority.LOW))
+
+        stats = pool.get_pool_statistics()
+        assert stats['active_connections'] == 1
+        assert stats['total_messages_processed'] == 1
+        assert stats['average_queue_size'] == 1.0
+        assert stats['idle_connections'] == 0
+
+        # 유휴 연결은 LRU 앞쪽부터 센다
+        now = time.monotonic() + second.max_idle_time + 1
+        with patch("src.services.optimized_websocket_manager.time.monotonic", return_value=now):
+            assert pool.get_pool_statistics()['idle_connections'] == 2
+
+        await pool.remove_connection("conn-2")
+        stats = pool.get_pool_statistics()
+        assert stats['total_connections'] == 1
+        assert stats['active_connections'] == 1
+        assert stats['average_queue_size'] == 0
+
+        await pool.stop()
+        assert pool._state_counts[ConnectionState.ACTIVE] == 0
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_only_marked_connections(self):
+        """정리 작업이 종료/오류로 등록된 연결만 제거하는지 테스트"""
+        pool = WebSocketConnectionPool()
+        closed = await pool.add_connection(make_websocket(), "conn-1", "session-1")
+        recovered = await pool.add_connection(make_websocket(), "conn-2", "session-1")
+        await pool.add_connection(make_websocket(), "conn-3", "session-2")
+
+        closed.state = ConnectionState.CLOSED
+        recovered.state = ConnectionState.ERROR
+        recovered.state = ConnectionState.ACTIVE  # 재전송 성공으로 복구
+        assert list(pool._pending_removal) == ["conn-1", "conn-2"]
+
+        await pool._cleanup_closed_connections()
+
+        assert list(pool.connections) == ["conn-2", "conn-3"]
+        assert pool.session_connections["session-1"] == {"conn-2"}
+        assert not pool._pending_removal
+
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_idle_cleanup_closes_connections_concurrently(self):
+        """유휴 연결 종료가 순차가 아니라 동시에 진행되는지 테스트"""
+        pool = WebSocketConnectionPool()
+        connections = [
+            await pool.add_connection(make_websocket(), f"conn-{i}", "session-1")
+            for i in range(3)
+        ]
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_close():
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+
+        for connection in connections:
+            connection.websocket.close.side_effect = slow_close
+
+        now = time.monotonic() + connections[0].max_idle_time + 1
+        with patch("src.services.optimized_websocket_manager.time.monotonic", return_value=now):
+            await pool._cleanup_idle_connections()
+
+        assert max_in_flight == 3
+        assert not pool.connections
+
+        await pool.stop()
+
+    def test_memory_info_cached_within_ttl(self):
+        """시스템 메모리 정보가 캐시 유지 시간 동안 재사용되는지 테스트"""
+        pool = WebSocketConnectionPool()
+        module = "src.services.optimized_websocket_manager"
+
+        with patch(f"{module}.psutil.virtual_memory") as virtual_memory, \
+                patch(f"{module}.time.monotonic", return_value=100.0) as monotonic:
+            first = pool._vmem()
+            pool.get_pool_statistics()
+            assert virtual_memory.call_count == 1
+
+            monotonic.return_value = 106.0
+            pool._vmem()
+            assert virtual_memory.call_count == 2
+            assert first is virtual_memory.return_value
+
+
+class TestConnectionMetrics:
+    """ConnectionMetrics 테스트"""
+
+    def test_idle_time_uses_monotonic_clock(self):
+        """유휴 시간이 단조 시계 기준으로 계산되는지 테스트"""
+        metrics = ConnectionMetrics()
+
+        now = metrics.last_activity + 42.0
+
+        with patch("src.services.optimized_websocket_manager.time.monotonic", return_value=now):
+            assert metrics.get_idle_time() == pytest.approx(42.0)
+            metrics.add_message_sent(10)
+            assert metrics.get_idle_time() == 0.0
+
+    def test_dataclasses_use_slots(self):
+        """메트릭/큐 메시지 객체가 __dict__ 없이 슬롯을 사용하는지 테스트"""
+        assert not hasattr(ConnectionMetrics(), "__dict__")
+        assert not hasattr(QueuedMessage({"type": "x"}), "__dict__")
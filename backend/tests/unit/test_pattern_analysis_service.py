@@ -0,0 +1,449 @@
+"""
+PatternAnalysisService 단위 테스트
+
+DB 세션을 목 객체로 대체하여 조회/집계 동작과 쿼리 수를 검증
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.exc import IntegrityError
+
+from src.models.typing_pattern import TypingPattern
+from src.models.emotion_profile import EmotionProfile
+from src.services.pattern_analysis_service import PatternAnalysisService
+
+
+def make_result(items):
+    """session.execute() 결과 목 객체"""
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = list(items)
+    result.scalar_one_or_none.return_value = items[0] if items else None
+    return result
+
+
+def make_aggregate(count, keystrokes, text_length, profiles):
+    """집계 쿼리 결과 목 객체"""
+    result = MagicMock()
+    result.one.return_value = (count, keystrokes, text_length, profiles)
+    return result
+
+
+def make_stream(*batches):
+    """session.stream_scalars() 결과 목 객체 (배치 단위 partitions)"""
+    async def partitions(size=None):
+        for batch in batches:
+            yield list(batch)
+
+    result = MagicMock()
+    result.partitions = partitions
+    return result
+
+
+def make_pattern(pattern_id, keystroke_count=10, text="hello"):
+    """테스트용 타이핑 패턴"""
+    keystrokes = [
+        {"key": "a", "timestamp": 1000 + i * 100, "duration": 50, "type": "keydown"}
+        for i in range(keystroke_count)
+    ]
+    return TypingPattern(
+        id=pattern_id,
+        session_id="session-1",
+        keystrokes=keystrokes,
+        text_content=text
+    )
+
+
+def make_profile(pattern_id, energy, confidence=0.8):
+    """테스트용 감정 프로필"""
+    return EmotionProfile(
+        id=f"profile-{pattern_id}",
+        pattern_id=pattern_id,
+        tempo_score=0.5,
+        rhythm_consistency=0.5,
+        pause_intensity=0.2,
+        emotion_vector={"energy": energy, "valence": 0.2, "tension": 0.1, "focus": 0.4},
+        confidence_score=confidence
+    )
+
+
+@pytest.fixture
+def db_session():
+    """비동기 DB 세션 목 객체"""
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    session.refresh = AsyncMock()
+    session.rollback = AsyncMock()
+    session.stream_scalars = AsyncMock()
+    return session
+
+
+@pytest.fixture
+def service(db_session):
+    """분석기/매퍼를 목 객체로 대체한 서비스"""
+    service = PatternAnalysisService(db_session)
+    service.pattern_analyzer = MagicMock()
+    service.pattern_analyzer.validate_keystrokes.return_value = (True, None)
+    service.pattern_analyzer.analyze_typing_pattern.return_value = {
+        "statistics": {"total_keystrokes": 10},
+        "patterns": {},
+        "text_content": "hello"
+    }
+    service.emotion_mapper = MagicMock()
+    return service
+
+
+class TestSessionAnalysisSummary:
+    """get_session_analysis_summary 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_summary_aggregates_in_sql(self, db_session):
+        """개수/길이는 SQL 집계로, 감정 통계는 프로필만 조회해 계산하는지 테스트"""
+        profiles = [make_profile("p0", 0.9), make_profile("p3", 0.1)]
+        db_session.execute.side_effect = [make_aggregate(5, 50, 25, 2)]
+        db_session.stream_scalars.return_value = make_stream(profiles)
+
+        service = PatternAnalysisService(db_session)
+        summary = await service.get_session_analysis_summary("session-1")
+
+        assert db_session.execute.await_count == 1
+        aggregate_sql = str(db_session.execute.await_args_list[0].args[0])
+        assert "sum(typing_patterns.keystroke_count)" in aggregate_sql
+        assert "sum(typing_patterns.text_length)" in aggregate_sql
+        assert "keystrokes)" not in aggregate_sql
+        profile_statement = db_session.stream_scalars.await_args.args[0]
+        assert [d["entity"] for d in profile_statement.column_descriptions] == [EmotionProfile]
+        assert profile_statement.get_execution_options()["yield_per"] == 500
+        assert summary["total_patterns"] == 5
+        assert summary["total_keystrokes"] == 50
+        assert summary["total_text_length"] == 25
+        assert summary["average_emotion_vector"]["energy"] == pytest.approx(0.5)
+        assert summary["average_confidence"] == pytest.approx(0.8)
+        assert summary["analysis_complete"] is False
+
+    @pytest.mark.asyncio
+    async def test_summary_averages_skip_empty_emotion_vectors(self, db_session):
+        """감정 벡터가 비어 있는 프로필은 벡터 평균에서만 제외되는지 테스트"""
+        profiles = [
+            make_profile("p0", 0.9, confidence=0.9),
+            make_profile("p1", 0.3, confidence=0.6),
+            make_profile("p2", 0.0, confidence=0.3)
+        ]
+        profiles[2].emotion_vector = {}
+        db_session.execute.side_effect = [make_aggregate(3, 30, 15, 3)]
+        db_session.stream_scalars.return_value = make_stream(profiles[:2], profiles[2:])
+
+        service = PatternAnalysisService(db_session)
+        summary = await service.get_session_analysis_summary("session-1")
+
+        assert summary["average_emotion_vector"] == pytest.approx(
+            {"energy": 0.6, "valence": 0.2, "tension": 0.1, "focus": 0.4}
+        )
+        assert all(type(v) is float for v in summary["average_emotion_vector"].values())
+        assert summary["average_confidence"] == pytest.approx(0.6)
+        assert summary["analysis_complete"] is True
+
+    @pytest.mark.asyncio
+    async def test_summary_emotion_distribution(self, db_session):
+        """감정 분포와 가장 많은 감정을 계산하는지 테스트"""
+        profiles = [make_profile(f"p{i}", 0.5) for i in range(3)]
+        emotions = iter(["calm", "energetic", "energetic"])
+        for profile in profiles:
+            profile.get_dominant_emotion = lambda emotion=next(emotions): emotion
+        db_session.execute.side_effect = [make_aggregate(3, 30, 15, 3)]
+        db_session.stream_scalars.return_value = make_stream(profiles[:1], profiles[1:])
+
+        service = PatternAnalysisService(db_session)
+        summary = await service.get_session_analysis_summary("session-1")
+
+        assert type(summary["emotion_distribution"]) is dict
+        assert summary["emotion_distribution"] == {"calm": 1, "energetic": 2}
+        assert summary["most_common_emotion"] == "energetic"
+
+    @pytest.mark.asyncio
+    async def test_summary_without_profiles_skips_profile_query(self, db_session):
+        """프로필이 없으면 프로필 조회를 생략하는지 테스트"""
+        db_session.execute.side_effect = [make_aggregate(2, 20, 10, 0)]
+
+        service = PatternAnalysisService(db_session)
+        summary = await service.get_session_analysis_summary("session-1")
+
+        assert db_session.execute.await_count == 1
+        db_session.stream_scalars.assert_not_awaited()
+        assert summary["total_keystrokes"] == 20
+        assert summary["average_confidence"] == 0.0
+        assert summary["emotion_distribution"] == {}
+        assert summary["most_common_emotion"] == "unknown"
+        assert summary["analysis_complete"] is False
+
+    @pytest.mark.asyncio
+    async def test_summary_without_patterns(self, db_session):
+        """패턴이 없는 세션은 추가 조회 없이 빈 요약을 반환하는지 테스트"""
+        db_session.execute.side_effect = [make_aggregate(0, 0, 0, 0)]
+
+        service = PatternAnalysisService(db_session)
+        summary = await service.get_session_analysis_summary("session-1")
+
+        assert summary["total_patterns"] == 0
+        assert db_session.execute.await_count == 1
+
+
+class TestAnalyzeTypingPattern:
+    """analyze_typing_pattern 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_pattern_and_profile_saved_in_one_transaction(self, service, db_session):
+        """패턴과 감정 프로필을 한 세션, 한 커밋으로 저장하는지 테스트"""
+        db_session.execute.return_value = make_result([MagicMock()])
+        keystrokes = make_pattern("p0").keystrokes
+
+        typing_pattern, emotion_profile = await service.analyze_typing_pattern(
+            "session-1", keystrokes
+        )
+
+        db_session.add_all.assert_called_once_with([typing_pattern, emotion_profile])
+        db_session.commit.assert_awaited_once()
+        assert emotion_profile.typing_pattern is typing_pattern
+        assert typing_pattern.text_content == "hello"
+
+    @pytest.mark.asyncio
+    async def test_invalid_keystrokes_not_saved(self, service, db_session):
+        """유효하지 않은 키스트로크는 저장하지 않고 ValueError를 내는지 테스트"""
+        db_session.execute.return_value = make_result([MagicMock()])
+        service.pattern_analyzer.validate_keystrokes.return_value = (False, "too short")
+
+        with pytest.raises(ValueError):
+            await service.analyze_typing_pattern("session-1", [])
+
+        db_session.add_all.assert_not_called()
+        db_session.commit.assert_not_awaited()
+
+
+class TestBatchAnalysis:
+    """analyze_batch_patterns 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_session_validated_once_per_batch(self, service, db_session):
+        """배치 수와 무관하게 세션 존재 확인을 한 번만 하는지 테스트"""
+        db_session.execute.return_value = make_result([MagicMock()])
+        batches = [make_pattern(f"p{i}").keystrokes for i in range(3)]
+
+        results = await service.analyze_batch_patterns("session-1", batches)
+
+        assert len(results) == 3
+        assert db_session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_saved_in_one_commit(self, service, db_session):
+        """배치 전체를 한 번의 add_all/commit으로 저장하는지 테스트"""
+        db_session.execute.return_value = make_result([MagicMock()])
+        service.pattern_analyzer.validate_keystrokes.side_effect = [
+            (True, None), (False, "too short"), (True, None)
+        ]
+        batches = [make_pattern(f"p{i}").keystrokes for i in range(3)]
+
+        results = await service.analyze_batch_patterns("session-1", batches)
+
+        assert len(results) == 2
+        db_session.add_all.assert_called_once()
+        assert len(db_session.add_all.call_args.args[0]) == 4
+        db_session.commit.assert_awaited_once()
+        for typing_pattern, emotion_profile in results:
+            assert emotion_profile.typing_pattern is typing_pattern
+            assert typing_pattern.text_content == "hello"
+
+    @pytest.mark.asyncio
+    async def test_unknown_session_skips_all_batches(self, service, db_session):
+        """세션이 없으면 어떤 배치도 저장하지 않는지 테스트"""
+        db_session.execute.return_value = make_result([])
+
+        results = await service.analyze_batch_patterns("missing", [[{}], [{}]])
+
+        assert results == []
+        service.pattern_analyzer.analyze_typing_pattern.assert_not_called()
+        db_session.add.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_large_batch_analyzed_in_cpu_pool(self, service, db_session, monkeypatch):
+        """배치가 많으면 분석을 풀 워커로 넘기고 실패한 배치만 건너뛰는지 테스트"""
+        from concurrent.futures import ThreadPoolExecutor
+        import src.services.pattern_analysis_service as module
+
+        worker_analyzer = MagicMock()
+        worker_analyzer.validate_keystrokes.side_effect = [
+            (True, None), (False, "too short"), (True, None), (True, None)
+        ]
+        worker_analyzer.analyze_typing_pattern.return_value = {
+            "statistics": {}, "patterns": {}, "text_content": "from worker"
+        }
+        monkeypatch.setattr(module, "_worker_pattern_analyzer", worker_analyzer)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            monkeypatch.setattr(PatternAnalysisService, "_cpu_pool", pool)
+            db_session.execute.return_value = make_result([MagicMock()])
+            batches = [make_pattern(f"p{i}").keystrokes for i in range(4)]
+
+            results = await service.analyze_batch_patterns("session-1", batches)
+
+        assert len(results) == 3
+        assert all(pattern.text_content == "from worker" for pattern, _ in results)
+        service.pattern_analyzer.analyze_typing_pattern.assert_not_called()
+        db_session.commit.assert_awaited_once()
+
+    def test_cpu_pool_split_across_server_workers(self, monkeypatch):
+        """풀 크기가 CPU 코어를 uvicorn 워커 수로 나눈 값인지 테스트"""
+        import src.services.pattern_analysis_service as module
+
+        monkeypatch.setattr(module.os, "cpu_count", lambda: 8)
+        monkeypatch.setattr(module.settings, "ANALYSIS_PROCESS_WORKERS", 0)
+        monkeypatch.setattr(module.settings, "WEB_CONCURRENCY", 4)
+        assert module._cpu_pool_size() == 2
+
+        monkeypatch.setattr(module.settings, "WEB_CONCURRENCY", 16)
+        assert module._cpu_pool_size() == 1
+
+        monkeypatch.setattr(module.settings, "ANALYSIS_PROCESS_WORKERS", 3)
+        assert module._cpu_pool_size() == 3
+
+
+class TestSessionValidation:
+    """_validate_session_exists 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_existing_session_cached(self, service, db_session):
+        """존재가 확인된 세션은 다시 조회하지 않는지 테스트"""
+        db_session.execute.return_value = make_result([MagicMock()])
+
+        assert await service._validate_session_exists(db_session, "session-1") is True
+        assert await service._validate_session_exists(db_session, "session-1") is True
+        assert db_session.execute.await_count == 1
+
+        service.clear_session_cache()
+        assert await service._validate_session_exists(db_session, "session-1") is True
+        assert db_session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_session_not_cached(self, service, db_session):
+        """없는 세션은 캐시하지 않고 매번 조회하는지 테스트"""
+        db_session.execute.return_value = make_result([])
+
+        assert await service._validate_session_exists(db_session, "missing") is False
+        assert await service._validate_session_exists(db_session, "missing") is False
+        assert db_session.execute.await_count == 2
+
+
+class TestDeletePattern:
+    """delete_pattern 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_delete_uses_single_statement(self, service, db_session):
+        """조회 없이 DELETE 문 하나로 삭제하는지 테스트"""
+        db_session.execute.return_value = MagicMock(rowcount=1)
+
+        assert await service.delete_pattern("p0") is True
+
+        assert db_session.execute.await_count == 1
+        statement = db_session.execute.await_args.args[0]
+        assert statement.is_delete
+        db_session.delete.assert_not_called()
+        db_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_missing_pattern(self, service, db_session):
+        """없는 패턴은 False를 반환하는지 테스트"""
+        db_session.execute.return_value = MagicMock(rowcount=0)
+
+        assert await service.delete_pattern("missing") is False
+
+    @pytest.mark.asyncio
+    async def test_delete_referenced_pattern_rolls_back(self, service, db_session):
+        """참조 중인 패턴 삭제 실패 시 롤백하고 False를 반환하는지 테스트"""
+        db_session.execute.side_effect = IntegrityError("DELETE", {}, Exception("fk"))
+
+        assert await service.delete_pattern("p0") is False
+        db_session.rollback.assert_awaited_once()
+
+
+class TestAnalysisStatistics:
+    """get_analysis_statistics 테스트"""
+
+    def test_statistics_read_only(self, service):
+        """설정 정보를 읽기 전용으로 반환하는지 테스트"""
+        service.pattern_analyzer.pause_threshold_ms = 500
+        service.emotion_mapper.genre_mapping = {"calm": [], "energetic": []}
+
+        stats = service.get_analysis_statistics()
+
+        assert stats["pattern_analyzer"]["pause_threshold_ms"] == 500
+        assert stats["emotion_mapper"]["genre_mapping_count"] == 2
+        with pytest.raises(TypeError):
+            stats["service_version"] = "2.0.0"
+
+    def test_statistics_json_encodable(self, service):
+        """읽기 전용 매핑도 API 응답으로 직렬화되는지 테스트"""
+        from fastapi.encoders import jsonable_encoder
+
+        service.pattern_analyzer.pause_threshold_ms = 500
+        service.emotion_mapper.emotion_thresholds = {"energy": 0.5}
+        service.emotion_mapper.genre_mapping = {}
+
+        encoded = jsonable_encoder({"analysis_statistics": service.get_analysis_statistics()})
+
+        assert encoded["analysis_statistics"]["emotion_mapper"] == {
+            "emotion_thresholds": {"energy": 0.5},
+            "genre_mapping_count": 0,
+            "version": "1.0.0"
+        }
+
+
+class TestReanalyzePattern:
+    """reanalyze_pattern 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_reanalyze_upserts_profile_in_one_statement(self, service, db_session):
+        """기존 프로필 조회 없이 upsert 한 번으로 저장하는지 테스트"""
+        from sqlalchemy.dialects import postgresql
+
+        db_session.execute.return_value = make_result([make_pattern("p0")])
+        profile = make_profile("p0", 0.7)
+        db_session.scalars = AsyncMock(return_value=MagicMock(one=MagicMock(return_value=profile)))
+        service.emotion_mapper.map_typing_to_emotion.return_value = MagicMock(
+            tempo_score=0.5,
+            rhythm_consistency=0.5,
+            pause_intensity=0.2,
+            emotion_vector={"energy": 0.7},
+            confidence_score=0.8
+        )
+
+        assert await service.reanalyze_pattern("p0") is profile
+
+        assert db_session.execute.await_count == 1
+        db_session.scalars.assert_awaited_once()
+        statement = db_session.scalars.await_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (pattern_id) DO UPDATE" in sql
+        assert "RETURNING" in sql
+        db_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_reanalyze_missing_pattern(self, service, db_session):
+        """없는 패턴은 None을 반환하고 저장하지 않는지 테스트"""
+        db_session.execute.return_value = make_result([])
+        db_session.scalars = AsyncMock()
+
+        assert await service.reanalyze_pattern("missing") is None
+        db_session.scalars.assert_not_awaited()
+        db_session.commit.assert_not_awaited()
+
+
+class TestSharedComponents:
+    """분석기/매퍼 공유 테스트"""
+
+    def test_analyzer_and_mapper_shared_across_instances(self, db_session):
+        """서비스 인스턴스마다 분석기/매퍼를 새로 만들지 않는지 테스트"""
+        first = PatternAnalysisService(db_session)
+        second = PatternAnalysisService()
+
+        assert first.pattern_analyzer is second.pattern_analyzer
+        assert first.emotion_mapper is second.emotion_mapper
+        assert first._validated_sessions is not second._validated_sessions
@@ -0,0 +1,902 @@
+"""
+RealtimeProcessor 단위 테스트
+
+캐시/DB를 목 객체로 대체하여 버퍼 관리와 실시간 패턴/메트릭 계산을 검증
+"""
+import asyncio
+import dataclasses
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.cache.redis_client import CacheService
+from src.services.realtime_processor import (
+    EMOTION_REFRESH_INTERVAL_NS,
+    MIN_EVENTS_FOR_ANALYSIS,
+    SESSION_BUFFER_SIZE,
+    SESSION_PK_CACHE_SIZE,
+    TYPING_FLUSH_DELAY,
+    TYPING_FLUSH_MAX_EVENTS,
+    EmotionSnapshot,
+    ProcessingResult,
+    RealtimeProcessor,
+    TypingEvent,
+    _compose_prompt,
+    _select_music_style,
+    _SessionRing,
+)
+
+
+def make_events(intervals, keystroke="a", is_special=False):
+    """테스트용 타이핑 이벤트 목록"""
+    return [
+        {"keystroke": keystroke, "timestamp": i, "interval": interval, "is_special": is_special}
+        for i, interval in enumerate(intervals)
+    ]
+
+
+@pytest.fixture
+def db_session():
+    """비동기 DB 세션 목 객체"""
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+@pytest.fixture
+def processor(db_session):
+    """캐시/DB 세션을 목 객체로 대체한 처리기"""
+    return RealtimeProcessor(MagicMock(spec=CacheService), db_session)
+
+
+class TestRealtimePatterns:
+    """_analyze_realtime_patterns 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_fast_consistent_typing(self, processor):
+        """빠르고 일정한 입력 패턴 감지"""
+        patterns = await processor._analyze_realtime_patterns("s1", make_events([80] * 20))
+
+        assert patterns == ["fast_typing", "consistent_rhythm"]
+
+    @pytest.mark.asyncio
+    async def test_frequent_pauses(self, processor):
+        """긴 일시정지가 20%를 넘으면 frequent_pauses 감지"""
+        intervals = [200] * 7 + [1500] * 3
+        patterns = await processor._analyze_realtime_patterns("s1", make_events(intervals))
+
+        assert "frequent_pauses" in patterns
+        assert "irregular_rhythm" in patterns
+
+    @pytest.mark.asyncio
+    async def test_uses_last_50_events(self, processor):
+        """최근 50개 이벤트만 분석하는지 테스트"""
+        intervals = [2000] * 50 + [80] * 50
+        patterns = await processor._analyze_realtime_patterns("s1", make_events(intervals))
+
+        assert patterns == ["fast_typing", "consistent_rhythm"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("interval, expected", [
+        (99, ["fast_typing"]),
+        (100, ["normal_typing"]),
+        (500, ["normal_typing"]),
+        (501, ["slow_typing"]),
+    ])
+    async def test_speed_boundaries(self, processor, interval, expected):
+        """속도 구간 경계값 (100ms 미만 fast, 500ms 초과 slow)"""
+        patterns = await processor._analyze_realtime_patterns("s1", make_events([interval] * 10))
+
+        assert patterns[:1] == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("spread, expected", [
+        (49, "consistent_rhythm"),
+        (50, None),
+        (200, None),
+        (201, "irregular_rhythm"),
+    ])
+    async def test_rhythm_boundaries(self, processor, spread, expected):
+        """리듬 구간 경계값 (표준편차 50 미만 consistent, 200 초과 irregular)"""
+        intervals = [300 - spread, 300 + spread] * 5
+        patterns = await processor._analyze_realtime_patterns("s1", make_events(intervals))
+
+        assert patterns[1:] == ([expected] if expected else [])
+
+    @pytest.mark.asyncio
+    async def test_too_few_events(self, processor):
+        """이벤트가 10개 미만이면 패턴을 반환하지 않음"""
+        assert await processor._analyze_realtime_patterns("s1", make_events([80] * 9)) == []
+
+
+class TestRealtimeMetrics:
+    """_calculate_realtime_metrics 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_metrics(self, processor):
+        """WPM/지속시간/간격 통계 계산"""
+        buffer = make_events([100, 200, 300]) + make_events([400], keystroke="Shift", is_special=True)
+
+        metrics = await processor._calculate_realtime_metrics(buffer)
+
+        # 문자 3개, 총 1초 → (3 / 5) / (1000 / 60000)
+        assert metrics["wpm"] == pytest.approx(36.0)
+        assert metrics["total_keystrokes"] == 4
+        assert metrics["session_duration"] == pytest.approx(1.0)
+        assert metrics["average_interval"] == pytest.approx(250.0)
+        assert metrics["rhythm_variance"] == pytest.approx(111.803, rel=1e-4)
+        assert all(type(metrics[key]) is float for key in ("average_interval", "rhythm_variance"))
+
+    def test_interval_stats_matches_numpy(self):
+        """합계/평균/표준편차가 NumPy 결과와 같은지 테스트"""
+        intervals = np.array([120.0, 80.5, 310.0, 95.25, 1500.0])
+
+        total, mean, std = RealtimeProcessor._interval_stats(intervals)
+
+        assert total == pytest.approx(intervals.sum())
+        assert mean == pytest.approx(intervals.mean())
+        assert std == pytest.approx(intervals.std())
+        assert RealtimeProcessor._interval_stats(np.array([42.0])) == (42.0, 42.0, 0.0)
+
+    @pytest.mark.asyncio
+    async def test_empty_buffer(self, processor):
+        """빈 버퍼는 빈 메트릭 반환"""
+        assert await processor._calculate_realtime_metrics([]) == {}
+
+
+class TestSessionBuffer:
+    """세션 버퍼 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_buffer_bounded(self, processor):
+        """버퍼가 최대 크기를 넘지 않고 오래된 이벤트부터 밀려나는지 테스트"""
+        processor._detect_patterns = MagicMock(return_value=[])
+        processor._calculate_basic_emotion = MagicMock(return_value=None)
+
+        for i in range(SESSION_BUFFER_SIZE + 5):
+            result = await processor.process_typing_event("s1", {"keystroke": "a", "interval": i})
+
+        buffer = processor.session_buffers["s1"]
+        assert result["buffer_size"] == SESSION_BUFFER_SIZE
+        assert len(buffer) == SESSION_BUFFER_SIZE
+        assert buffer[0]["interval"] == 5
+        assert type(buffer[-1]["processed_at_ns"]) is int
+
+
+class TestSessionRing:
+    """세션 링 버퍼 테스트"""
+
+    def test_recent_in_order_after_wrap(self):
+        """한 바퀴 돈 뒤에도 최근 값을 시간순으로 반환"""
+        ring = _SessionRing(capacity=4)
+        for i in range(6):
+            ring.push({"interval": i, "keystroke": "a"}, i)
+
+        assert len(ring) == 4
+        assert ring.recent(ring.intervals).tolist() == [2.0, 3.0, 4.0, 5.0]
+        assert ring.recent(ring.timestamps_ns, 3).tolist() == [3, 4, 5]
+
+    def test_recent_is_view_when_contiguous(self):
+        """끝에서 처음으로 넘어가지 않으면 복사 없이 뷰 반환"""
+        ring = _SessionRing(capacity=4)
+        for i in range(3):
+            ring.push({"interval": i}, i)
+
+        assert np.shares_memory(ring.recent(ring.intervals), ring.intervals)
+
+    def test_char_mask(self):
+        """특수키와 빈 입력은 문자 입력에서 제외"""
+        ring = _SessionRing(capacity=4)
+        ring.push({"keystroke": "a"}, 0)
+        ring.push({"keystroke": "Shift", "is_special": True}, 1)
+        ring.push({}, 2)
+
+        assert ring.recent(ring.is_char).tolist() == [True, False, False]
+
+    @pytest.mark.asyncio
+    async def test_typing_events_fill_ring(self, processor):
+        """이벤트 처리 시 링 버퍼에 기록되고 패턴/메트릭 분석에 바로 사용"""
+        processor._detect_patterns = MagicMock(return_value=[])
+        processor._calculate_basic_emotion = MagicMock(return_value=None)
+
+        for event in make_events([80] * 20):
+            await processor.process_typing_event("s1", event)
+
+        ring = processor.session_rings["s1"]
+        assert len(ring) == 20
+        assert await processor._analyze_realtime_patterns("s1") == ["fast_typing", "consistent_rhythm"]
+        metrics = await processor._calculate_realtime_metrics(ring)
+        assert metrics == await processor._calculate_realtime_metrics(make_events([80] * 20))
+
+
+class TestTypingWriteBehind:
+    """Redis 타이핑 버퍼 write-behind 테스트"""
+
+    @pytest.fixture
+    def write_processor(self, processor):
+        processor._detect_patterns = MagicMock(return_value=[])
+        processor._calculate_basic_emotion = MagicMock(return_value=None)
+        processor.cache_service.push_typing_batch = AsyncMock(return_value=True)
+        return processor
+
+    @pytest.mark.asyncio
+    async def test_events_flushed_together_after_delay(self, write_processor):
+        """대기 시간 동안 모인 이벤트를 한 번에 기록"""
+        for event in make_events([100] * 3):
+            await write_processor.process_typing_event("s1", event)
+
+        write_processor.cache_service.push_typing_batch.assert_not_awaited()
+        await asyncio.sleep(TYPING_FLUSH_DELAY * 2)
+
+        write_processor.cache_service.push_typing_batch.assert_awaited_once()
+        session_id, events = write_processor.cache_service.push_typing_batch.await_args.args
+        assert session_id == "s1"
+        assert [event["timestamp"] for event in events] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushed_immediately(self, write_processor):
+        """최대 이벤트 수가 모이면 대기 없이 기록"""
+        for event in make_events([100] * TYPING_FLUSH_MAX_EVENTS):
+            await write_processor.process_typing_event("s1", event)
+        await asyncio.sleep(0)
+
+        write_processor.cache_service.push_typing_batch.assert_awaited_once()
+        assert len(write_processor.cache_service.push_typing_batch.await_args.args[1]) == TYPING_FLUSH_MAX_EVENTS
+        assert "s1" not in write_processor._flush_handles
+
+    @pytest.mark.asyncio
+    async def test_explicit_flush_cancels_timer(self, write_processor):
+        """즉시 기록 시 예약된 타이머를 취소하고 중복 기록하지 않음"""
+        await write_processor.process_typing_event("s1", {"interval": 100})
+
+        assert await write_processor.flush_typing_writes("s1") is True
+        await asyncio.sleep(TYPING_FLUSH_DELAY * 2)
+
+        write_processor.cache_service.push_typing_batch.assert_awaited_once()
+
+
+class TestEmotionAnalysisBuffer:
+    """trigger_emotion_analysis 입력 버퍼 테스트"""
+
+    @pytest.fixture
+    def analysis_processor(self, processor):
+        processor._detect_patterns = MagicMock(return_value=[])
+        processor._calculate_basic_emotion = MagicMock(return_value=None)
+        processor.cache_service.push_typing_batch = AsyncMock(return_value=True)
+        processor.cache_service.get_typing_buffer = AsyncMock(
+            return_value=make_events([300] * MIN_EVENTS_FOR_ANALYSIS)
+        )
+        processor._analyze_typing_patterns = AsyncMock(return_value={"success": False})
+        return processor
+
+    @pytest.mark.asyncio
+    async def test_local_session_reads_memory_buffer(self, analysis_processor):
+        """처리 중인 세션은 Redis 대신 메모리 버퍼로 분석"""
+        for event in make_events([80] * (MIN_EVENTS_FOR_ANALYSIS + 1)):
+            await analysis_processor.process_typing_event("s1", event)
+
+        await analysis_processor.trigger_emotion_analysis("s1")
+
+        analysis_processor.cache_service.get_typing_buffer.assert_not_awaited()
+        events = analysis_processor._analyze_typing_patterns.await_args.args[0]
+        assert [event["interval"] for event in events] == [80] * (MIN_EVENTS_FOR_ANALYSIS + 1)
+
+    @pytest.mark.asyncio
+    async def test_remote_session_reads_redis_buffer(self, analysis_processor):
+        """이 워커에 없는 세션은 Redis 버퍼로 분석"""
+        await analysis_processor.trigger_emotion_analysis("s2")
+
+        analysis_processor.cache_service.get_typing_buffer.assert_awaited_once_with(
+            "s2", limit=SESSION_BUFFER_SIZE
+        )
+        events = analysis_processor._analyze_typing_patterns.await_args.args[0]
+        assert [event["interval"] for event in events] == [300] * MIN_EVENTS_FOR_ANALYSIS
+
+    @pytest.mark.asyncio
+    async def test_too_few_events_skips_analysis(self, analysis_processor):
+        """이벤트가 최소 개수보다 적으면 분석하지 않음"""
+        analysis_processor.cache_service.get_typing_buffer.return_value = make_events(
+            [300] * (MIN_EVENTS_FOR_ANALYSIS - 1)
+        )
+
+        result = await analysis_processor.trigger_emotion_analysis("s2")
+
+        assert result.success is False
+        analysis_processor._analyze_typing_patterns.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_profile_save_failure_keeps_analysis(self, analysis_processor, db_session):
+        """감정 프로필 저장이 실패해도 캐시 저장과 분석 결과 반환은 그대로 진행"""
+        snapshot = EmotionSnapshot(
+            energy=0.7, valence=0.2, tension=0.4, focus=0.6, confidence=0.9,
+            dominant_emotion="joy", timestamp=datetime(2024, 1, 1)
+        )
+        analysis_processor._analyze_typing_patterns.return_value = {"success": True, "patterns": {}}
+        analysis_processor._map_emotion_from_patterns = AsyncMock(
+            return_value={"success": True, "emotion": snapshot}
+        )
+        analysis_processor.cache_service.cache_emotion_analysis.return_value = True
+        db_session.execute.side_effect = RuntimeError("db down")
+
+        result = await analysis_processor.trigger_emotion_analysis("s2")
+
+        assert result.success is True
+        assert result.data["emotion"] == snapshot.to_payload()
+        analysis_processor.cache_service.cache_emotion_analysis.assert_awaited_once()
+        db_session.rollback.assert_awaited_once()
+
+
+class TestSessionStatistics:
+    """get_session_statistics 테스트"""
+
+    @pytest.fixture
+    def stats_processor(self, processor):
+        processor._detect_patterns = MagicMock(return_value=[])
+        processor._calculate_basic_emotion = MagicMock(return_value=None)
+        processor.cache_service.push_typing_batch = AsyncMock(return_value=True)
+        processor.cache_service.get_cached_emotion = AsyncMock(return_value={"cached_at": "2024-01-01T00:00:00"})
+        processor.cache_service.get_typing_buffer_with_emotion = AsyncMock(
+            return_value=(make_events([100, 200]), {"cached_at": "2024-01-01T00:00:00"})
+        )
+        return processor
+
+    @pytest.mark.asyncio
+    async def test_local_session_reuses_metrics(self, stats_processor):
+        """처리 중인 세션은 링 버퍼 메트릭을 재사용하고 Redis 버퍼를 읽지 않음"""
+        for event in make_events([80] * 10):
+            await stats_processor.process_typing_event("s1", event)
+        stats_processor._calculate_realtime_metrics = AsyncMock(
+            wraps=stats_processor._calculate_realtime_metrics
+        )
+
+        first = await stats_processor.get_session_statistics("s1")
+        second = await stats_processor.get_session_statistics("s1")
+
+        assert first["typing_events"] == 10
+        assert first["metrics"]["average_interval"] == pytest.approx(80.0)
+        assert second["metrics"] is first["metrics"]
+        assert first["last_analysis"] == "2024-01-01T00:00:00"
+        stats_processor._calculate_realtime_metrics.assert_awaited_once()
+        stats_processor.cache_service.get_typing_buffer_with_emotion.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_new_event_invalidates_metrics(self, stats_processor):
+        """새 이벤트가 들어오면 메트릭을 다시 계산"""
+        for event in make_events([80] * 10):
+            await stats_processor.process_typing_event("s1", event)
+        await stats_processor.get_session_statistics("s1")
+
+        await stats_processor.process_typing_event("s1", {"keystroke": "a", "interval": 300})
+        stats = await stats_processor.get_session_statistics("s1")
+
+        assert stats["typing_events"] == 11
+        assert stats["metrics"]["average_interval"] == pytest.approx(100.0)
+
+    @pytest.mark.asyncio
+    async def test_remote_session_uses_redis_buffer(self, stats_processor):
+        """이 워커에 없는 세션은 Redis 버퍼로 계산"""
+        stats = await stats_processor.get_session_statistics("s2")
+
+        assert stats["typing_events"] == 2
+        assert stats["metrics"]["average_interval"] == pytest.approx(150.0)
+        assert stats["last_analysis"] == "2024-01-01T00:00:00"
+        stats_processor.cache_service.get_typing_buffer_with_emotion.assert_awaited_once_with("s2")
+        stats_processor.cache_service.get_cached_emotion.assert_not_awaited()
+
+
+class TestMusicGenerationProgress:
+    """trigger_music_generation 진행 메시지 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_progress_stages_sent_in_one_message(self, processor):
+        """AI 호출 전 진행 단계를 메시지 하나로 묶어 보내는지 테스트"""
+        processor.cache_service.get_cached_emotion = AsyncMock(return_value={"energy": 0.8})
+        processor.cache_service.set_temp_music_data = AsyncMock()
+        processor.ai_connector = MagicMock()
+        processor.ai_connector.generate_music = AsyncMock(
+            return_value={"success": True, "music": {"id": "m1"}}
+        )
+        manager = MagicMock()
+        manager.send_personal_message = AsyncMock()
+
+        result = await processor.trigger_music_generation("s1", manager)
+
+        assert result.success is True
+        messages = [call.args[1] for call in manager.send_personal_message.await_args_list]
+        assert [message["type"] for message in messages] == [
+            "music_generation_progress", "music_generation_complete"
+        ]
+        assert [stage["stage"] for stage in messages[0]["stages"]] == [
+            "analyzing", "generating", "processing"
+        ]
+        assert messages[0]["stage"] == "processing"
+        assert messages[0]["progress"] == 75
+
+    @pytest.mark.asyncio
+    async def test_failure_flushes_pending_progress(self, processor):
+        """실패 시 남은 진행 단계를 먼저 보내고 실패 메시지를 보내는지 테스트"""
+        processor.cache_service.get_cached_emotion = AsyncMock(return_value={"energy": 0.8})
+        processor._generate_music_with_ai = AsyncMock(side_effect=RuntimeError("boom"))
+        manager = MagicMock()
+        manager.send_personal_message = AsyncMock()
+
+        result = await processor.trigger_music_generation("s1", manager)
+
+        assert result.success is False
+        messages = [call.args[1] for call in manager.send_personal_message.await_args_list]
+        assert [message["type"] for message in messages] == [
+            "music_generation_progress", "music_generation_failed"
+        ]
+        assert [stage["stage"] for stage in messages[0]["stages"]] == ["analyzing", "generating"]
+
+
+class TestMusicPrompt:
+    """_create_music_prompt 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_style_and_values(self, processor):
+        """감정 값에 맞는 스타일과 0.1 단위 수치가 들어가는지 테스트"""
+        prompt = await processor._create_music_prompt(
+            {"energy": 0.82, "valence": 0.4, "tension": 0.3, "focus": 0.5, "dominant_emotion": "joy"}
+        )
+
+        assert prompt.startswith(
+            "Create a fast-tempo electronic or pop piece with a energetic and positive atmosphere."
+        )
+        assert "- Energy level: 0.8/1.0" in prompt
+        assert "- Emotional valence: 0.4 (negative to positive)" in prompt
+        assert "- Dominant emotion: joy" in prompt
+
+    @pytest.mark.asyncio
+    async def test_same_bucket_reuses_prompt(self, processor):
+        """같은 0.1 구간의 감정 값은 캐시된 프롬프트를 재사용"""
+        _compose_prompt.cache_clear()
+
+        first = await processor._create_music_prompt({"energy": 0.51, "focus": 0.42})
+        second = await processor._create_music_prompt({"energy": 0.49, "focus": 0.38})
+
+        assert first is second
+        assert _compose_prompt.cache_info().hits == 1
+
+    @pytest.mark.asyncio
+    async def test_style_threshold_uses_raw_values(self, processor):
+        """스타일 경계는 양자화 전 값으로 판단"""
+        prompt = await processor._create_music_prompt({"tension": 0.72})
+
+        assert "tense and dramatic" in prompt
+        assert "- Tension: 0.7/1.0" in prompt
+
+
+class TestMusicGenerationConcurrency:
+    """AI 음악 생성 동시 실행 제한 테스트"""
+
+    @pytest.fixture
+    def gen_processor(self, processor, monkeypatch):
+        monkeypatch.setattr(RealtimeProcessor, "_music_gen_semaphore", asyncio.Semaphore(1))
+        processor.cache_service.set_temp_music_data = AsyncMock()
+        processor.ai_connector = MagicMock()
+        return processor
+
+    @pytest.mark.asyncio
+    async def test_requests_limited_by_semaphore(self, gen_processor):
+        """상한을 넘는 요청은 앞선 요청이 끝날 때까지 대기"""
+        release = asyncio.Event()
+        running = []
+
+        async def generate(request):
+            running.append(request["session_id"])
+            await release.wait()
+            return {"success": True, "music": {"id": request["session_id"]}}
+
+        gen_processor.ai_connector.generate_music = AsyncMock(side_effect=generate)
+
+        first = asyncio.create_task(gen_processor._generate_music_with_ai("s1", "prompt"))
+        second = asyncio.create_task(gen_processor._generate_music_with_ai("s2", "prompt"))
+        await asyncio.sleep(0.01)
+
+        assert running == ["s1"]
+
+        release.set()
+        results = await asyncio.gather(first, second)
+
+        assert running == ["s1", "s2"]
+        assert [result["data"]["music_id"] for result in results] == ["s1", "s2"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_request(self, gen_processor):
+        """호출자가 취소되어도 AI 요청과 결과 캐싱은 끝까지 수행"""
+        release = asyncio.Event()
+        finished = asyncio.Event()
+
+        async def generate(request):
+            await release.wait()
+            finished.set()
+            return {"success": True, "music": {"id": "m1"}}
+
+        gen_processor.ai_connector.generate_music = AsyncMock(side_effect=generate)
+
+        caller = asyncio.create_task(gen_processor._generate_music_with_ai("s1", "prompt"))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        release.set()
+        await asyncio.wait_for(finished.wait(), 1)
+        await asyncio.sleep(0.01)
+
+        gen_processor.cache_service.set_temp_music_data.assert_awaited_once()
+        assert not gen_processor._get_music_gen_semaphore().locked()
+
+
+class TestMusicStyleSelection:
+    """_select_music_style 테스트"""
+
+    @pytest.mark.parametrize("energy, valence, tension, focus, expected", [
+        (0.8, 0.4, 0.9, 0.9, 0),   # energetic 우선
+        (0.2, -0.4, 0.9, 0.9, 1),  # calm이 tension/focus보다 우선
+        (0.5, 0.0, 0.8, 0.9, 2),   # tension이 focus보다 우선
+        (0.5, 0.0, 0.5, 0.8, 3),
+        (0.8, 0.2, 0.5, 0.5, 4),   # energy만 높으면 balanced
+        (0.7, 0.4, 0.7, 0.7, 4),   # 경계값은 미포함
+    ])
+    def test_priority(self, energy, valence, tension, focus, expected):
+        """조건이 겹치면 기존 if/elif 순서대로 스타일 선택"""
+        assert _select_music_style(energy, valence, tension, focus) == expected
+
+
+class TestEmotionAnalysisScheduling:
+    """감정 분석 백그라운드 예약 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_analysis_runs_in_background_and_coalesces(self, processor):
+        """분석을 기다리지 않고 예약하며, 진행 중이면 다시 예약하지 않는지 테스트"""
+        release = asyncio.Event()
+
+        async def slow_analysis(session_id):
+            await release.wait()
+            return ProcessingResult(success=True, data={"energy": 0.7})
+
+        processor.trigger_emotion_analysis = AsyncMock(side_effect=slow_analysis)
+        manager = MagicMock()
+        manager.send_personal_message = AsyncMock()
+
+        assert processor.schedule_emotion_analysis("s1", manager) is True
+        assert processor.schedule_emotion_analysis("s1", manager) is False
+
+        release.set()
+        await processor._analysis_tasks["s1"]
+        await asyncio.sleep(0)
+
+        processor.trigger_emotion_analysis.assert_awaited_once_with("s1")
+        manager.send_personal_message.assert_awaited_once_with("s1", {
+            "type": "emotion_analysis_result",
+            "data": {"energy": 0.7}
+        })
+        assert "s1" not in processor._analysis_tasks
+
+    @pytest.mark.asyncio
+    async def test_cleanup_cancels_running_analysis(self, processor):
+        """세션 정리 시 진행 중인 분석을 취소하고 끝날 때까지 기다리는지 테스트"""
+        async def endless_analysis(session_id):
+            await asyncio.Event().wait()
+
+        processor.trigger_emotion_analysis = AsyncMock(side_effect=endless_analysis)
+        processor.schedule_emotion_analysis("s1", MagicMock())
+        task = processor._analysis_tasks["s1"]
+        await asyncio.sleep(0)
+
+        await processor.cleanup_session_data("s1")
+
+        assert task.cancelled()
+        assert "s1" not in processor._analysis_tasks
+
+    @pytest.mark.asyncio
+    async def test_typing_event_schedules_analysis_on_trigger(self, processor):
+        """트리거 조건에서 이벤트 처리가 분석을 예약만 하고 바로 반환하는지 테스트"""
+        processor._detect_patterns = MagicMock(return_value=[])
+        processor._calculate_basic_emotion = MagicMock(return_value=None)
+        processor.schedule_emotion_analysis = MagicMock(return_value=True)
+        manager = MagicMock()
+
+        for _ in range(5):
+            result = await processor.process_typing_event("s1", {"interval": 100}, manager)
+
+        assert result["trigger_emotion_analysis"] is True
+        processor.schedule_emotion_analysis.assert_called_once_with("s1", manager)
+
+
+class TestSessionPkCache:
+    """UserSession PK 조회 캐시 테스트"""
+
+    @pytest.fixture
+    def db_processor(self, processor):
+        processor.db_session.execute = AsyncMock(side_effect=lambda stmt: MagicMock(
+            scalar_one_or_none=MagicMock(return_value=stmt.compile().params["id_1"])
+        ))
+        return processor
+
+    @pytest.mark.asyncio
+    async def test_lookup_cached(self, db_processor):
+        """같은 세션은 한 번만 조회"""
+        assert await db_processor._get_user_session_pk("s1") == "s1"
+        assert await db_processor._get_user_session_pk("s1") == "s1"
+
+        db_processor.db_session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_session_not_cached(self, db_processor):
+        """없는 세션은 캐시하지 않고 매번 조회"""
+        db_processor.db_session.execute = AsyncMock(return_value=MagicMock(
+            scalar_one_or_none=MagicMock(return_value=None)
+        ))
+
+        assert await db_processor._get_user_session_pk("s1") is None
+        assert await db_processor._get_user_session_pk("s1") is None
+        assert db_processor.db_session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, db_processor):
+        """최대 크기를 넘으면 가장 오래 쓰지 않은 세션부터 제거"""
+        for i in range(SESSION_PK_CACHE_SIZE):
+            await db_processor._get_user_session_pk(f"s{i}")
+        await db_processor._get_user_session_pk("s0")
+        await db_processor._get_user_session_pk("new")
+
+        assert len(db_processor._session_pk_cache) == SESSION_PK_CACHE_SIZE
+        assert "s0" in db_processor._session_pk_cache
+        assert "s1" not in db_processor._session_pk_cache
+
+    @pytest.mark.asyncio
+    async def test_cleanup_invalidates(self, db_processor):
+        """세션 정리 시 캐시 제거"""
+        await db_processor._get_user_session_pk("s1")
+        db_processor.cache_service.clear_typing_buffer = AsyncMock()
+        db_processor.cache_service.delete_session = AsyncMock()
+
+        await db_processor.cleanup_session_data("s1")
+
+        assert "s1" not in db_processor._session_pk_cache
+
+    @pytest.mark.asyncio
+    async def test_save_profile_upserts_latest_pattern(self, processor, db_session):
+        """감정 프로필은 세션의 최근 패턴 기준 INSERT ... ON CONFLICT 문 하나로 저장"""
+        processor._session_pk_cache["s1"] = "pk-1"
+        db_session.execute.side_effect = [
+            MagicMock(scalar_one_or_none=MagicMock(return_value="pattern-1")),
+            MagicMock()
+        ]
+        snapshot = EmotionSnapshot(
+            energy=0.7, valence=0.2, tension=0.4, focus=0.6, confidence=0.9,
+            dominant_emotion="joy", timestamp=datetime(2024, 1, 1)
+        )
+
+        await processor._save_emotion_profile("s1", snapshot, (0.8, 0.5, 0.1))
+
+        lookup = db_session.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect())
+        assert "typing_patterns.session_id" in str(lookup)
+        assert lookup.params["session_id_1"] == "pk-1"
+
+        stmt = db_session.execute.await_args.args[0]
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        assert stmt.table.name == "emotion_profiles"
+        assert "ON CONFLICT (pattern_id) DO UPDATE" in str(compiled)
+        assert compiled.params["pattern_id"] == "pattern-1"
+        assert compiled.params["tempo_score"] == 0.8
+        assert compiled.params["rhythm_consistency"] == 0.5
+        assert compiled.params["pause_intensity"] == 0.1
+        assert compiled.params["confidence_score"] == 0.9
+        assert compiled.params["emotion_vector"] == {
+            "energy": 0.7, "valence": 0.2, "tension": 0.4, "focus": 0.6
+        }
+        db_session.add.assert_not_called()
+        db_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_save_profile_skipped_without_pattern(self, processor, db_session):
+        """타이핑 패턴이 없는 세션은 저장하지 않음"""
+        processor._session_pk_cache["s1"] = "pk-1"
+        db_session.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+        snapshot = EmotionSnapshot(
+            energy=0.7, valence=0.2, tension=0.4, focus=0.6, confidence=0.9,
+            dominant_emotion="joy", timestamp=datetime(2024, 1, 1)
+        )
+
+        await processor._save_emotion_profile("s1", snapshot, (0.8, 0.5, 0.1))
+
+        db_session.execute.assert_awaited_once()
+        db_session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_save_profile_failure_rolls_back(self, processor, db_session):
+        """저장 실패 시 예외를 밖으로 내보내지 않고 세션을 롤백"""
+        db_session.execute.side_effect = RuntimeError("db down")
+        snapshot = EmotionSnapshot(
+            energy=0.7, valence=0.2, tension=0.4, focus=0.6, confidence=0.9,
+            dominant_emotion="joy", timestamp=datetime(2024, 1, 1)
+        )
+
+        await processor._save_emotion_profile("s1", snapshot, (0.8, 0.5, 0.1))
+
+        db_session.rollback.assert_awaited_once()
+        db_session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_saves_serialized(self, processor, db_session):
+        """백그라운드 분석과 요청 처리의 저장이 같은 DB 세션을 동시에 쓰지 않음"""
+        processor._session_pk_cache.update({"s1": "pk-1", "s2": "pk-2"})
+        active = []
+        overlapped = []
+
+        async def execute(stmt):
+            active.append(stmt)
+            overlapped.append(len(active) > 1)
+            await asyncio.sleep(0)
+            active.remove(stmt)
+            return MagicMock(scalar_one_or_none=MagicMock(return_value="pattern-1"))
+
+        db_session.execute.side_effect = execute
+        snapshot = EmotionSnapshot(
+            energy=0.7, valence=0.2, tension=0.4, focus=0.6, confidence=0.9,
+            dominant_emotion="joy", timestamp=datetime(2024, 1, 1)
+        )
+
+        await asyncio.gather(
+            processor._save_emotion_profile("s1", snapshot, (0.8, 0.5, 0.1)),
+            processor._save_emotion_profile("s2", snapshot, (0.8, 0.5, 0.1))
+        )
+
+        assert db_session.execute.await_count == 4
+        assert not any(overlapped)
+        assert db_session.commit.await_count == 2
+
+    def test_typing_scores_in_profile_range(self, processor):
+        """간격 통계를 감정 프로필 컬럼 범위(0.0~1.0)의 점수로 변환"""
+        assert processor._typing_scores(make_events([80] * 10)) == (1.0, 1.0, 0.0)
+        assert processor._typing_scores(make_events([300] * 8 + [1500] * 2)) == (0.0, 0.0, 0.2)
+        assert processor._typing_scores([]) == (0.0, 0.0, 0.0)
+
+
+class TestEmotionSnapshot:
+    """EmotionSnapshot 직렬화 테스트"""
+
+    def make_snapshot(self):
+        return EmotionSnapshot(
+            energy=0.7, valence=0.2, tension=0.4, focus=0.6, confidence=0.9,
+            dominant_emotion="joy", timestamp=datetime(2024, 1, 1)
+        )
+
+    def test_to_payload_built_once(self):
+        """필드만 담은 딕셔너리를 한 번 만들어 재사용"""
+        snapshot = self.make_snapshot()
+
+        payload = snapshot.to_payload()
+
+        assert payload == {
+            "energy": 0.7, "valence": 0.2, "tension": 0.4, "focus": 0.6, "confidence": 0.9,
+            "dominant_emotion": "joy", "timestamp": datetime(2024, 1, 1)
+        }
+        assert snapshot.to_payload() is payload
+
+    def test_cache_payload_quantized(self):
+        """캐시용 딕셔너리는 점수만 0.01 단위로 양자화"""
+        snapshot = EmotionSnapshot(
+            energy=0.73456, valence=-0.12345, tension=0.5, focus=1.0, confidence=0.005001,
+            dominant_emotion="calm", timestamp=datetime(2024, 1, 1)
+        )
+
+        assert snapshot.to_cache_payload() == {
+            "energy": 0.73, "valence": -0.12, "tension": 0.5, "focus": 1.0, "confidence": 0.01,
+            "dominant_emotion": "calm", "timestamp": datetime(2024, 1, 1)
+        }
+        assert snapshot.to_payload()["energy"] == 0.73456
+
+    def test_frozen_and_comparable(self):
+        """불변이며 보관된 딕셔너리는 비교에 영향 없음"""
+        snapshot = self.make_snapshot()
+        snapshot.to_payload()
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.energy = 0.1
+        assert snapshot == self.make_snapshot()
+        assert not hasattr(snapshot, "__dict__")
+
+
+class TestPatternResultCache:
+    """패턴 분석 결과 캐시 테스트"""
+
+    @pytest.fixture
+    def analyzer_processor(self, processor):
+        processor.pattern_analyzer = MagicMock()
+        processor.pattern_analyzer.analyze_typing_patterns = AsyncMock(
+            return_value={"success": True, "patterns": {"rhythm": "steady"}}
+        )
+        return processor
+
+    @pytest.mark.asyncio
+    async def test_similar_buffer_reuses_result(self, analyzer_processor):
+        """같은 50ms 구간의 간격이면 분석기를 다시 호출하지 않음"""
+        first = await analyzer_processor._analyze_typing_patterns(make_events([110, 120, 130]))
+        second = await analyzer_processor._analyze_typing_patterns(make_events([105, 145, 101]))
+
+        assert first == second == {"success": True, "patterns": {"rhythm": "steady"}}
+        analyzer_processor.pattern_analyzer.analyze_typing_patterns.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_different_buffer_analyzed(self, analyzer_processor):
+        """간격 구간이 다르면 다시 분석"""
+        await analyzer_processor._analyze_typing_patterns(make_events([110, 120, 130]))
+        await analyzer_processor._analyze_typing_patterns(make_events([110, 120, 530]))
+
+        assert analyzer_processor.pattern_analyzer.analyze_typing_patterns.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_not_cached(self, analyzer_processor):
+        """실패한 분석 결과는 캐시하지 않음"""
+        analyzer_processor.pattern_analyzer.analyze_typing_patterns.return_value = {"success": False}
+
+        await analyzer_processor._analyze_typing_patterns(make_events([110, 120, 130]))
+
+        assert not analyzer_processor._pattern_result_cache
+
+
+class TestParseTypingEvent:
+    """_parse_typing_event 테스트"""
+
+    def test_parse(self, processor):
+        """이벤트 딕셔너리를 TypingEvent로 변환"""
+        event = processor._parse_typing_event(
+            {"keystroke": "a", "timestamp": "12", "interval": 80, "is_special": 0}
+        )
+
+        assert event == TypingEvent(
+            keystroke="a", timestamp=12.0, interval=80.0, key_code=None,
+            is_special=False, session_time=0.0
+        )
+
+    def test_invalid_value(self, processor):
+        """숫자로 바꿀 수 없는 값이면 None"""
+        assert processor._parse_typing_event({"interval": "fast"}) is None
+
+
+class TestEmotionAnalysisTrigger:
+    """_should_trigger_emotion_analysis 시간 기준 테스트"""
+
+    @pytest.fixture
+    def trigger_processor(self, processor):
+        processor.EMOTION_ANALYSIS_THRESHOLD = 50
+        return processor
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_by_ns_timestamp(self, trigger_processor):
+        """정수 캐시 시각이 10분 이상 지났으면 트리거"""
+        stale_ns = time.time_ns() - EMOTION_REFRESH_INTERVAL_NS - 1
+        trigger_processor.cache_service.get_cached_emotion = AsyncMock(
+            return_value={"cached_at_ns": stale_ns, "cached_at": "2000-01-01T00:00:00"}
+        )
+
+        assert await trigger_processor._should_trigger_emotion_analysis("s1", 1, []) is True
+
+    @pytest.mark.asyncio
+    async def test_fresh_cache_by_ns_timestamp(self, trigger_processor):
+        """정수 캐시 시각이 있으면 ISO 문자열은 무시"""
+        trigger_processor.cache_service.get_cached_emotion = AsyncMock(
+            return_value={"cached_at_ns": time.time_ns(), "cached_at": "2000-01-01T00:00:00"}
+        )
+
+        assert await trigger_processor._should_trigger_emotion_analysis("s1", 1, []) is False
+
+    @pytest.mark.asyncio
+    async def test_legacy_iso_timestamp(self, trigger_processor):
+        """정수 캐시 시각이 없는 이전 캐시는 ISO 문자열로 판단"""
+        trigger_processor.cache_service.get_cached_emotion = AsyncMock(
+            return_value={"cached_at": "2000-01-01T00:00:00"}
+        )
+
+        assert await trigger_processor._should_trigger_emotion_analysis("s1", 1, []) is True